@@ -39,11 +39,12 @@ REVENUES_CATEGORIES = {
 def init_country(qt = False):  # drop_survey_only_variables = False, simulate_f6de = False, start_from = 'imposable'
     """Create a country-specific TaxBenefitSystem."""
     # from openfisca_core.columns import FloatCol
-    from openfisca_core.taxbenefitsystems import LegacyTaxBenefitSystem
+    from openfisca_core import legislationsxml
+    from openfisca_core.taxbenefitsystems import LegacyTaxBenefitSystem, XmlBasedTaxBenefitSystem
     if qt:
         from openfisca_qt import widgets as qt_widgets
 
-    from . import decompositions, entities, scenarios
+    from . import compact_legislations, decompositions, entities, legislation_cache, scenarios
     from .model import datatrees
     from .model import model  # Load output variables into entities. # noqa analysis:ignore
     from .model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales import preprocessing
@@ -72,10 +73,13 @@ def init_country(qt = False):  # drop_survey_only_variables = False, simulate_f6
     class TaxBenefitSystem(LegacyTaxBenefitSystem):
         """French tax benefit system"""
         check_consistency = None  # staticmethod(utils.check_consistency)
+        compact_legislation_store = None
         CURRENCY = CURRENCY
         DATA_SOURCES_DIR = os.path.join(COUNTRY_DIR, 'data', 'sources')
         DECOMP_DIR = os.path.dirname(os.path.abspath(decompositions.__file__))
         DEFAULT_DECOMP_FILE = decompositions.DEFAULT_DECOMP_FILE
+        # When True, compute all the social contributions of a payslip at once (see cotisations_sociales.base)
+        fused_cotisations = False
         entity_class_by_key_plural = dict(
             (entity_class.key_plural, entity_class)
             for entity_class in entities.entity_class_by_symbol.itervalues()
@@ -87,6 +91,8 @@ def init_country(qt = False):  # drop_survey_only_variables = False, simulate_f6
 
         columns_name_tree_by_entity = datatrees.columns_name_tree_by_entity
 
+        # Directory of the on-disk cache of the preprocessed legislation (None to disable it)
+        legislation_cache_dir = legislation_cache.default_cache_dir()
         legislation_xml_file_path = os.path.join(COUNTRY_DIR, 'param', 'param.xml')
 
         preprocess_legislation = staticmethod(preprocessing.preprocess_legislation)
@@ -96,6 +102,32 @@ def init_country(qt = False):  # drop_survey_only_variables = False, simulate_f6
         REVENUES_CATEGORIES = REVENUES_CATEGORIES
         Scenario = scenarios.Scenario
 
+        def __init__(self):
+            cache_file_path = None
+            if self.legislation_cache_dir is not None:
+                preprocess_legislation = self.preprocess_legislation
+                cache_file_path = legislation_cache.get_cache_file_path(self.legislation_cache_dir,
+                    self.legislation_xml_file_path, [legislationsxml, preprocessing],
+                    functions = [preprocess_legislation] if preprocess_legislation is not None else [])
+            legislation_json = legislation_cache.load_legislation_json(cache_file_path) \
+                if cache_file_path is not None else None
+            if legislation_json is None:
+                super(TaxBenefitSystem, self).__init__()
+                if cache_file_path is not None:
+                    legislation_cache.save_legislation_json(cache_file_path, self.legislation_json)
+            else:
+                # Skip only the XML parsing, validation & preprocessing done by XmlBasedTaxBenefitSystem, continuing
+                # the cooperative chain of constructors after it.
+                super(XmlBasedTaxBenefitSystem, self).__init__(legislation_json = legislation_json)
+
+        def get_compact_legislation(self, instant, traced_simulation = None):
+            if traced_simulation is not None or self.legislation_json is None:
+                return super(TaxBenefitSystem, self).get_compact_legislation(instant,
+                    traced_simulation = traced_simulation)
+            if self.compact_legislation_store is None:
+                self.compact_legislation_store = compact_legislations.CompactLegislationStore(self.legislation_json)
+            return self.compact_legislation_store.get(instant)
+
         def prefill_cache(self):
             # Compute one "zone APL" variable, to pre-load CSV of "code INSEE commune" to "Zone APL".
             from .model.prestations import aides_logement
@@ -24,336 +24,336 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
-from datetime import datetime
+from numpy import array
 
 
-holidays = [
-    datetime.strptime("1990-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1990-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1990-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1990-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1990-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1990-04-16", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1990-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1990-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1990-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1990-05-24", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1990-06-04", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1991-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1991-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1991-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1991-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1991-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1991-04-01", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1991-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1991-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1991-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1991-05-09", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1991-05-20", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1992-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1992-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1992-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1992-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1992-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1992-04-20", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1992-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1992-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1992-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1992-05-28", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1992-06-08", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1993-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1993-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1993-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1993-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1993-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1993-04-12", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1993-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1993-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1993-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1993-05-20", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1993-05-31", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1994-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1994-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1994-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1994-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1994-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1994-04-04", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1994-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1994-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1994-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1994-05-12", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1994-05-23", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1995-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1995-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1995-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1995-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1995-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1995-04-17", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1995-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1995-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1995-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1995-05-25", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1995-06-05", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1996-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1996-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1996-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1996-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1996-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1996-04-08", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1996-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1996-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1996-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1996-05-16", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1996-05-27", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1997-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1997-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1997-05-08", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1997-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1997-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1997-03-31", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1997-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1997-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1997-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1997-05-19", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1998-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1998-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1998-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1998-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1998-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1998-04-13", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1998-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1998-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1998-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1998-05-21", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1998-06-01", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("1999-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("1999-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("1999-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("1999-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("1999-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("1999-04-05", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("1999-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("1999-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("1999-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("1999-05-13", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("1999-05-24", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2000-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2000-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2000-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2000-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2000-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2000-04-24", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2000-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2000-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2000-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2000-06-01", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2000-06-12", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2001-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2001-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2001-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2001-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2001-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2001-04-16", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2001-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2001-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2001-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2001-05-24", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2001-06-04", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2002-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2002-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2002-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2002-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2002-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2002-04-01", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2002-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2002-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2002-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2002-05-09", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2002-05-20", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2003-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2003-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2003-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2003-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2003-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2003-04-21", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2003-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2003-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2003-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2003-05-29", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2003-06-09", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2004-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2004-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2004-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2004-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2004-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2004-04-12", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2004-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2004-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2004-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2004-05-20", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2004-05-31", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2005-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2005-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2005-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2005-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2005-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2005-03-28", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2005-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2005-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2005-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2005-05-05", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2005-05-16", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2006-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2006-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2006-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2006-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2006-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2006-04-17", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2006-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2006-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2006-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2006-05-25", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2006-06-05", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2007-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2007-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2007-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2007-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2007-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2007-04-09", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2007-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2007-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2007-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2007-05-17", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2007-05-28", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2008-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2008-05-01", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2008-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2008-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2008-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2008-03-24", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2008-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2008-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2008-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2008-05-12", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2009-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2009-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2009-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2009-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2009-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2009-04-13", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2009-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2009-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2009-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2009-05-21", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2009-06-01", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2010-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2010-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2010-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2010-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2010-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2010-04-05", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2010-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2010-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2010-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2010-05-13", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2010-05-24", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2011-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2011-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2011-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2011-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2011-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2011-04-25", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2011-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2011-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2011-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2011-06-02", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2011-06-13", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2012-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2012-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2012-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2012-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2012-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2012-04-09", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2012-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2012-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2012-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2012-05-17", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2012-05-28", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2013-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2013-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2013-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2013-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2013-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2013-04-01", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2013-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2013-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2013-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2013-05-09", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2013-05-20", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2014-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2014-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2014-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2014-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2014-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2014-04-21", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2014-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2014-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2014-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2014-05-29", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2014-06-09", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2015-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2015-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2015-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2015-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2015-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2015-04-06", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2015-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2015-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2015-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2015-05-14", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2015-05-25", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2016-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2016-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2016-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2016-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2016-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2016-03-28", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2016-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2016-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2016-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2016-05-05", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2016-05-16", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2017-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2017-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2017-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2017-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2017-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2017-04-17", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2017-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2017-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2017-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2017-05-25", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2017-06-05", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2018-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2018-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2018-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2018-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2018-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2018-04-02", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2018-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2018-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2018-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2018-05-10", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2018-05-21", "%Y-%m-%d").date(), # Whit Monday
-    datetime.strptime("2019-01-01", "%Y-%m-%d").date(), # New year
-    datetime.strptime("2019-05-01", "%Y-%m-%d").date(), # Labour Day
-    datetime.strptime("2019-05-08", "%Y-%m-%d").date(), # Victory in Europe Day
-    datetime.strptime("2019-07-14", "%Y-%m-%d").date(), # Bastille Day
-    datetime.strptime("2019-11-11", "%Y-%m-%d").date(), # Armistice Day
-    datetime.strptime("2019-04-22", "%Y-%m-%d").date(), # Easter Monday
-    datetime.strptime("2019-08-15", "%Y-%m-%d").date(), # Assumption of Mary to Heaven
-    datetime.strptime("2019-11-01", "%Y-%m-%d").date(), # All Saints Day
-    datetime.strptime("2019-12-25", "%Y-%m-%d").date(), # Christmas Day
-    datetime.strptime("2019-05-30", "%Y-%m-%d").date(), # Ascension Thursday
-    datetime.strptime("2019-06-10", "%Y-%m-%d").date(), # Whit Monday
-    ]
+holidays = array([
+    '1990-01-01',  # New year
+    '1990-05-01',  # Labour Day
+    '1990-05-08',  # Victory in Europe Day
+    '1990-07-14',  # Bastille Day
+    '1990-11-11',  # Armistice Day
+    '1990-04-16',  # Easter Monday
+    '1990-08-15',  # Assumption of Mary to Heaven
+    '1990-11-01',  # All Saints Day
+    '1990-12-25',  # Christmas Day
+    '1990-05-24',  # Ascension Thursday
+    '1990-06-04',  # Whit Monday
+    '1991-01-01',  # New year
+    '1991-05-01',  # Labour Day
+    '1991-05-08',  # Victory in Europe Day
+    '1991-07-14',  # Bastille Day
+    '1991-11-11',  # Armistice Day
+    '1991-04-01',  # Easter Monday
+    '1991-08-15',  # Assumption of Mary to Heaven
+    '1991-11-01',  # All Saints Day
+    '1991-12-25',  # Christmas Day
+    '1991-05-09',  # Ascension Thursday
+    '1991-05-20',  # Whit Monday
+    '1992-01-01',  # New year
+    '1992-05-01',  # Labour Day
+    '1992-05-08',  # Victory in Europe Day
+    '1992-07-14',  # Bastille Day
+    '1992-11-11',  # Armistice Day
+    '1992-04-20',  # Easter Monday
+    '1992-08-15',  # Assumption of Mary to Heaven
+    '1992-11-01',  # All Saints Day
+    '1992-12-25',  # Christmas Day
+    '1992-05-28',  # Ascension Thursday
+    '1992-06-08',  # Whit Monday
+    '1993-01-01',  # New year
+    '1993-05-01',  # Labour Day
+    '1993-05-08',  # Victory in Europe Day
+    '1993-07-14',  # Bastille Day
+    '1993-11-11',  # Armistice Day
+    '1993-04-12',  # Easter Monday
+    '1993-08-15',  # Assumption of Mary to Heaven
+    '1993-11-01',  # All Saints Day
+    '1993-12-25',  # Christmas Day
+    '1993-05-20',  # Ascension Thursday
+    '1993-05-31',  # Whit Monday
+    '1994-01-01',  # New year
+    '1994-05-01',  # Labour Day
+    '1994-05-08',  # Victory in Europe Day
+    '1994-07-14',  # Bastille Day
+    '1994-11-11',  # Armistice Day
+    '1994-04-04',  # Easter Monday
+    '1994-08-15',  # Assumption of Mary to Heaven
+    '1994-11-01',  # All Saints Day
+    '1994-12-25',  # Christmas Day
+    '1994-05-12',  # Ascension Thursday
+    '1994-05-23',  # Whit Monday
+    '1995-01-01',  # New year
+    '1995-05-01',  # Labour Day
+    '1995-05-08',  # Victory in Europe Day
+    '1995-07-14',  # Bastille Day
+    '1995-11-11',  # Armistice Day
+    '1995-04-17',  # Easter Monday
+    '1995-08-15',  # Assumption of Mary to Heaven
+    '1995-11-01',  # All Saints Day
+    '1995-12-25',  # Christmas Day
+    '1995-05-25',  # Ascension Thursday
+    '1995-06-05',  # Whit Monday
+    '1996-01-01',  # New year
+    '1996-05-01',  # Labour Day
+    '1996-05-08',  # Victory in Europe Day
+    '1996-07-14',  # Bastille Day
+    '1996-11-11',  # Armistice Day
+    '1996-04-08',  # Easter Monday
+    '1996-08-15',  # Assumption of Mary to Heaven
+    '1996-11-01',  # All Saints Day
+    '1996-12-25',  # Christmas Day
+    '1996-05-16',  # Ascension Thursday
+    '1996-05-27',  # Whit Monday
+    '1997-01-01',  # New year
+    '1997-05-01',  # Labour Day
+    '1997-05-08',  # Ascension Thursday
+    '1997-07-14',  # Bastille Day
+    '1997-11-11',  # Armistice Day
+    '1997-03-31',  # Easter Monday
+    '1997-08-15',  # Assumption of Mary to Heaven
+    '1997-11-01',  # All Saints Day
+    '1997-12-25',  # Christmas Day
+    '1997-05-19',  # Whit Monday
+    '1998-01-01',  # New year
+    '1998-05-01',  # Labour Day
+    '1998-05-08',  # Victory in Europe Day
+    '1998-07-14',  # Bastille Day
+    '1998-11-11',  # Armistice Day
+    '1998-04-13',  # Easter Monday
+    '1998-08-15',  # Assumption of Mary to Heaven
+    '1998-11-01',  # All Saints Day
+    '1998-12-25',  # Christmas Day
+    '1998-05-21',  # Ascension Thursday
+    '1998-06-01',  # Whit Monday
+    '1999-01-01',  # New year
+    '1999-05-01',  # Labour Day
+    '1999-05-08',  # Victory in Europe Day
+    '1999-07-14',  # Bastille Day
+    '1999-11-11',  # Armistice Day
+    '1999-04-05',  # Easter Monday
+    '1999-08-15',  # Assumption of Mary to Heaven
+    '1999-11-01',  # All Saints Day
+    '1999-12-25',  # Christmas Day
+    '1999-05-13',  # Ascension Thursday
+    '1999-05-24',  # Whit Monday
+    '2000-01-01',  # New year
+    '2000-05-01',  # Labour Day
+    '2000-05-08',  # Victory in Europe Day
+    '2000-07-14',  # Bastille Day
+    '2000-11-11',  # Armistice Day
+    '2000-04-24',  # Easter Monday
+    '2000-08-15',  # Assumption of Mary to Heaven
+    '2000-11-01',  # All Saints Day
+    '2000-12-25',  # Christmas Day
+    '2000-06-01',  # Ascension Thursday
+    '2000-06-12',  # Whit Monday
+    '2001-01-01',  # New year
+    '2001-05-01',  # Labour Day
+    '2001-05-08',  # Victory in Europe Day
+    '2001-07-14',  # Bastille Day
+    '2001-11-11',  # Armistice Day
+    '2001-04-16',  # Easter Monday
+    '2001-08-15',  # Assumption of Mary to Heaven
+    '2001-11-01',  # All Saints Day
+    '2001-12-25',  # Christmas Day
+    '2001-05-24',  # Ascension Thursday
+    '2001-06-04',  # Whit Monday
+    '2002-01-01',  # New year
+    '2002-05-01',  # Labour Day
+    '2002-05-08',  # Victory in Europe Day
+    '2002-07-14',  # Bastille Day
+    '2002-11-11',  # Armistice Day
+    '2002-04-01',  # Easter Monday
+    '2002-08-15',  # Assumption of Mary to Heaven
+    '2002-11-01',  # All Saints Day
+    '2002-12-25',  # Christmas Day
+    '2002-05-09',  # Ascension Thursday
+    '2002-05-20',  # Whit Monday
+    '2003-01-01',  # New year
+    '2003-05-01',  # Labour Day
+    '2003-05-08',  # Victory in Europe Day
+    '2003-07-14',  # Bastille Day
+    '2003-11-11',  # Armistice Day
+    '2003-04-21',  # Easter Monday
+    '2003-08-15',  # Assumption of Mary to Heaven
+    '2003-11-01',  # All Saints Day
+    '2003-12-25',  # Christmas Day
+    '2003-05-29',  # Ascension Thursday
+    '2003-06-09',  # Whit Monday
+    '2004-01-01',  # New year
+    '2004-05-01',  # Labour Day
+    '2004-05-08',  # Victory in Europe Day
+    '2004-07-14',  # Bastille Day
+    '2004-11-11',  # Armistice Day
+    '2004-04-12',  # Easter Monday
+    '2004-08-15',  # Assumption of Mary to Heaven
+    '2004-11-01',  # All Saints Day
+    '2004-12-25',  # Christmas Day
+    '2004-05-20',  # Ascension Thursday
+    '2004-05-31',  # Whit Monday
+    '2005-01-01',  # New year
+    '2005-05-01',  # Labour Day
+    '2005-05-08',  # Victory in Europe Day
+    '2005-07-14',  # Bastille Day
+    '2005-11-11',  # Armistice Day
+    '2005-03-28',  # Easter Monday
+    '2005-08-15',  # Assumption of Mary to Heaven
+    '2005-11-01',  # All Saints Day
+    '2005-12-25',  # Christmas Day
+    '2005-05-05',  # Ascension Thursday
+    '2005-05-16',  # Whit Monday
+    '2006-01-01',  # New year
+    '2006-05-01',  # Labour Day
+    '2006-05-08',  # Victory in Europe Day
+    '2006-07-14',  # Bastille Day
+    '2006-11-11',  # Armistice Day
+    '2006-04-17',  # Easter Monday
+    '2006-08-15',  # Assumption of Mary to Heaven
+    '2006-11-01',  # All Saints Day
+    '2006-12-25',  # Christmas Day
+    '2006-05-25',  # Ascension Thursday
+    '2006-06-05',  # Whit Monday
+    '2007-01-01',  # New year
+    '2007-05-01',  # Labour Day
+    '2007-05-08',  # Victory in Europe Day
+    '2007-07-14',  # Bastille Day
+    '2007-11-11',  # Armistice Day
+    '2007-04-09',  # Easter Monday
+    '2007-08-15',  # Assumption of Mary to Heaven
+    '2007-11-01',  # All Saints Day
+    '2007-12-25',  # Christmas Day
+    '2007-05-17',  # Ascension Thursday
+    '2007-05-28',  # Whit Monday
+    '2008-01-01',  # New year
+    '2008-05-01',  # Ascension Thursday
+    '2008-05-08',  # Victory in Europe Day
+    '2008-07-14',  # Bastille Day
+    '2008-11-11',  # Armistice Day
+    '2008-03-24',  # Easter Monday
+    '2008-08-15',  # Assumption of Mary to Heaven
+    '2008-11-01',  # All Saints Day
+    '2008-12-25',  # Christmas Day
+    '2008-05-12',  # Whit Monday
+    '2009-01-01',  # New year
+    '2009-05-01',  # Labour Day
+    '2009-05-08',  # Victory in Europe Day
+    '2009-07-14',  # Bastille Day
+    '2009-11-11',  # Armistice Day
+    '2009-04-13',  # Easter Monday
+    '2009-08-15',  # Assumption of Mary to Heaven
+    '2009-11-01',  # All Saints Day
+    '2009-12-25',  # Christmas Day
+    '2009-05-21',  # Ascension Thursday
+    '2009-06-01',  # Whit Monday
+    '2010-01-01',  # New year
+    '2010-05-01',  # Labour Day
+    '2010-05-08',  # Victory in Europe Day
+    '2010-07-14',  # Bastille Day
+    '2010-11-11',  # Armistice Day
+    '2010-04-05',  # Easter Monday
+    '2010-08-15',  # Assumption of Mary to Heaven
+    '2010-11-01',  # All Saints Day
+    '2010-12-25',  # Christmas Day
+    '2010-05-13',  # Ascension Thursday
+    '2010-05-24',  # Whit Monday
+    '2011-01-01',  # New year
+    '2011-05-01',  # Labour Day
+    '2011-05-08',  # Victory in Europe Day
+    '2011-07-14',  # Bastille Day
+    '2011-11-11',  # Armistice Day
+    '2011-04-25',  # Easter Monday
+    '2011-08-15',  # Assumption of Mary to Heaven
+    '2011-11-01',  # All Saints Day
+    '2011-12-25',  # Christmas Day
+    '2011-06-02',  # Ascension Thursday
+    '2011-06-13',  # Whit Monday
+    '2012-01-01',  # New year
+    '2012-05-01',  # Labour Day
+    '2012-05-08',  # Victory in Europe Day
+    '2012-07-14',  # Bastille Day
+    '2012-11-11',  # Armistice Day
+    '2012-04-09',  # Easter Monday
+    '2012-08-15',  # Assumption of Mary to Heaven
+    '2012-11-01',  # All Saints Day
+    '2012-12-25',  # Christmas Day
+    '2012-05-17',  # Ascension Thursday
+    '2012-05-28',  # Whit Monday
+    '2013-01-01',  # New year
+    '2013-05-01',  # Labour Day
+    '2013-05-08',  # Victory in Europe Day
+    '2013-07-14',  # Bastille Day
+    '2013-11-11',  # Armistice Day
+    '2013-04-01',  # Easter Monday
+    '2013-08-15',  # Assumption of Mary to Heaven
+    '2013-11-01',  # All Saints Day
+    '2013-12-25',  # Christmas Day
+    '2013-05-09',  # Ascension Thursday
+    '2013-05-20',  # Whit Monday
+    '2014-01-01',  # New year
+    '2014-05-01',  # Labour Day
+    '2014-05-08',  # Victory in Europe Day
+    '2014-07-14',  # Bastille Day
+    '2014-11-11',  # Armistice Day
+    '2014-04-21',  # Easter Monday
+    '2014-08-15',  # Assumption of Mary to Heaven
+    '2014-11-01',  # All Saints Day
+    '2014-12-25',  # Christmas Day
+    '2014-05-29',  # Ascension Thursday
+    '2014-06-09',  # Whit Monday
+    '2015-01-01',  # New year
+    '2015-05-01',  # Labour Day
+    '2015-05-08',  # Victory in Europe Day
+    '2015-07-14',  # Bastille Day
+    '2015-11-11',  # Armistice Day
+    '2015-04-06',  # Easter Monday
+    '2015-08-15',  # Assumption of Mary to Heaven
+    '2015-11-01',  # All Saints Day
+    '2015-12-25',  # Christmas Day
+    '2015-05-14',  # Ascension Thursday
+    '2015-05-25',  # Whit Monday
+    '2016-01-01',  # New year
+    '2016-05-01',  # Labour Day
+    '2016-05-08',  # Victory in Europe Day
+    '2016-07-14',  # Bastille Day
+    '2016-11-11',  # Armistice Day
+    '2016-03-28',  # Easter Monday
+    '2016-08-15',  # Assumption of Mary to Heaven
+    '2016-11-01',  # All Saints Day
+    '2016-12-25',  # Christmas Day
+    '2016-05-05',  # Ascension Thursday
+    '2016-05-16',  # Whit Monday
+    '2017-01-01',  # New year
+    '2017-05-01',  # Labour Day
+    '2017-05-08',  # Victory in Europe Day
+    '2017-07-14',  # Bastille Day
+    '2017-11-11',  # Armistice Day
+    '2017-04-17',  # Easter Monday
+    '2017-08-15',  # Assumption of Mary to Heaven
+    '2017-11-01',  # All Saints Day
+    '2017-12-25',  # Christmas Day
+    '2017-05-25',  # Ascension Thursday
+    '2017-06-05',  # Whit Monday
+    '2018-01-01',  # New year
+    '2018-05-01',  # Labour Day
+    '2018-05-08',  # Victory in Europe Day
+    '2018-07-14',  # Bastille Day
+    '2018-11-11',  # Armistice Day
+    '2018-04-02',  # Easter Monday
+    '2018-08-15',  # Assumption of Mary to Heaven
+    '2018-11-01',  # All Saints Day
+    '2018-12-25',  # Christmas Day
+    '2018-05-10',  # Ascension Thursday
+    '2018-05-21',  # Whit Monday
+    '2019-01-01',  # New year
+    '2019-05-01',  # Labour Day
+    '2019-05-08',  # Victory in Europe Day
+    '2019-07-14',  # Bastille Day
+    '2019-11-11',  # Armistice Day
+    '2019-04-22',  # Easter Monday
+    '2019-08-15',  # Assumption of Mary to Heaven
+    '2019-11-01',  # All Saints Day
+    '2019-12-25',  # Christmas Day
+    '2019-05-30',  # Ascension Thursday
+    '2019-06-10',  # Whit Monday
+    ], dtype = 'datetime64[D]')
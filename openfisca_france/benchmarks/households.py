@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Synthetic populations of households, for benchmarks."""
+
+
+from __future__ import division
+
+import numpy as np
+from openfisca_core import periods
+
+
+def build_input_variables(households_count, year, seed = 0):
+    """Return the input arrays of a random population of households, by variable name and period.
+
+    Each household is a single person or a couple, with 0 to 3 children, forming a single famille, foyer fiscal and
+    menage. The population is built with a few vectorized operations, whatever its size.
+    """
+    random_state = np.random.RandomState(seed)
+    period = periods.period('year', year)
+    couple = random_state.random_sample(households_count) < 0.5
+    adults_count = 1 + couple
+    children_count = random_state.choice(4, households_count, p = [0.4, 0.25, 0.25, 0.1])
+    household_size = adults_count + children_count
+    persons_count = household_size.sum()
+
+    household = np.repeat(np.arange(households_count, dtype = np.int32), household_size)
+    rank = np.arange(persons_count) - np.repeat(np.cumsum(household_size) - household_size, household_size)
+    person_adults_count = np.repeat(adults_count, household_size)
+    is_adult = rank < person_adults_count
+    # Roles of parents are 0 and 1, roles of children start at 2, in every entity.
+    role = np.where(is_adult, rank, 2 + rank - person_adults_count).astype(np.int16)
+
+    age = np.where(is_adult, random_state.randint(25, 65, persons_count), random_state.randint(0, 18, persons_count))
+    birth = (year - age - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+    active = is_adult & (random_state.random_sample(persons_count) < 0.8)
+    salaire_de_base = np.where(active, 25000 * np.exp(random_state.normal(0, 0.6, persons_count)), 0)
+    activite = np.where(is_adult, np.where(active, 0, 1), 2).astype(np.int16)
+    statmarit = np.where(is_adult & np.repeat(couple, household_size), 1, 2).astype(np.int16)
+
+    loyer = random_state.randint(400, 900, households_count).astype(np.int32)
+    statut_occupation = np.where(random_state.random_sample(households_count) < 0.6, 4, 2).astype(np.int16)
+
+    input_variables = dict(
+        activite = activite,
+        birth = birth,
+        idfam = household,
+        idfoy = household,
+        idmen = household,
+        loyer = loyer,
+        quifam = role,
+        quifoy = role,
+        quimen = role,
+        salaire_de_base = salaire_de_base,
+        statmarit = statmarit,
+        statut_occupation = statut_occupation,
+        )
+    return dict(
+        (variable_name, {period: array})
+        for variable_name, array in input_variables.iteritems()
+        )
+
+
+def new_simulation(tax_benefit_system, households_count, year, seed = 0):
+    """Return a new simulation of a random population of households."""
+    scenario = tax_benefit_system.Scenario()
+    scenario.period = periods.period('year', year)
+    scenario.tax_benefit_system = tax_benefit_system
+    scenario.input_variables = input_variables = build_input_variables(households_count, year, seed = seed)
+    for variable_name, array_by_period in input_variables.iteritems():
+        dtype = tax_benefit_system.column_by_name[variable_name].dtype
+        for period, array in array_by_period.iteritems():
+            # Note: astype doesn't copy arrays already having the dtype of their column.
+            array_by_period[period] = array.astype(dtype, copy = False)
+    simulation = scenario.new_simulation()
+    for entity in simulation.entity_by_key_plural.itervalues():
+        if not entity.is_persons_entity:
+            entity.roles_count = int(simulation.calculate(entity.role_for_person_variable_name).max()) + 1
+    return simulation
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Time the main aggregates of OpenFisca-France on synthetic populations and compare with a baseline.
+
+Each population size is benchmarked in its own process, to measure its peak memory. The "cold" time of a variable is
+the time of its first computation, in a new simulation; the "warm" time is the time of the same computation in a second
+simulation of the same population, once the legislation and the code paths are warm.
+"""
+
+
+import argparse
+import collections
+import json
+import logging
+import multiprocessing
+import Queue
+import resource
+import sys
+import time
+
+
+default_households_counts = [1, 1000, 100000, 1000000]
+default_variables_name = [
+    'irpp',
+    'revdisp',
+    'salsuperbrut',
+    'rsa',
+    'aide_logement',
+    'cotisations_employeur',
+    ]
+log = logging.getLogger(__name__)
+
+
+def compare_with_baseline(results, baseline, tolerance = 0.2):
+    """Return the descriptions of the measures of results exceeding the ones of baseline by more than tolerance.
+
+    Failed benchmarks are always reported.
+    """
+    regressions = []
+    baseline_by_households_count = dict(
+        (benchmark['households_count'], benchmark)
+        for benchmark in baseline['benchmarks']
+        )
+    for benchmark in results['benchmarks']:
+        if benchmark.get('error') is not None:
+            regressions.append('{} households - failed: {}'.format(benchmark['households_count'], benchmark['error']))
+            continue
+        baseline_benchmark = baseline_by_households_count.get(benchmark['households_count'])
+        if baseline_benchmark is None or baseline_benchmark.get('error') is not None:
+            continue
+        measures = [('peak_rss_kb', benchmark['peak_rss_kb'], baseline_benchmark['peak_rss_kb'])]
+        for variable_name, duration_by_state in benchmark['durations'].iteritems():
+            baseline_duration_by_state = baseline_benchmark['durations'].get(variable_name)
+            if baseline_duration_by_state is None:
+                continue
+            for state, duration in duration_by_state.iteritems():
+                measures.append(('{} ({})'.format(variable_name, state), duration, baseline_duration_by_state[state]))
+        for name, value, baseline_value in measures:
+            if value > baseline_value * (1 + tolerance):
+                regressions.append('{} households - {}: {:.3f} > {:.3f} (baseline)'.format(
+                    benchmark['households_count'], name, value, baseline_value))
+    return regressions
+
+
+def run_benchmark(households_count, variables_name, year):
+    """Run the benchmark of a population size and return its measures. Must be called in its own process."""
+    from openfisca_france import init_country
+
+    from . import households
+
+    durations = collections.OrderedDict()
+    start_time = time.time()
+    tax_benefit_system = init_country()()
+    tax_benefit_system_duration = time.time() - start_time
+
+    simulation_duration_by_state = {}
+    for state in ('cold', 'warm'):
+        start_time = time.time()
+        simulation = households.new_simulation(tax_benefit_system, households_count, year)
+        simulation_duration_by_state[state] = time.time() - start_time
+        for variable_name in variables_name:
+            start_time = time.time()
+            simulation.calculate_add(variable_name)
+            durations.setdefault(variable_name, collections.OrderedDict())[state] = time.time() - start_time
+        del simulation
+
+    return collections.OrderedDict((
+        ('households_count', households_count),
+        ('tax_benefit_system_duration', tax_benefit_system_duration),
+        ('simulation_duration', simulation_duration_by_state),
+        ('durations', durations),
+        # Note: On Linux, ru_maxrss is in kilobytes.
+        ('peak_rss_kb', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+        ))
+
+
+def run_benchmark_in_process(households_count, variables_name, year, timeout = None):
+    """Run the benchmark of a population size in a new process and return its measures.
+
+    When the process dies without result (crash, OOM kill...) or runs for more than timeout seconds, a failed benchmark
+    is returned, with an error instead of measures.
+    """
+    queue = multiprocessing.Queue()
+
+    def target():
+        queue.put(run_benchmark(households_count, variables_name, year))
+
+    process = multiprocessing.Process(target = target)
+    process.start()
+    start_time = time.time()
+    benchmark = None
+    error = None
+    while benchmark is None and error is None:
+        try:
+            benchmark = queue.get(timeout = 1)
+        except Queue.Empty:
+            if process.is_alive():
+                if timeout is not None and time.time() - start_time > timeout:
+                    process.terminate()
+                    error = 'timeout after {} s'.format(timeout)
+                continue
+            # The result may have been put just before the end of the process.
+            try:
+                benchmark = queue.get(timeout = 1)
+            except Queue.Empty:
+                error = 'process exited with code {}'.format(process.exitcode)
+    process.join()
+    if benchmark is None:
+        log.error(u'Benchmark of {} households failed: {}'.format(households_count, error))
+        return collections.OrderedDict((
+            ('households_count', households_count),
+            ('error', error),
+            ))
+    return benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-b', '--baseline', default = None,
+        help = "path of the JSON results of a previous run, to compare with")
+    parser.add_argument('-o', '--output', default = None, help = "path of the JSON file where to write the results")
+    parser.add_argument('-s', '--sizes', default = default_households_counts, nargs = '+', type = int,
+        help = "numbers of households of the benchmarked populations")
+    parser.add_argument('--timeout', default = None, type = float,
+        help = "maximum duration in seconds of the benchmark of a population size")
+    parser.add_argument('-t', '--tolerance', default = 0.2, type = float,
+        help = "relative increase of a measure, above which it is reported as a regression")
+    parser.add_argument('--variables', default = default_variables_name, nargs = '+',
+        help = "names of the benchmarked variables")
+    parser.add_argument('-v', '--verbose', action = 'store_true', default = False, help = "increase output verbosity")
+    parser.add_argument('-y', '--year', default = 2014, type = int, help = "year of the simulations")
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.DEBUG if args.verbose else logging.WARNING, stream = sys.stdout)
+
+    results = collections.OrderedDict((
+        ('year', args.year),
+        ('benchmarks', []),
+        ))
+    for households_count in args.sizes:
+        benchmark = run_benchmark_in_process(households_count, args.variables, args.year, timeout = args.timeout)
+        results['benchmarks'].append(benchmark)
+        if benchmark.get('error') is not None:
+            print('{} households: failed ({})'.format(households_count, benchmark['error']))
+            continue
+        print('{} households (peak RSS: {} kB)'.format(households_count, benchmark['peak_rss_kb']))
+        for variable_name, duration_by_state in benchmark['durations'].iteritems():
+            print('    {}: {:.3f} s cold, {:.3f} s warm'.format(variable_name, duration_by_state['cold'],
+                duration_by_state['warm']))
+
+    if args.output is not None:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent = 2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_with_baseline(results, baseline, tolerance = args.tolerance)
+        if regressions:
+            print('Regressions:')
+            for regression in regressions:
+                print('    {}'.format(regression))
+            return 1
+    if any(benchmark.get('error') is not None for benchmark in results['benchmarks']):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
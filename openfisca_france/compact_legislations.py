@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Bounded store of compact legislations, shared by all the instants where the legislation doesn't change."""
+
+
+import bisect
+import collections
+
+from openfisca_core import legislations, periods
+
+
+class CompactLegislationStore(object):
+    """Least recently used cache of compact legislations, keyed by legislation state instead of by instant.
+
+    The legislation only changes at a few instants: the starts of values and the days following their stops. Every
+    instant between two consecutive changes uses the same compact legislation, so a monthly simulation over many years
+    builds each dated legislation only once.
+    """
+    change_instants_str = None  # Sorted list of the instants where at least one parameter changes
+    compact_legislation_by_state = None
+    legislation_json = None
+    max_size = None
+
+    def __init__(self, legislation_json, max_size = 128):
+        assert legislation_json is not None
+        self.compact_legislation_by_state = collections.OrderedDict()
+        self.legislation_json = legislation_json
+        self.max_size = max_size
+
+    def get(self, instant):
+        if self.change_instants_str is None:
+            self.change_instants_str = sorted(iter_change_instants_str(self.legislation_json))
+        instant = periods.instant(instant)
+        state = bisect.bisect_right(self.change_instants_str, str(instant))
+        compact_legislation = self.compact_legislation_by_state.pop(state, None)
+        if compact_legislation is None:
+            dated_legislation_json = legislations.generate_dated_legislation_json(self.legislation_json, instant)
+            compact_legislation = legislations.compact_dated_node_json(dated_legislation_json)
+            if len(self.compact_legislation_by_state) >= self.max_size:
+                self.compact_legislation_by_state.popitem(last = False)
+        # (Re)insert at the end, to keep the most recently used compact legislations.
+        self.compact_legislation_by_state[state] = compact_legislation
+        return compact_legislation
+
+
+def iter_change_instants_str(legislation_json):
+    yield legislation_json['start']
+    yield next_day_str(legislation_json['stop'])
+    for values_json in iter_values_json(legislation_json):
+        for value_json in values_json:
+            yield value_json['start']
+            yield next_day_str(value_json['stop'])
+
+
+def iter_values_json(node_json):
+    children_json = node_json.get('children')
+    if children_json is not None:
+        for child_json in children_json.itervalues():
+            for values_json in iter_values_json(child_json):
+                yield values_json
+    for bracket_json in node_json.get('brackets') or []:
+        for key in ('amount', 'base', 'rate', 'threshold'):
+            values_json = bracket_json.get(key)
+            if values_json is not None:
+                yield values_json
+    values_json = node_json.get('values')
+    if values_json is not None:
+        yield values_json
+
+
+def next_day_str(instant_str):
+    if instant_str >= '9999-12-31':
+        return instant_str
+    return str(periods.instant(instant_str).offset(1, 'day'))
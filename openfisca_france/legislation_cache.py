@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""On-disk cache of the preprocessed legislation JSON, to avoid parsing, validating & preprocessing param.xml at each
+start of a process.
+
+Cache files are named after a hash of everything the legislation JSON depends on (the XML file, the preprocessing
+module, the preprocessing function of the tax-benefit system and the XML converter of OpenFisca-Core), so that a stale
+cache is never used.
+"""
+
+
+import cPickle
+import hashlib
+import inspect
+import logging
+import os
+import tempfile
+
+
+log = logging.getLogger(__name__)
+
+
+def default_cache_dir():
+    """Return the directory of the legislation cache, or None when the cache is disabled.
+
+    The cache is stored in $OPENFISCA_FRANCE_CACHE_DIR when set (an empty value disables it), otherwise in the
+    openfisca-france directory of the user cache ($XDG_CACHE_HOME or ~/.cache).
+    """
+    cache_dir = os.environ.get('OPENFISCA_FRANCE_CACHE_DIR')
+    if cache_dir is not None:
+        return cache_dir or None
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+        'openfisca-france',
+        )
+
+
+def get_cache_file_path(cache_dir, legislation_xml_file_path, modules, functions = ()):
+    """Return the path of the cache file, or None when the source of a function is unavailable.
+
+    Functions are hashed with their qualified name and their source.
+    """
+    digest = hashlib.sha1()
+    with open(legislation_xml_file_path, 'rb') as xml_file:
+        digest.update(xml_file.read())
+    for module in modules:
+        digest.update(inspect.getsource(module))
+    for function in functions:
+        digest.update('{}.{}'.format(function.__module__, function.__name__))
+        try:
+            digest.update(inspect.getsource(function))
+        except (IOError, TypeError):
+            log.info(u'Legislation cache disabled: source of {!r} is unavailable'.format(function))
+            return None
+    return os.path.join(cache_dir, 'legislation-{}.pickle'.format(digest.hexdigest()))
+
+
+def load_legislation_json(cache_file_path):
+    """Return the cached legislation JSON, or None when it is missing or unreadable."""
+    if not os.path.exists(cache_file_path):
+        return None
+    try:
+        with open(cache_file_path, 'rb') as cache_file:
+            return cPickle.load(cache_file)
+    except Exception:
+        log.warning(u'Ignoring unreadable legislation cache file {}'.format(cache_file_path), exc_info = True)
+        return None
+
+
+def save_legislation_json(cache_file_path, legislation_json):
+    """Store the legislation JSON in cache. Failures are logged but never raised."""
+    cache_dir = os.path.dirname(cache_file_path)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        # Write to a temporary file, then rename it, so that concurrent processes never read a partial file.
+        file_descriptor, temporary_file_path = tempfile.mkstemp(dir = cache_dir, suffix = '.tmp')
+        with os.fdopen(file_descriptor, 'wb') as cache_file:
+            cPickle.dump(legislation_json, cache_file, cPickle.HIGHEST_PROTOCOL)
+        os.rename(temporary_file_path, cache_file_path)
+    except (IOError, OSError):
+        log.warning(u'Unable to write legislation cache file {}'.format(cache_file_path), exc_info = True)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Legislation JSON variants sharing every unchanged node with their reference legislation.
+
+A variant copies only the nodes on the paths it changes, so building it costs the size of these paths instead of the
+size of the whole legislation, and many variants (of reforms for example) can coexist in a single process. Shared
+nodes must never be modified in place: use these functions to derive a new variant instead.
+"""
+
+
+from openfisca_core import reforms
+
+
+def add_children(legislation_json, children):
+    """Return a variant of legislation_json, where the given nodes are added to (or replace) the root children."""
+    new_legislation_json = legislation_json.copy()
+    new_legislation_json['children'] = new_children = legislation_json['children'].copy()
+    new_children.update(children)
+    return new_legislation_json
+
+
+def update_legislation(legislation_json, path, period = None, value = None, start = None, stop = None):
+    """Return a variant of legislation_json, where the values at path are set to value between start and stop.
+
+    Same as openfisca_core.reforms.update_legislation, but only the nodes along path are copied.
+    """
+    assert value is not None
+    if period is not None:
+        assert start is None and stop is None, u'period parameter can\'t be used with start and stop'
+        start = period.start
+        stop = period.stop
+    assert start is not None and stop is not None, u'start and stop must be provided, or period'
+
+    def build_node(node, path_index):
+        key = path[path_index]
+        if isinstance(node, list):
+            new_node = list(node)
+        elif isinstance(node, dict):
+            new_node = node.copy()
+        else:
+            raise ValueError(u'Unexpected type for node: {!r}'.format(node))
+        new_node[key] = (
+            reforms.updated_legislation_items(node[key], start, stop, value)
+            if path_index == len(path) - 1
+            else build_node(node[key], path_index + 1)
+            )
+        return new_node
+
+    return build_node(legislation_json, 0)
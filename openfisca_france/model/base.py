@@ -26,6 +26,7 @@
 from datetime import date
 import functools
 
+from numpy import column_stack
 from openfisca_core.accessors import law
 from openfisca_core.columns import (AgeCol, BoolCol, build_column, DateCol, EnumCol, FixedStrCol, FloatCol, IntCol,
     PeriodSizeIndependentIntCol, StrCol)
@@ -35,7 +36,7 @@ from openfisca_core.formulas import (dated_function, DatedFormulaColumn, EntityT
     requested_period_added_value, requested_period_default_value, requested_period_last_value,
     set_input_dispatch_by_period, set_input_divide_by_period, SimpleFormulaColumn)
 
-from openfisca_survey_manager.statshelpers import mark_weighted_percentiles, weighted_quantiles
+from openfisca_survey_manager.statshelpers import mark_weighted_percentiles
 
 from ..entities import entity_class_by_symbol, Familles, FoyersFiscaux, Individus, Menages
 
@@ -84,11 +85,11 @@ __all__ = [
     'set_input_dispatch_by_period',
     'set_input_divide_by_period',
     'SimpleFormulaColumn',
+    'sort_by_roles',
     'StrCol',
     'TAUX_DE_PRIME',
     'VOUS',
     'mark_weighted_percentiles',
-    'weighted_quantiles',
     ]
 
 CAT = Enum([
@@ -131,3 +132,15 @@ build_column = functools.partial(
     )
 
 reference_formula = make_reference_formula_decorator(entity_class_by_symbol = entity_class_by_symbol)
+
+
+def sort_by_roles(array_by_role, reverse = False):
+    """Return a matrix with a row per entity, containing the values of its members sorted in a single numpy sort.
+
+    array_by_role is a dict of arrays, as returned by split_by_roles.
+    """
+    matrix = column_stack([array_by_role[role] for role in sorted(array_by_role)])
+    matrix.sort(axis = 1)
+    if reverse:
+        return matrix[:, ::-1]
+    return matrix
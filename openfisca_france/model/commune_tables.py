@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Parameters indexed by commune (code INSEE, aka depcom), stored as columnar arrays for vectorized lookups."""
+
+
+import csv
+import json
+import pkg_resources
+
+from numpy import array, int16
+
+import openfisca_france
+
+
+class CommuneTable(object):
+    """Columns of parameters sharing a sorted index of depcom.
+
+    Depcom are compared as 5 bytes strings, so that Corsica codes (2A..., 2B...) are ordered like the others.
+    """
+    array_by_column_name = None
+    sorted_depcom = None
+
+    def __init__(self, value_by_column_name_by_depcom, dtype_by_column_name):
+        self.sorted_depcom = array(sorted(str(depcom) for depcom in value_by_column_name_by_depcom), dtype = 'S5')
+        self.array_by_column_name = {
+            column_name: array(
+                [value_by_column_name_by_depcom[depcom][column_name] for depcom in self.sorted_depcom],
+                dtype = dtype,
+                )
+            for column_name, dtype in dtype_by_column_name.iteritems()
+            }
+
+    def add_aliases(self, depcom_by_alias_depcom):
+        """Return a new table where each alias depcom (arrondissement, commune associée...) has its parent values."""
+        value_by_column_name_by_depcom = self.to_dict()
+        for alias_depcom, depcom in depcom_by_alias_depcom.iteritems():
+            value_by_column_name_by_depcom[alias_depcom] = value_by_column_name_by_depcom[depcom]
+        return self.__class__(value_by_column_name_by_depcom, {
+            column_name: column_array.dtype
+            for column_name, column_array in self.array_by_column_name.iteritems()
+            })
+
+    def get(self, depcom, column_names, default_by_column_name = None):
+        """Return the arrays of values of the given columns for an array of depcom.
+
+        The depcom array is searched only once, whatever the number of columns. Unknown depcom get the value found in
+        default_by_column_name (or 0).
+        """
+        index, found = self.index(depcom)
+        return tuple(
+            self.take(column_name, index, found, default = (default_by_column_name or {}).get(column_name, 0))
+            for column_name in column_names
+            )
+
+    @classmethod
+    def from_csv(cls, resource_name, depcom_column_name = None, converter_by_column_name = None,
+            dtype_by_column_name = None):
+        """Load a CSV file of the openfisca_france package.
+
+        converter_by_column_name maps each CSV column to keep to the function converting its cells. When a depcom
+        appears several times, its last row wins.
+        """
+        assert depcom_column_name is not None
+        assert converter_by_column_name
+        with pkg_resources.resource_stream(openfisca_france.__name__, resource_name) as csv_file:
+            value_by_column_name_by_depcom = {
+                row[depcom_column_name]: {
+                    column_name: converter(row[column_name])
+                    for column_name, converter in converter_by_column_name.iteritems()
+                    }
+                for row in csv.DictReader(csv_file)
+                }
+        return cls(value_by_column_name_by_depcom, dict(
+            (column_name, (dtype_by_column_name or {}).get(column_name, float))
+            for column_name in converter_by_column_name
+            ))
+
+    def index(self, depcom):
+        """Return the positions of an array of depcom in the table and the mask of depcom found in it."""
+        if depcom.dtype != self.sorted_depcom.dtype:
+            depcom = depcom.astype(self.sorted_depcom.dtype)
+        index = self.sorted_depcom.searchsorted(depcom)
+        # Depcom greater than the last known one must not index out of bounds.
+        index[index == len(self.sorted_depcom)] = 0
+        return index, self.sorted_depcom[index] == depcom
+
+    def take(self, column_name, index, found, default = 0):
+        column_array = self.array_by_column_name[column_name]
+        values = column_array[index]
+        values[~found] = default
+        return values
+
+    def to_dict(self):
+        return {
+            depcom: {
+                column_name: column_array[position]
+                for column_name, column_array in self.array_by_column_name.iteritems()
+                }
+            for position, depcom in enumerate(self.sorted_depcom)
+            }
+
+
+def load_json_resource(resource_name):
+    with pkg_resources.resource_stream(openfisca_france.__name__, resource_name) as json_file:
+        return json.load(json_file)
+
+
+# Tables
+
+
+def load_taux_versement_transport_table():
+    return CommuneTable.from_csv(
+        'assets/versement_transport/taux.csv',
+        depcom_column_name = 'code INSEE',
+        converter_by_column_name = {
+            'taux': lambda value: float(value or 0),  # autorité organisatrice des transports (AOT)
+            'taux additionnel': lambda value: float(value or 0),  # syndicat mixte de transport (SMT)
+            },
+        )
+
+
+def load_zone_apl_table():
+    table = CommuneTable.from_csv(
+        'assets/apl/20110914_zonage.csv',
+        depcom_column_name = 'CODGEO',
+        # Keep only first char of Zonage column because of 1bis value considered equivalent to 1.
+        converter_by_column_name = {'Zonage': lambda value: int(value[0])},
+        dtype_by_column_name = {'Zonage': int16},
+        )
+    # Add subcommunes (arrondissements and communes associées), use the same value as their parent commune.
+    return table.add_aliases(load_json_resource('assets/apl/commune_depcom_by_subcommune_depcom.json'))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Weighted distributions of variables, sorted once and shared by all their statistics (quantiles, Gini, poverty)."""
+
+
+from __future__ import division
+
+from numpy import argsort, asarray, concatenate, cumsum, interp, linspace, ones, searchsorted
+
+
+class WeightedDistribution(object):
+    """Values sorted with their weights, to compute any number of distributional statistics with a single sort."""
+    cumulated_weights = None  # Cumulated weights of the sorted values
+    positions = None  # Position (between 0 and 1) of each sorted value in the weighted distribution
+    sorted_values = None
+    sorted_weights = None
+    values = None
+    weights = None
+
+    def __init__(self, values, weights = None):
+        self.values = values = asarray(values)
+        self.weights = weights = asarray(weights) if weights is not None else ones(len(values))
+        order = argsort(values)
+        self.sorted_values = values[order]
+        self.sorted_weights = sorted_weights = weights[order]
+        self.cumulated_weights = cumulated_weights = cumsum(sorted_weights)
+        # Same interpolation as wquantiles.quantile_1D, used by openfisca_survey_manager.statshelpers.
+        self.positions = (cumulated_weights - 0.5 * sorted_weights) / cumulated_weights[-1]
+
+    def gini(self):
+        """Return the Gini coefficient, computed from the Lorenz curve."""
+        population_shares = concatenate(([0], self.cumulated_weights / self.cumulated_weights[-1]))
+        cumulated_values = cumsum(self.sorted_values * self.sorted_weights)
+        values_shares = concatenate(([0], cumulated_values / cumulated_values[-1]))
+        return 1 - ((population_shares[1:] - population_shares[:-1]) * (values_shares[1:] + values_shares[:-1])).sum()
+
+    def poverty_rate(self, threshold):
+        """Return the weighted share of the values strictly below threshold."""
+        below_count = searchsorted(self.sorted_values, threshold, side = 'left')
+        if below_count == 0:
+            return 0.0
+        return self.cumulated_weights[below_count - 1] / self.cumulated_weights[-1]
+
+    def quantile_labels(self, count):
+        """Return, for each value, the number (from 1 to count) of its quantile, deciles for a count of 10."""
+        return searchsorted(self.quantiles(linspace(0, 1, count + 1)[1:-1]), self.values, side = 'right') + 1
+
+    def quantiles(self, fractions):
+        """Return the values at the given fractions (between 0 and 1) of the weighted distribution."""
+        return interp(fractions, self.positions, self.sorted_values)
+
+
+def get_distribution(simulation, variable_name, period = None, weight_variable_name = None):
+    """Return the weighted distribution of a variable, cached in simulation.
+
+    The cached distribution is reused as long as the arrays of the variable and of the weights are unchanged.
+    """
+    if period is None:
+        period = simulation.period
+    values = simulation.calculate(variable_name, period)
+    weights = simulation.calculate(weight_variable_name, period) if weight_variable_name is not None else None
+    distribution_by_key = simulation.__dict__.setdefault('distribution_by_key', {})
+    key = (variable_name, period, weight_variable_name)
+    distribution = distribution_by_key.get(key)
+    if distribution is None or distribution.values is not values or (
+            weights is not None and distribution.weights is not weights):
+        distribution_by_key[key] = distribution = WeightedDistribution(values, weights)
+    return distribution
@@ -28,6 +28,7 @@ from __future__ import division
 from numpy import floor, logical_not as not_
 
 from .base import *  # noqa analysis:ignore
+from .distributions import get_distribution
 
 
 @reference_formula
@@ -655,12 +656,5 @@ class decile_rfr(SimpleFormulaColumn):
     label = u"Décile de niveau de vie"
 
     def function(self, simulation, period):
-        rfr = simulation.calculate('rfr', period)
-        weight_foyers = simulation.calculate('weight_foyers', period)
-        import numpy
-        labels = numpy.arange(1, 11)
-        # Alternative method
-        # method = 2
-        # decile, values = mark_weighted_percentiles(niveau_de_vie, labels, pondmen, method, return_quantiles = True)
-        decile, values = weighted_quantiles(rfr, labels, weight_foyers, return_quantiles = True)
-        return period, decile
\ No newline at end of file
+        distribution = get_distribution(simulation, 'rfr', period, weight_variable_name = 'weight_foyers')
+        return period, distribution.quantile_labels(10)
\ No newline at end of file
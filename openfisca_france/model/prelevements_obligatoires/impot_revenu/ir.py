@@ -82,6 +82,26 @@ build_column('nbptr_n_2', PeriodSizeIndependentIntCol(entity = 'foy', label = u"
 ###############################################################################
 
 
+def find_anchor(holder, anchor_key, is_anchor_start):
+    """Return the start and the array of a period stored in holder, whose start verifies is_anchor_start, or None.
+
+    The anchor found is indexed by anchor_key in the holder, so that stored periods are scanned only while there is no
+    valid anchor for this key.
+    """
+    array_by_period = holder._array_by_period
+    if array_by_period is None:
+        return None
+    anchor_by_key = holder.__dict__.setdefault('anchor_by_key', {})
+    anchor = anchor_by_key.get(anchor_key)
+    if anchor is not None and array_by_period.get(anchor[0]) is anchor[1]:
+        return anchor[0].start, anchor[1]
+    for last_period, last_array in array_by_period.iteritems():
+        if is_anchor_start(last_period.start):
+            anchor_by_key[anchor_key] = (last_period, last_array)
+            return last_period.start, last_array
+    return None
+
+
 @reference_formula
 class age(SimpleFormulaColumn):
     base_function = missing_value
@@ -91,13 +111,12 @@ class age(SimpleFormulaColumn):
 
     def function(self, simulation, period):
         # If age is known at the same day & month of another year, compute the new age from it.
-        holder = self.holder
         start = period.start
-        if holder._array_by_period is not None:
-            for last_period, last_array in sorted(holder._array_by_period.iteritems(), reverse = True):
-                last_start = last_period.start
-                if last_start.day == start.day and last_start.month == start.month:
-                    return period, last_array + (start.year - last_start.year)
+        anchor = find_anchor(self.holder, (start.month, start.day),
+            lambda last_start: last_start.day == start.day and last_start.month == start.month)
+        if anchor is not None:
+            last_start, last_array = anchor
+            return period, last_array + (start.year - last_start.year)
 
         birth = simulation.get_array('birth', period)
         if birth is None:
@@ -117,13 +136,11 @@ class agem(SimpleFormulaColumn):
 
     def function(self, simulation, period):
         # If agem is known at the same day of another month, compute the new agem from it.
-        holder = self.holder
         start = period.start
-        if holder._array_by_period is not None:
-            for last_period, last_array in sorted(holder._array_by_period.iteritems(), reverse = True):
-                last_start = last_period.start
-                if last_start.day == start.day:
-                    return period, last_array + ((start.year - last_start.year) * 12 + (start.month - last_start.month))
+        anchor = find_anchor(self.holder, start.day, lambda last_start: last_start.day == start.day)
+        if anchor is not None:
+            last_start, last_array = anchor
+            return period, last_array + ((start.year - last_start.year) * 12 + (start.month - last_start.month))
 
         birth = simulation.get_array('birth', period)
         if birth is None:
@@ -26,10 +26,9 @@
 from __future__ import division
 
 
-from functools import partial
 from numpy import (
-    busday_count as original_busday_count, datetime64, logical_not as not_, logical_or as or_, maximum as max_,
-    minimum as min_, round as round_, timedelta64
+    arange, busday_count, busdaycalendar, concatenate, datetime64, int64, is_busday, logical_not as not_,
+    logical_or as or_, maximum as max_, minimum as min_, round as round_, timedelta64, where
     )
 
 import logging
@@ -39,6 +38,15 @@ from .....assets.holidays import holidays
 
 log = logging.getLogger(__name__)
 
+busdays_calendar = busdaycalendar(holidays = holidays)
+busdays_calendar_start = datetime64('1990-01-01')
+busdays_calendar_stop = datetime64('2041-01-01')
+# busdays_count_before_day[i] is the number of business days from busdays_calendar_start to the i-th day after it.
+busdays_count_before_day = concatenate((
+    [0],
+    is_busday(arange(busdays_calendar_start, busdays_calendar_stop), busdaycal = busdays_calendar).cumsum(),
+    ))
+
 
 @reference_formula
 class assiette_allegement(SimpleFormulaColumn):
@@ -108,12 +116,11 @@ class coefficient_proratisation(SimpleFormulaColumn):
         # Décompte des jours en début et fin de contrat
         # http://www.gestiondelapaie.com/flux-paie/?1029-la-bonne-premiere-paye
 
-        busday_count = partial(original_busday_count, holidays = holidays)
         debut_mois = datetime64(period.start.offset('first-of', 'month'))
         fin_mois = datetime64(period.start.offset('last-of', 'month')) + timedelta64(1, 'D')
 
         mois_incomplet = or_(contrat_de_travail_arrivee > debut_mois, contrat_de_travail_depart < fin_mois)
-        jours_travailles = busday_count(
+        jours_travailles = count_busdays(
             max_(contrat_de_travail_arrivee, debut_mois),
             min_(contrat_de_travail_depart, fin_mois)
             )
@@ -253,6 +260,31 @@ def compute_allegement_fillon(simulation, period):
     return allegement_fillon
 
 
+def count_busdays(begin, end):
+    """Count the business days between begin (included) and end (excluded), like numpy.busday_count.
+
+    Within the precomputed calendar, the count is the difference of two lookups in busdays_count_before_day.
+    """
+    begin = begin.astype('datetime64[D]')
+    end = end.astype('datetime64[D]')
+    in_calendar = (
+        (begin >= busdays_calendar_start) & (begin <= busdays_calendar_stop) &
+        (end >= busdays_calendar_start) & (end <= busdays_calendar_stop)
+        )
+    if in_calendar.all():
+        return (
+            busdays_count_before_day[(end - busdays_calendar_start).astype(int64)] -
+            busdays_count_before_day[(begin - busdays_calendar_start).astype(int64)]
+            )
+    begin_index = where(in_calendar, begin - busdays_calendar_start, 0).astype(int64)
+    end_index = where(in_calendar, end - busdays_calendar_start, 0).astype(int64)
+    return where(
+        in_calendar,
+        busdays_count_before_day[end_index] - busdays_count_before_day[begin_index],
+        busday_count(begin, end, busdaycal = busdays_calendar),
+        )
+
+
 def taux_exo_cice(assiette_allegement, smic_proratise, P):
     Pc = P.exo_bas_sal.cice
     taux_cice = ((assiette_allegement / (smic_proratise + 1e-16)) <= Pc.max) * Pc.taux
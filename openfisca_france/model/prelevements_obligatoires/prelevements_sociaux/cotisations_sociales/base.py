@@ -23,11 +23,19 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
-from numpy import zeros
+import collections
+
+from numpy import array, inf, maximum as max_, minimum as min_, ndarray, newaxis, ones, round, zeros
+
+from openfisca_core.taxscales import MarginalRateTaxScale
 
 from ....base import CAT
 
 
+# Maximum number of individuals evaluated at once by the fused evaluation of contributions
+FUSED_CHUNK_SIZE = 2 ** 16
+
+
 def apply_bareme_for_relevant_type_sal(
         bareme_by_type_sal_name = None,
         bareme_name = None,
@@ -35,21 +43,33 @@ def apply_bareme_for_relevant_type_sal(
         base = None,
         plafond_securite_sociale = None,
         round_base_decimals = 2,
+        index_by_type_sal_name = None,
         ):
+    """Apply to each individual the scale of its type_sal.
+
+    Each scale is evaluated only on the individuals of its type_sal. When index_by_type_sal_name (see
+    get_index_by_type_sal_name) is not given, it is computed from type_sal.
+    """
     assert bareme_by_type_sal_name is not None
     assert bareme_name is not None
     assert base is not None
     assert plafond_securite_sociale is not None
-    assert type_sal is not None
+    if index_by_type_sal_name is None:
+        assert type_sal is not None
+        index_by_type_sal_name = partition_by_type_sal(type_sal)
     cotisation = zeros(len(base))
-    for type_sal_name, type_sal_index in CAT:
+    for type_sal_name, index in index_by_type_sal_name.iteritems():
         if type_sal_name not in bareme_by_type_sal_name:  # to deal with public_titulaire_militaire
             continue
         bareme = bareme_by_type_sal_name[type_sal_name].get(bareme_name)  # TODO; should have better warnings
-        if bareme is not None:
-            cotisation += bareme.calc(
-                base * (type_sal == type_sal_index),
-                factor = plafond_securite_sociale,
+        if bareme is not None and len(index) > 0:
+            if isinstance(plafond_securite_sociale, ndarray):
+                factor = plafond_securite_sociale[index]
+            else:
+                factor = plafond_securite_sociale
+            cotisation[index] = bareme.calc(
+                base[index],
+                factor = factor,
                 round_base_decimals = round_base_decimals,
                 )
     return - cotisation
@@ -84,27 +104,130 @@ def apply_bareme(simulation, period, cotisation_type = None, bareme_name = None,
 def compute_cotisation(simulation, period, cotisation_type = None, bareme_name = None):
 
     assert cotisation_type is not None
+    assert bareme_name is not None
+    if getattr(simulation.tax_benefit_system, 'fused_cotisations', False):
+        cotisation = compute_cotisations(simulation, period, cotisation_type = cotisation_type).get(bareme_name)
+        if cotisation is None:
+            return - zeros(simulation.persons.count)
+        return cotisation
+
     law = simulation.legislation_at(period.start)
     if cotisation_type == "employeur":
         bareme_by_type_sal_name = law.cotsoc.cotisations_employeur
     elif cotisation_type == "salarie":
         bareme_by_type_sal_name = law.cotsoc.cotisations_salarie
-    assert bareme_name is not None
 
     assiette_cotisations_sociales = simulation.calculate_add('assiette_cotisations_sociales', period)
     plafond_securite_sociale = simulation.calculate_add('plafond_securite_sociale', period)
-    type_sal = simulation.calculate('type_sal', period)
 
     cotisation = apply_bareme_for_relevant_type_sal(
         bareme_by_type_sal_name = bareme_by_type_sal_name,
         bareme_name = bareme_name,
         base = assiette_cotisations_sociales,
         plafond_securite_sociale = plafond_securite_sociale,
-        type_sal = type_sal,
+        index_by_type_sal_name = get_index_by_type_sal_name(simulation, period),
         )
     return cotisation
 
 
+def compute_cotisations(simulation, period, cotisation_type = None):
+    """Compute at once all the contributions of the given type, by scale name (fused evaluation).
+
+    Results are cached for each simulation, period, type of contribution and tax-benefit system, as long as their
+    scales, their base, their "plafond de la sécurité sociale" and type_sal are the same objects. They are identical to
+    the ones of compute_cotisation.
+    """
+    assert cotisation_type in ('employeur', 'salarie'), cotisation_type
+    law = simulation.legislation_at(period.start)
+    bareme_by_type_sal_name = law.cotsoc['cotisations_{}'.format(cotisation_type)]
+    assiette_cotisations_sociales = simulation.calculate_add('assiette_cotisations_sociales', period)
+    plafond_securite_sociale = simulation.calculate_add('plafond_securite_sociale', period)
+    index_by_type_sal_name = get_index_by_type_sal_name(simulation, period)
+
+    # Simulations cloned from a simulation of another tax-benefit system share this cache: key it by tax-benefit system.
+    tax_benefit_system = simulation.tax_benefit_system
+    fused_cotisations_key = (cotisation_type, period, id(tax_benefit_system))
+    fused_cotisations_by_key = simulation.__dict__.setdefault('fused_cotisations_by_key', {})
+    fused_cotisations = fused_cotisations_by_key.get(fused_cotisations_key)
+    if fused_cotisations is not None:
+        cotisation_by_bareme_name = fused_cotisations[-1]
+        if all(
+                cached_object is current_object
+                for cached_object, current_object in zip(fused_cotisations[:-1], (
+                    tax_benefit_system,
+                    bareme_by_type_sal_name,
+                    assiette_cotisations_sociales,
+                    plafond_securite_sociale,
+                    index_by_type_sal_name,
+                    ))
+                ):
+            return cotisation_by_bareme_name
+
+    cotisation_by_bareme_name = {}
+    for type_sal_name, index in index_by_type_sal_name.iteritems():
+        if type_sal_name not in bareme_by_type_sal_name or len(index) == 0:
+            continue
+        bareme_by_name = dict(
+            (bareme_name, bareme)
+            for bareme_name, bareme in bareme_by_type_sal_name[type_sal_name].iteritems()
+            if isinstance(bareme, MarginalRateTaxScale)
+            )
+        for bareme_name, cotisation in calculate_stacked_baremes(
+                bareme_by_name,
+                assiette_cotisations_sociales[index],
+                plafond_securite_sociale[index],
+                ).iteritems():
+            if bareme_name not in cotisation_by_bareme_name:
+                cotisation_by_bareme_name[bareme_name] = zeros(len(assiette_cotisations_sociales))
+            cotisation_by_bareme_name[bareme_name][index] = cotisation
+    for cotisation in cotisation_by_bareme_name.itervalues():
+        cotisation *= -1
+    fused_cotisations_by_key[fused_cotisations_key] = (
+        tax_benefit_system,
+        bareme_by_type_sal_name,
+        assiette_cotisations_sociales,
+        plafond_securite_sociale,
+        index_by_type_sal_name,
+        cotisation_by_bareme_name,
+        )
+    return cotisation_by_bareme_name
+
+
+def calculate_stacked_baremes(bareme_by_name, base, factor, round_base_decimals = 2):
+    """Evaluate many marginal rate scales on the same base, like MarginalRateTaxScale.calc does for each of them.
+
+    Scales with the same number of brackets are stacked into a matrix of thresholds and a matrix of rates, so that
+    they are evaluated together, FUSED_CHUNK_SIZE individuals at a time. The results are bit-identical to calc,
+    because brackets are summed in the same order.
+    """
+    baremes_names_by_brackets_count = collections.defaultdict(list)
+    for bareme_name, bareme in bareme_by_name.iteritems():
+        if bareme.thresholds:
+            baremes_names_by_brackets_count[len(bareme.thresholds)].append(bareme_name)
+    if not isinstance(factor, ndarray):
+        factor = ones(len(base)) * factor
+    cotisation_by_bareme_name = {}
+    for baremes_names in baremes_names_by_brackets_count.itervalues():
+        thresholds = array([bareme_by_name[bareme_name].thresholds + [inf] for bareme_name in baremes_names])
+        rates = array([bareme_by_name[bareme_name].rates for bareme_name in baremes_names])
+        cotisations = zeros((len(base), len(baremes_names)))
+        for start in xrange(0, len(base), FUSED_CHUNK_SIZE):
+            chunk = slice(start, start + FUSED_CHUNK_SIZE)
+            # Dimensions are (individual, scale, bracket).
+            thresholds_chunk = round(factor[chunk, newaxis, newaxis] * thresholds[newaxis], round_base_decimals)
+            amounts = max_(
+                min_(base[chunk, newaxis, newaxis], thresholds_chunk[:, :, 1:]) - thresholds_chunk[:, :, :-1],
+                0,
+                )
+            cotisations[chunk] = round(
+                rates[newaxis] * round(amounts, round_base_decimals),
+                round_base_decimals,
+                ).sum(axis = 2)
+        for position, bareme_name in enumerate(baremes_names):
+            cotisation_by_bareme_name[bareme_name] = cotisations[:, position]
+    return cotisation_by_bareme_name
+
+
 def compute_cotisation_annuelle(simulation, period, cotisation_type = None, bareme_name = None):
     if period.start.month < 12:
         return 0
@@ -136,3 +259,22 @@ def compute_cotisation_anticipee(simulation, period, cotisation_type = None, bar
             cotisation_type = cotisation_type,
             bareme_name = bareme_name,
             ) - cumul
+
+
+def get_index_by_type_sal_name(simulation, period):
+    """Return the partition of individuals by type_sal, computed only once per simulation and period."""
+    type_sal = simulation.calculate('type_sal', period)
+    type_sal_partition_by_period = simulation.__dict__.setdefault('type_sal_partition_by_period', {})
+    type_sal_partition = type_sal_partition_by_period.get(period)
+    # The partition is reused only while type_sal array is unchanged.
+    if type_sal_partition is None or type_sal_partition[0] is not type_sal:
+        type_sal_partition = type_sal_partition_by_period[period] = (type_sal, partition_by_type_sal(type_sal))
+    return type_sal_partition[1]
+
+
+def partition_by_type_sal(type_sal):
+    """Return the positions of the individuals of each type_sal, by type_sal name."""
+    return collections.OrderedDict(
+        (type_sal_name, (type_sal == type_sal_index).nonzero()[0])
+        for type_sal_name, type_sal_index in CAT
+        )
@@ -25,21 +25,18 @@
 
 from __future__ import division
 
-import csv
 import logging
-import pkg_resources
 
-from numpy import fromiter, logical_or as or_, round as round_
+from numpy import logical_or as or_, round as round_
 
 
-import openfisca_france
 from ...base import *  # noqa analysis:ignore
+from ...commune_tables import load_taux_versement_transport_table
 
 
 log = logging.getLogger(__name__)
 
-taux_aot_by_depcom = None
-taux_smt_by_depcom = None
+taux_versement_transport_table = None
 
 
 # TODO:
@@ -313,20 +310,12 @@ class taux_versement_transport(SimpleFormulaColumn):
 
         preload_taux_versement_transport()
         public = (type_sal >= 2)
-        default_value = 0.0
-        taux_aot = fromiter(
-            (
-                taux_aot_by_depcom.get(depcom_cell, default_value)
-                for depcom_cell in depcom_entreprise
-                ),
-            dtype = 'float',
-            )
-        taux_smt = fromiter(
-            (
-                taux_smt_by_depcom.get(depcom_cell, default_value)
-                for depcom_cell in depcom_entreprise
-                ),
-            dtype = 'float',
+        taux_aot, taux_smt = taux_versement_transport_table.get(
+            depcom_entreprise,
+            [
+                'taux',  # autorité organisatrice des transports
+                'taux additionnel',  # syndicat mixte de transport
+                ],
             )
         # "L'entreprise emploie-t-elle plus de 9 salariés  dans le périmètre de l'Autorité organisatrice de transport
         # (AOT) suivante ou syndicat mixte de transport (SMT)"
@@ -348,25 +337,6 @@ class versement_transport(SimpleFormulaColumn):
 
 
 def preload_taux_versement_transport():
-    global taux_aot_by_depcom
-    global taux_smt_by_depcom
-    if taux_aot_by_depcom is None:
-        with pkg_resources.resource_stream(
-                openfisca_france.__name__,
-                'assets/versement_transport/taux.csv',
-                ) as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            taux_aot_by_depcom = {
-                row['code INSEE']: float(row['taux'] or 0)  # autorité organisatrice des transports
-                for row in csv_reader
-                }
-    if taux_smt_by_depcom is None:
-        with pkg_resources.resource_stream(
-                openfisca_france.__name__,
-                'assets/versement_transport/taux.csv',
-                ) as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            taux_smt_by_depcom = {
-                row['code INSEE']: float(row['taux additionnel'] or 0)  # syndicat mixte de transport
-                for row in csv_reader
-                }
+    global taux_versement_transport_table
+    if taux_versement_transport_table is None:
+        taux_versement_transport_table = load_taux_versement_transport_table()
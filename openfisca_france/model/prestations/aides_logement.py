@@ -25,22 +25,18 @@
 
 from __future__ import division
 
-import csv
-import json
 import logging
-import pkg_resources
 
-from numpy import (ceil, fromiter, int16, logical_not as not_, logical_or as or_, logical_and as and_, maximum as max_,
+from numpy import (ceil, logical_not as not_, logical_or as or_, logical_and as and_, maximum as max_,
     minimum as min_, round)
 
-import openfisca_france
-
 from ..base import *  # noqa  analysis:ignore
+from ..commune_tables import load_zone_apl_table
 from .prestations_familiales.base_ressource import nb_enf
 
 log = logging.getLogger(__name__)
 
-zone_apl_by_depcom = None
+zone_apl_table = None
 
 
 @reference_formula
@@ -581,36 +577,14 @@ class zone_apl(SimpleFormulaColumn):
 
         preload_zone_apl()
         default_value = 2
-        return period, fromiter(
-            (
-                zone_apl_by_depcom.get(depcom_cell, default_value)
-                for depcom_cell in depcom
-                ),
-            dtype = int16,
-            )
+        zone_apl, = zone_apl_table.get(depcom, ['Zonage'], default_by_column_name = dict(Zonage = default_value))
+        return period, zone_apl
 
 
 def preload_zone_apl():
-    global zone_apl_by_depcom
-    if zone_apl_by_depcom is None:
-        with pkg_resources.resource_stream(
-                openfisca_france.__name__,
-                'assets/apl/20110914_zonage.csv',
-                ) as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            zone_apl_by_depcom = {
-                # Keep only first char of Zonage column because of 1bis value considered equivalent to 1.
-                row['CODGEO']: int(row['Zonage'][0])
-                for row in csv_reader
-                }
-        # Add subcommunes (arrondissements and communes associées), use the same value as their parent commune.
-        with pkg_resources.resource_stream(
-                openfisca_france.__name__,
-                'assets/apl/commune_depcom_by_subcommune_depcom.json',
-                ) as json_file:
-            commune_depcom_by_subcommune_depcom = json.load(json_file)
-            for subcommune_depcom, commune_depcom in commune_depcom_by_subcommune_depcom.iteritems():
-                zone_apl_by_depcom[subcommune_depcom] = zone_apl_by_depcom[commune_depcom]
+    global zone_apl_table
+    if zone_apl_table is None:
+        zone_apl_table = load_zone_apl_table()
 
 
 @reference_formula
@@ -25,8 +25,7 @@
 
 from __future__ import division
 
-from functools import partial
-from numpy import (apply_along_axis, array, int32, logical_not as not_, maximum as max_, minimum as min_, zeros,
+from numpy import (array, int32, logical_not as not_, maximum as max_, minimum as min_, zeros,
     logical_or as or_)
 
 from ...base import *  # noqa analysis:ignore
@@ -147,17 +146,17 @@ class cmu_c_plafond(SimpleFormulaColumn):
         age_by_role = self.split_by_roles(age_holder, roles = PAC)
         alt_by_role = self.split_by_roles(alt_holder, roles = PAC)
 
-        age_and_alt_matrix = array(
-            [
-                (role == PART) * 10000 + age_by_role[role] * 10 + alt_by_role[role] - (age_by_role[role] < 0) * 999999
-                for role in sorted(age_by_role)
-                ]
-            ).transpose()
-
-        # Calcul avec matrices intermédiaires
-        reverse_sorted = partial(sorted, reverse = True)
-
-        sorted_age_and_alt_matrix = apply_along_axis(reverse_sorted, 1, age_and_alt_matrix)
+        sorted_age_and_alt_matrix = sort_by_roles(
+            dict(
+                (
+                    role,
+                    (role == PART) * 10000 + age_by_role[role] * 10 + alt_by_role[role] -
+                    (age_by_role[role] < 0) * 999999,
+                    )
+                for role in age_by_role
+                ),
+            reverse = True,
+            )
         # Calcule weighted_alt_matrix, qui vaut 0.5 pour les enfants en garde alternée, 1 sinon.
         sorted_present_matrix = sorted_age_and_alt_matrix >= 0
         sorted_alt_matrix = (sorted_age_and_alt_matrix % 10) * sorted_present_matrix
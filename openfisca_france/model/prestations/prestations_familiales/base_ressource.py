@@ -25,7 +25,7 @@
 
 from __future__ import division
 
-from numpy import int32, logical_not as not_, logical_or as or_, zeros
+from numpy import column_stack, int32, logical_not as not_, logical_or as or_, where, zeros
 
 
 from ...base import *  # noqa analysis:ignore
@@ -245,20 +245,17 @@ def age_aine(ages, smic55, ag1, ag2):
     Renvoie un vecteur avec l'âge de l'ainé (au sens des allocations
     familiales) de chaque famille
     '''
-    ageaine = -9999
-    for key, age in ages.iteritems():
-        ispacaf = (ag1 <= age) & (age <= ag2) & not_(smic55[key])
-        isaine = ispacaf & (age > ageaine)
-        ageaine = isaine * age + not_(isaine) * ageaine
-    return ageaine
+    return column_stack([
+        where((ag1 <= age) & (age <= ag2) & not_(smic55[key]), age, -9999)
+        for key, age in ages.iteritems()
+        ]).max(axis = 1)
 
 
 def age_en_mois_benjamin(agems):
     '''
     Renvoie un vecteur (une entree pour chaque famille) avec l'age du benjamin.  # TODO check agem > 0
     '''
-    agem_benjamin = 12 * 9999
-    for agem in agems.itervalues():
-        isbenjamin = (agem < agem_benjamin) & (agem != -9999)
-        agem_benjamin = isbenjamin * agem + not_(isbenjamin) * agem_benjamin
-    return agem_benjamin
+    return column_stack([
+        where(agem != -9999, agem, 12 * 9999)
+        for agem in agems.itervalues()
+        ]).min(axis = 1)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Low-overhead profiling of the formulas computed by simulations."""
+
+
+import collections
+import timeit
+
+from openfisca_core import periods, simulations
+
+
+FormulaStatistics = collections.namedtuple('FormulaStatistics', [
+    'variable_name',
+    'period',
+    'calls_count',
+    'computations_count',
+    'self_time',
+    'total_time',
+    'array_size',
+    'allocated_bytes',
+    ])
+
+
+class Profiler(object):
+    """Record, by variable and period, the calls and self time of the computations of profiled simulations.
+
+    Use profile(simulation, profiler) to profile a simulation (and the simulations cloned from it).
+    """
+    clock = staticmethod(timeit.default_timer)
+    statistics_by_key = None
+    self_time_by_stack = None
+    stack = None
+
+    def __init__(self):
+        self.stack = []
+        # Values: [calls_count, computations_count, self_time, total_time, array_size, allocated_bytes]
+        self.statistics_by_key = {}
+        self.self_time_by_stack = collections.defaultdict(float)
+
+    def call(self, simulation, method, column_name, period, kwargs):
+        if period is None:
+            period = simulation.period
+        elif not isinstance(period, periods.Period):
+            period = periods.period(period)
+        holder = simulation.entity_by_column_name[column_name].get_or_new_holder(column_name)
+        key = (column_name, period)
+        stack = self.stack
+        # Frame: [key, children_time]
+        frame = [key, 0.0]
+        stack.append(frame)
+        nbytes_before = get_stored_nbytes(holder)
+        start_time = self.clock()
+        try:
+            dated_holder = method(simulation, column_name, period = period, **kwargs)
+        finally:
+            total_time = self.clock() - start_time
+            stack.pop()
+            self_time = total_time - frame[1]
+            if stack:
+                stack[-1][1] += total_time
+            allocated_bytes = get_stored_nbytes(holder) - nbytes_before
+            statistics = self.statistics_by_key.get(key)
+            if statistics is None:
+                statistics = self.statistics_by_key[key] = [0, 0, 0.0, 0.0, 0, 0]
+            statistics[0] += 1
+            if allocated_bytes > 0:
+                statistics[1] += 1
+                statistics[5] += allocated_bytes
+            statistics[2] += self_time
+            # Count the total time of recursive computations only once.
+            if not any(parent_frame[0] == key for parent_frame in stack):
+                statistics[3] += total_time
+            self.self_time_by_stack[tuple(parent_frame[0][0] for parent_frame in stack) + (column_name,)] += \
+                self_time
+        array = dated_holder.array
+        if array is not None:
+            statistics[4] = max(statistics[4], array.size)
+        return dated_holder
+
+    def format_table(self, limit = None):
+        """Return a text table of the statistics, sorted by decreasing self time."""
+        lines = [u'{:>10} {:>10} {:>7} {:>7} {:>10} {:>12}  {}'.format(u'self (s)', u'total (s)', u'calls',
+            u'comput.', u'size', u'bytes', u'variable@period')]
+        for statistics in self.iter_statistics()[:limit]:
+            lines.append(u'{:10.4f} {:10.4f} {:7d} {:7d} {:10d} {:12d}  {}@{}'.format(statistics.self_time,
+                statistics.total_time, statistics.calls_count, statistics.computations_count, statistics.array_size,
+                statistics.allocated_bytes, statistics.variable_name, statistics.period))
+        return u'\n'.join(lines)
+
+    def iter_statistics(self):
+        """Return the statistics of each variable and period, sorted by decreasing self time."""
+        return sorted(
+            (
+                FormulaStatistics(column_name, period, *statistics)
+                for (column_name, period), statistics in self.statistics_by_key.iteritems()
+                ),
+            key = lambda statistics: statistics.self_time,
+            reverse = True,
+            )
+
+    def write_collapsed_stacks(self, file_path):
+        """Write the self times (in microseconds) by dependency path, in the "collapsed stacks" format of
+        flamegraph.pl and similar tools."""
+        with open(file_path, 'w') as collapsed_file:
+            for stack, self_time in sorted(self.self_time_by_stack.iteritems()):
+                collapsed_file.write('{} {}\n'.format(';'.join(stack), int(round(self_time * 1e6))))
+
+
+class ProfiledSimulation(simulations.Simulation):
+    """A simulation recording its computations in its profiler. Its clones are profiled too."""
+    profiler = None
+
+    def compute(self, column_name, period = None, **kwargs):
+        return self.profiler.call(self, simulations.Simulation.compute, column_name, period, kwargs)
+
+    def compute_add(self, column_name, period = None, **kwargs):
+        return self.profiler.call(self, simulations.Simulation.compute_add, column_name, period, kwargs)
+
+    def compute_add_divide(self, column_name, period = None, **kwargs):
+        return self.profiler.call(self, simulations.Simulation.compute_add_divide, column_name, period, kwargs)
+
+    def compute_divide(self, column_name, period = None, **kwargs):
+        return self.profiler.call(self, simulations.Simulation.compute_divide, column_name, period, kwargs)
+
+
+def get_stored_nbytes(holder):
+    nbytes = 0
+    array = holder._array
+    if array is not None:
+        nbytes += array.nbytes
+    array_by_period = holder._array_by_period
+    if array_by_period is not None:
+        for array in array_by_period.itervalues():
+            nbytes += array.nbytes
+    return nbytes
+
+
+def profile(simulation, profiler = None):
+    """Profile the computations of a simulation, and return its profiler."""
+    assert isinstance(simulation, simulations.Simulation)
+    if profiler is None:
+        profiler = Profiler()
+    simulation.__class__ = ProfiledSimulation
+    simulation.profiler = profiler
+    return profiler
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Effective average and marginal rates of a target variable, for each of its entities."""
+
+
+from __future__ import division
+
+import numpy as np
+
+from . import simulations
+
+
+def average_rates(simulation, target_variable_name, varying_variable_name, period = None):
+    """Return 1 - target / varying for each entity of the target, like openfisca_core.rates.average_rate.
+
+    When the target belongs to an entity of persons, the varying variable of persons is summed by entity.
+    """
+    if period is None:
+        period = simulation.period
+    target = simulation.calculate_add(target_variable_name, period)
+    varying = sum_by_entity(simulation, simulation.calculate_add(varying_variable_name, period),
+        varying_variable_name, target_variable_name, period)
+    return 1 - target / (varying * (varying != 0) + (varying == 0))
+
+
+def marginal_rates(simulation, target_variable_name, varying_variable_name, delta = 100, mask = None,
+        period = None):
+    """Return 1 - d(target) / d(varying) for each entity of the target, like openfisca_core.rates.marginal_rate.
+
+    The input variable varying_variable_name is increased by delta (for the members selected by mask only, when given)
+    in a fork of simulation, where only the variables computed from it are recomputed. Its arrays of other periods are
+    left unchanged.
+    """
+    if period is None:
+        period = simulation.period
+    target = simulation.calculate_add(target_variable_name, period)
+    varying = simulation.calculate_add(varying_variable_name, period)
+    increase = np.ones(len(varying)) * delta
+    if mask is not None:
+        increase *= mask
+
+    tax_benefit_system = simulation.tax_benefit_system
+    increased_simulation = simulations.fork_without(simulation,
+        simulations.get_dependents(tax_benefit_system, [varying_variable_name]))
+    holder = increased_simulation.get_or_new_holder(varying_variable_name)
+    if holder._array is not None:
+        del holder._array
+    if holder._array_by_period is not None:
+        # Keep the arrays of the periods not covered by period, like the ones of previous years read by some formulas.
+        holder._array_by_period = dict(
+            (array_period, array)
+            for array_period, array in holder._array_by_period.iteritems()
+            if array_period.start < period.start or array_period.stop > period.stop
+            )
+    holder.set_input(period, (varying + increase).astype(varying.dtype))
+    simulations.mark_input(increased_simulation, varying_variable_name)
+    increased_target = increased_simulation.calculate_add(target_variable_name, period)
+
+    varying_increase = sum_by_entity(simulation, increase, varying_variable_name, target_variable_name, period)
+    return 1 - (increased_target - target) / (varying_increase * (varying_increase != 0) + (varying_increase == 0))
+
+
+def sum_by_entity(simulation, array, variable_name, target_variable_name, period):
+    """Return the array of variable_name converted to the entity of target_variable_name."""
+    entity = simulation.entity_by_column_name[variable_name]
+    target_entity = simulation.entity_by_column_name[target_variable_name]
+    if entity is target_entity:
+        return array
+    if not entity.is_persons_entity:
+        raise ValueError(u'Variable {} must belong to persons or to the entity of {}'.format(variable_name,
+            target_variable_name).encode('utf-8'))
+    return np.bincount(
+        simulation.calculate(target_entity.index_for_person_variable_name, period),
+        weights = array,
+        minlength = target_entity.count,
+        )
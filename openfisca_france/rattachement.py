@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Choose which young adults to attach to the foyer fiscal of their parents ("rattachement").
+
+Every configuration of attachments is a copy of the test case, where detached young adults declare their own foyer
+fiscal. All the configurations are stacked in a single simulation, so that they are computed in one pass.
+"""
+
+
+import itertools
+
+import numpy as np
+
+from .scenarios import find_age, find_foyer_fiscal_and_role
+
+
+def get_rattachements_possibles(scenario):
+    """Return the IDs of the personnes à charge who may be detached from their foyer fiscal, or stay attached to it.
+
+    They are at least 18 years old and younger than 21 (25 for students).
+    """
+    period_start_date = scenario.period.start.date
+    rattachements_possibles = []
+    for foyer_fiscal in scenario.test_case['foyers_fiscaux']:
+        for individu_id in foyer_fiscal['personnes_a_charge']:
+            individu = find_individu(scenario.test_case, individu_id)
+            age = find_age(individu, period_start_date)
+            if age is not None and 18 <= age < (25 if individu.get('activite') == 2 else 21):
+                rattachements_possibles.append(individu_id)
+    return rattachements_possibles
+
+
+def evaluate_configurations(scenario, rattachements_possibles, configurations, variable_name = 'irpp'):
+    """Return the sum of variable_name over the entities of each configuration.
+
+    configurations is a boolean matrix, with a row per configuration and a column per element of
+    rattachements_possibles, which is True when the person stays attached to the foyer fiscal.
+    """
+    configurations_scenario = new_configurations_scenario(scenario, rattachements_possibles, configurations)
+    simulation = configurations_scenario.new_simulation()
+    entity = simulation.entity_by_column_name[variable_name]
+    configuration_index = np.array(
+        [
+            int(member['id'].split(u'/', 1)[0])
+            for member in configurations_scenario.test_case[entity.key_plural]
+            ],
+        dtype = np.int32,
+        )
+    return np.bincount(configuration_index, weights = simulation.calculate(variable_name),
+        minlength = len(configurations))
+
+
+def find_individu(test_case, individu_id):
+    for individu in test_case['individus']:
+        if individu['id'] == individu_id:
+            return individu
+    return None
+
+
+def iter_configurations(rattachements_count):
+    """Return an iterator over the rows of the matrix of all the configurations of attachments."""
+    return itertools.product((True, False), repeat = rattachements_count)
+
+
+def new_configurations_scenario(scenario, rattachements_possibles, configurations):
+    """Return a scenario stacking a copy of the test case of scenario for each configuration."""
+    tax_benefit_system = scenario.tax_benefit_system
+    test_case = scenario.test_case
+    foyer_fiscal_id_by_individu_id = dict(
+        (individu_id, find_foyer_fiscal_and_role(test_case, individu_id)[0]['id'])
+        for individu_id in rattachements_possibles
+        )
+    configurations_test_case = dict(
+        (key_plural, [])
+        for key_plural in tax_benefit_system.entity_class_by_key_plural
+        )
+    for configuration_index, configuration in enumerate(configurations):
+        detached_ids = set(
+            individu_id
+            for individu_id, attached in itertools.izip(rattachements_possibles, configuration)
+            if not attached
+            )
+        members_by_key_plural = dict(
+            (key_plural, [member.copy() for member in members])
+            for key_plural, members in test_case.iteritems()
+            )
+        for foyer_fiscal in members_by_key_plural['foyers_fiscaux']:
+            foyer_fiscal['personnes_a_charge'] = [
+                individu_id
+                for individu_id in foyer_fiscal['personnes_a_charge']
+                if individu_id not in detached_ids
+                ]
+        for individu_id in rattachements_possibles:
+            if individu_id in detached_ids:
+                members_by_key_plural['foyers_fiscaux'].append(dict(
+                    declarants = [individu_id],
+                    id = u'{}-{}'.format(foyer_fiscal_id_by_individu_id[individu_id], individu_id),
+                    personnes_a_charge = [],
+                    ))
+        # Prefix the IDs of members (and persons) with the index of the configuration, to keep them unique.
+        prefix = u'{}/'.format(configuration_index)
+        for key_plural, members in members_by_key_plural.iteritems():
+            roles_key = tax_benefit_system.entity_class_by_key_plural[key_plural].roles_key or []
+            for member in members:
+                member['id'] = prefix + unicode(member['id'])
+                for role_key in roles_key:
+                    role_value = member.get(role_key)
+                    if isinstance(role_value, list):
+                        member[role_key] = [prefix + unicode(individu_id) for individu_id in role_value]
+                    elif role_value is not None:
+                        member[role_key] = prefix + unicode(role_value)
+                configurations_test_case[key_plural].append(member)
+
+    configurations_scenario = scenario.__class__()
+    configurations_scenario.period = scenario.period
+    configurations_scenario.tax_benefit_system = tax_benefit_system
+    configurations_scenario.test_case = configurations_test_case
+    configurations_scenario.suggest()
+    return configurations_scenario
+
+
+def optimize(scenario, variable_name = 'irpp', max_exhaustive_count = 10, max_iterations = 20):
+    """Return the configuration of attachments that maximizes variable_name, and its value.
+
+    The configuration is a dict giving, for each person who may be attached, whether this person stays attached to the
+    foyer fiscal. The default variable, irpp, is negative, so maximizing it minimizes the income tax. revdisp may be
+    used too, to take benefits into account.
+
+    When there are more than max_exhaustive_count persons who may be attached, the search is local: starting from
+    the current configuration, every configuration that changes a single attachment is evaluated (in a single
+    simulation) and the best one is kept, until no change improves it or after max_iterations steps.
+    """
+    rattachements_possibles = get_rattachements_possibles(scenario)
+    rattachements_count = len(rattachements_possibles)
+    if rattachements_count <= max_exhaustive_count:
+        configurations = np.array(list(iter_configurations(rattachements_count)), dtype = bool)
+        values = evaluate_configurations(scenario, rattachements_possibles, configurations,
+            variable_name = variable_name)
+        best_index = values.argmax()
+        best_configuration = configurations[best_index]
+        best_value = values[best_index]
+    else:
+        best_configuration = np.ones(rattachements_count, dtype = bool)
+        best_value = None
+        for iteration in range(max_iterations):
+            # First row is the current configuration, then a row per changed attachment.
+            configurations = np.vstack((best_configuration, best_configuration ^ np.eye(rattachements_count,
+                dtype = bool)))
+            values = evaluate_configurations(scenario, rattachements_possibles, configurations,
+                variable_name = variable_name)
+            best_index = values.argmax()
+            best_value = values[best_index]
+            if best_index == 0:
+                break
+            best_configuration = configurations[best_index]
+    return dict(itertools.izip(rattachements_possibles, best_configuration.tolist())), best_value
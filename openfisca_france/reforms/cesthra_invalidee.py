@@ -25,14 +25,12 @@
 
 from __future__ import division
 
-import copy
-
 import logging
 
 from numpy import maximum as max_
 
 from openfisca_core import columns, formulas, reforms
-from openfisca_france import entities
+from openfisca_france import entities, legislation_overlays
 from openfisca_france.model.prelevements_obligatoires.impot_revenu import ir
 
 
@@ -111,8 +109,8 @@ reform_legislation_subtree = {
 
 def build_reform(tax_benefit_system):
     reference_legislation_json = tax_benefit_system.legislation_json
-    reform_legislation_json = copy.deepcopy(reference_legislation_json)
-    reform_legislation_json['children'].update(reform_legislation_subtree)
+    reform_legislation_json = legislation_overlays.add_children(reference_legislation_json,
+        reform_legislation_subtree)
     Reform = reforms.make_reform(
         legislation_json = reform_legislation_json,
         name = u"Contribution execptionnelle sur les très hauts revenus d'activité (invalidée par le CC)",
@@ -25,14 +25,15 @@
 
 from __future__ import division
 
+import collections
 import logging
 
-# from numpy import logical_not as not_
+import numpy as np
 from openfisca_core import columns, formulas, reforms
 # from openfisca_core.taxscales import MarginalRateTaxScale
-from scipy.optimize import fsolve
 
 from .. import entities
+from ..simulations import fork
 
 # from ..base import *  # noqa
 # from .cotisations_sociales.remplacement import exo_csg_chom
@@ -40,15 +41,91 @@ from .. import entities
 
 log = logging.getLogger(__name__)
 
+InversionReport = collections.namedtuple('InversionReport', [
+    'converged_count',
+    'count',
+    'iterations',
+    'max_residual',
+    ])
 
-# Reform formulas
 
-def brut_to_target(target_name = None, period = None, simulation = None, **input_array_by_name):
-    simulation = simulation.clone(debug = simulation.debug, debug_all = simulation.debug_all, trace = simulation.trace)
+# Inversion engine
+
+def brut_to_target_function(simulation = None, target_name = None, period = None, varying_name = None,
+        **input_array_by_name):
+    """Return a function computing target variable from an array of the varying input variable.
+
+    Each evaluation uses a fork of the simulation, sharing with it every array that doesn't depend on the varying
+    variable.
+    """
+    simulation = fork(simulation, period = period, **input_array_by_name)
+    # The target may be an input of the original simulation.
     simulation.get_or_new_holder(target_name).delete_arrays()
-    for variable_name, array in input_array_by_name.iteritems():
-        simulation.get_or_new_holder(variable_name).set_array(period, array)
-    return simulation.calculate(target_name)
+
+    def brut_to_target(varying_array):
+        return fork(simulation, period = period, **{varying_name: varying_array}).calculate(target_name, period)
+
+    return brut_to_target
+
+
+def invert(function, target, max_iterations = 50, tolerance = 0.001):
+    """Solve function(x) = target, independently for each row, using a safeguarded secant method.
+
+    function must be increasing and must compute each row independently of the others, like most gross to net
+    functions. On flat regions (like salaries below a contribution threshold), the secant step falls back to growing
+    steps until the solution is bracketed, then to bisection. Each iteration costs a single (vectorized) call to
+    function, so the cost is linear in rows.
+
+    Return the solution and an InversionReport.
+    """
+    target = np.asarray(target, dtype = float)
+    # Bounds of the solution, known from the sign of residuals
+    lower = np.empty_like(target)
+    lower.fill(-np.inf)
+    upper = np.empty_like(target)
+    upper.fill(np.inf)
+
+    x0 = target.copy()
+    residual0 = function(x0) - target
+    x1 = x0 - residual0  # Assume a slope of 1 for the first step.
+    iterations = 1
+    while True:
+        residual1 = function(x1) - target
+        iterations += 1
+        converged = np.abs(residual1) <= tolerance
+        if converged.all() or iterations >= max_iterations:
+            break
+        np.putmask(lower, residual1 < 0, np.maximum(lower, x1))
+        np.putmask(upper, residual1 > 0, np.minimum(upper, x1))
+        delta_x = x1 - x0
+        delta_residual = residual1 - residual0
+        flat = (delta_x == 0) | (delta_residual == 0)
+        x2 = x1 - residual1 * np.where(flat, 1, delta_x) / np.where(flat, 1, delta_residual)
+        bracketed = np.isfinite(lower) & np.isfinite(upper)
+        unsafe = flat | (x2 <= lower) | (x2 >= upper)
+        # Before the solution is bracketed, leave flat regions with growing steps.
+        x2 = np.where(unsafe & ~bracketed,
+            x1 - np.sign(residual1) * np.maximum(np.abs(residual1), 2 * np.abs(delta_x)), x2)
+        # Once it is bracketed, bisect when the secant step is undefined, leaves the bracket or when the residual was
+        # not at least halved by the last step.
+        bisected = bracketed & (unsafe | (np.abs(residual1) > np.abs(residual0) / 2))
+        x2 = np.where(bisected, (np.where(bracketed, lower, 0) + np.where(bracketed, upper, 0)) / 2, x2)
+        x2 = np.where(converged, x1, x2)
+        x0, residual0, x1 = x1, residual1, x2
+
+    report = InversionReport(
+        converged_count = int(converged.sum()),
+        count = len(target),
+        iterations = iterations,
+        max_residual = float(np.abs(residual1).max()) if len(target) else 0.0,
+        )
+    if report.converged_count < report.count:
+        log.warning(u'Inversion did not converge for {} rows out of {} after {} iterations (max residual: {})'.format(
+            report.count - report.converged_count, report.count, report.iterations, report.max_residual))
+    else:
+        log.debug(u'Inversion converged after {} iterations (max residual: {})'.format(report.iterations,
+            report.max_residual))
+    return x1, report
 
 
 # Salaires
@@ -74,35 +151,31 @@ class salbrut(formulas.SimpleFormulaColumn):
             if salaire_net is not None:
                 # Calcule le salaire brut à partir du salaire net par inversion numérique.
                 if (salaire_net == 0).all():
-                    # Quick path to avoid fsolve when using default value of input variables.
+                    # Quick path to avoid inversion when using default value of input variables.
                     return period, salaire_net
-                simulation = self.holder.entity.simulation
-
-                def solve_function(salbrut):
-                    return brut_to_target(
-                        target_name = 'salaire_net',
-                        period = period,
-                        salbrut = salbrut,
-                        simulation = simulation,
-                        ) - salaire_net
-                return period, fsolve(solve_function, salaire_net)
+                brut_to_target = brut_to_target_function(
+                    simulation = self.holder.entity.simulation,
+                    target_name = 'salaire_net',
+                    period = period,
+                    varying_name = 'salbrut',
+                    )
+                salbrut, report = invert(brut_to_target, salaire_net)
+                return period, salbrut
 
             sali = simulation.calculate_add_divide('sali', period)
 
         # Calcule le salaire brut à partir du salaire imposable par inversion numérique.
         if (sali == 0).all():
-            # Quick path to avoid fsolve when using default value of input variables.
+            # Quick path to avoid inversion when using default value of input variables.
             return period, sali
-        simulation = self.holder.entity.simulation
-
-        def solve_function(salbrut):
-            return brut_to_target(
-                target_name = 'sal',
-                period = period,
-                salbrut = salbrut,
-                simulation = simulation,
-                ) - sali
-        return period, fsolve(solve_function, sali)
+        brut_to_target = brut_to_target_function(
+            simulation = self.holder.entity.simulation,
+            target_name = 'sal',
+            period = period,
+            varying_name = 'salbrut',
+            )
+        salbrut, report = invert(brut_to_target, sali)
+        return period, salbrut
 
 
 #        # Calcule le salaire brut à partir du salaire imposable.
@@ -197,18 +270,16 @@ class chobrut(formulas.SimpleFormulaColumn):
             if chonet is not None:
                 # Calcule les allocations chomage brutes à partir des allocations nettes par inversion numérique.
                 if (chonet == 0).all():
-                    # Quick path to avoid fsolve when using default value of input variables.
+                    # Quick path to avoid inversion when using default value of input variables.
                     return period, chonet
-                simulation = self.holder.entity.simulation
-
-                def solve_function(chobrut):
-                    return brut_to_target(
-                        chobrut = chobrut,
-                        target_name = 'chonet',
-                        period = period,
-                        simulation = simulation,
-                        ) - chonet
-                return period, fsolve(solve_function, chonet)
+                brut_to_target = brut_to_target_function(
+                    simulation = self.holder.entity.simulation,
+                    target_name = 'chonet',
+                    period = period,
+                    varying_name = 'chobrut',
+                    )
+                chobrut, report = invert(brut_to_target, chonet)
+                return period, chobrut
 
             choi = simulation.calculate_add_divide('choi', period)
 
@@ -217,19 +288,17 @@ class chobrut(formulas.SimpleFormulaColumn):
         csg_rempl = simulation.calculate('csg_rempl', period)
 
         if (choi == 0).all():
-            # Quick path to avoid fsolve when using default value of input variables.
+            # Quick path to avoid inversion when using default value of input variables.
             return period, choi
-        simulation = self.holder.entity.simulation
-
-        def solve_function(chobrut):
-            return brut_to_target(
-                chobrut = chobrut,
-                csg_rempl = csg_rempl,
-                target_name = 'cho',
-                period = period,
-                simulation = simulation,
-                ) - choi
-        return period, fsolve(solve_function, choi)
+        brut_to_target = brut_to_target_function(
+            csg_rempl = csg_rempl,
+            simulation = self.holder.entity.simulation,
+            target_name = 'cho',
+            period = period,
+            varying_name = 'chobrut',
+            )
+        chobrut, report = invert(brut_to_target, choi)
+        return period, chobrut
 
 
 # Pensions
@@ -252,18 +321,16 @@ class rstbrut(formulas.SimpleFormulaColumn):
             if rstnet is not None:
                 # Calcule les pensions de retraite brutes à partir des pensions nettes par inversion numérique.
                 if (rstnet == 0).all():
-                    # Quick path to avoid fsolve when using default value of input variables.
+                    # Quick path to avoid inversion when using default value of input variables.
                     return period, rstnet
-                simulation = self.holder.entity.simulation
-
-                def solve_function(rstbrut):
-                    return brut_to_target(
-                        target_name = 'rstnet',
-                        period = period,
-                        rstbrut = rstbrut,
-                        simulation = simulation,
-                        ) - rstnet
-                return period, fsolve(solve_function, rstnet)
+                brut_to_target = brut_to_target_function(
+                    simulation = self.holder.entity.simulation,
+                    target_name = 'rstnet',
+                    period = period,
+                    varying_name = 'rstbrut',
+                    )
+                rstbrut, report = invert(brut_to_target, rstnet)
+                return period, rstbrut
 
             rsti = simulation.calculate_add_divide('rsti', period)
 
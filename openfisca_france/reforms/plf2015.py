@@ -27,11 +27,10 @@
 
 from __future__ import division
 
-import copy
-
 import logging
 
 from openfisca_core import formulas, periods, reforms
+from .. import legislation_overlays
 from ..model.prelevements_obligatoires.impot_revenu import ir
 
 
@@ -85,23 +84,22 @@ reform_legislation_subtree = {
 
 def build_reform(tax_benefit_system):
     reference_legislation_json = tax_benefit_system.legislation_json
-    reform_legislation_json = copy.deepcopy(reference_legislation_json)
     reform_year = 2014
     reform_period = periods.period('year', reform_year)
 
-    reform_legislation_json = reforms.update_legislation(
-        legislation_json = reform_legislation_json,
+    reform_legislation_json = legislation_overlays.update_legislation(
+        legislation_json = reference_legislation_json,
         path = ('children', 'ir', 'children', 'bareme', 'brackets', 1, 'rate'),
         period = reform_period,
         value = 0,
         )
-    reform_legislation_json = reforms.update_legislation(
+    reform_legislation_json = legislation_overlays.update_legislation(
         legislation_json = reform_legislation_json,
         path = ('children', 'ir', 'children', 'bareme', 'brackets', 2, 'threshold'),
         period = reform_period,
         value = 9690,
         )
-    reform_legislation_json['children'].update(reform_legislation_subtree)
+    reform_legislation_json = legislation_overlays.add_children(reform_legislation_json, reform_legislation_subtree)
 
     Reform = reforms.make_reform(
         legislation_json = reform_legislation_json,
@@ -25,7 +25,6 @@
 
 from __future__ import division
 
-import copy
 from datetime import date
 
 import logging
@@ -33,7 +32,7 @@ import logging
 from numpy import maximum as max_, minimum as min_
 from openfisca_core import columns, formulas, reforms
 
-from .. import entities
+from .. import entities, legislation_overlays
 from ..model import base
 from ..model.prelevements_obligatoires.impot_revenu import reductions_impot
 
@@ -318,8 +317,8 @@ reform_legislation_subtree = {
 
 def build_reform(tax_benefit_system):
     reference_legislation_json = tax_benefit_system.legislation_json
-    reform_legislation_json = copy.deepcopy(reference_legislation_json)
-    reform_legislation_json['children'].update(reform_legislation_subtree)
+    reform_legislation_json = legislation_overlays.add_children(reference_legislation_json,
+        reform_legislation_subtree)
     Reform = reforms.make_reform(
         legislation_json = reform_legislation_json,
         name = u'PLFR 2014',
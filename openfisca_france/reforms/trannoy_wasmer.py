@@ -27,13 +27,12 @@
 
 from __future__ import division
 
-import copy
 from numpy import logical_not as not_, minimum as min_
 
 import logging
 
 from openfisca_core import columns, formulas, reforms
-from .. import entities
+from .. import entities, legislation_overlays
 from ..model import base
 from ..model.prelevements_obligatoires.impot_revenu import charges_deductibles
 
@@ -108,8 +107,8 @@ reform_legislation_subtree = {
 
 def build_reform(tax_benefit_system):
     reference_legislation_json = tax_benefit_system.legislation_json
-    reform_legislation_json = copy.deepcopy(reference_legislation_json)
-    reform_legislation_json['children'].update(reform_legislation_subtree)
+    reform_legislation_json = legislation_overlays.add_children(reference_legislation_json,
+        reform_legislation_subtree)
     Reform = reforms.make_reform(
         legislation_json = reform_legislation_json,
         name = u'Loyer comme charge déductible (Trannoy-Wasmer)',
@@ -32,6 +32,8 @@ import uuid
 
 from openfisca_core import conv, scenarios
 
+from . import simulations
+
 
 def N_(message):
     return message
@@ -42,6 +44,12 @@ year_or_month_or_day_re = re.compile(ur'(18|19|20)\d{2}(-(0[1-9]|1[0-2])(-([0-2]
 
 
 class Scenario(scenarios.AbstractScenario):
+    def fill_simulation(self, simulation, use_set_input_hooks = True, variables_name_to_skip = None):
+        super(Scenario, self).fill_simulation(simulation, use_set_input_hooks = use_set_input_hooks,
+            variables_name_to_skip = variables_name_to_skip)
+        # Forks of the simulation keep these arrays, even for variables having a formula.
+        simulations.mark_inputs(simulation)
+
     def init_single_entity(self, axes = None, enfants = None, famille = None, foyer_fiscal = None, menage = None,
             parent1 = None, parent2 = None, period = None):
         if enfants is None:
@@ -32,7 +32,7 @@ from workalendar.europe import France
 
 
 holidays = []
-for year in range(1990, 2020):
+for year in range(1990, 2041):
     holidays += France().get_calendar_holidays(year)
 
 
@@ -62,19 +62,19 @@ header = """#! /usr/bin/env python
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
-from datetime import datetime
+from numpy import array
 
 
-holidays = ["""
+holidays = array(["""
 
 footer = """
-    ]
+    ], dtype = 'datetime64[D]')
 """
 
 with open("../assets/holidays.py", "w") as text_file:
     text_file.write(header)
     for holiday_date, holiday_name in OrderedDict(holidays).iteritems():
         text_file.write("""
-    datetime.strptime("{}", "%Y-%m-%d").date(), # {}""".format(holiday_date, holiday_name))
+    '{}',  # {}""".format(holiday_date, holiday_name))
 
     text_file.write(footer)
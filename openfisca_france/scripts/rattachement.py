@@ -37,12 +37,11 @@
 # revenu disponible on gérerait les droits aux prestations)
 
 
-import copy
 import logging
-import numpy as np
 import os
 
 import openfisca_france
+from openfisca_france import rattachement
 
 
 app_name = os.path.splitext(os.path.basename(__file__))[0]
@@ -52,66 +51,15 @@ tax_benefit_system = TaxBenefitSystem()
 
 
 def split(scenario):
-# On fait l'hypothèse que le scénario ne contient qu'un seul foyer fiscal
-    tax_benefit_system = scenario.tax_benefit_system
-    test_case = scenario.test_case
-    foyer_fiscal = test_case['foyers_fiscaux'][0]
-    individus = test_case['individus']
-    year = scenario.year
-    rattachements_possibles = [] # Contient en réalité les détachements possibles puisqu'au départ tous les membres sous rattachés au même foyer
-    detachements_impossibles = []
-    scenarios = []
-    impots = []
-
-    for pac_index, pac_id in enumerate(foyer_fiscal.pop('personnes_a_charge')):
-        pac = individus[pac_id].copy()
-        age = year - pac.pop('birth').year - 1
-        if 18 <= age < (21 + 4 * (pac['activite'] == 2)): # Exprime la condition de rattachement au foyer pour les majeurs
-            rattachements_possibles.append(pac_id)
-        else:
-            detachements_impossibles.append(pac_id)
-
-    foyers_possibles = partiesDe(list(rattachements_possibles))
-    n = len(foyers_possibles)
-    j = 1
-    min_ = [-1, 0]
-    for i in range(0, n):
-        scenarios.append(scenario.__class__())
-        scenarios[i].__dict__ = copy.copy(scenario.__dict__)
-        scenarios[i].test_case = copy.deepcopy(scenario.test_case)
-        scenarios[i].test_case['foyers_fiscaux'][0]['personnes_a_charge'] = foyers_possibles[i]+detachements_impossibles
-        for jeune in rattachements_possibles:
-            if jeune not in foyers_possibles[i]:
-                scenarios[i].test_case['foyers_fiscaux'][j] = { 'declarants': [jeune], 'personnes_a_charge': [] }
-                j += 1
-        scenarios[i].suggest()
-        simulation  = scenarios[i].new_simulation()
-        irpp = - round(np.sum(simulation.calculate('irpp')))
-        if irpp < min_[1] or min_[0] == -1:
-            min_ = [i, irpp]
-        impots.append(irpp)
-
-    print "Le plus avantageux pour votre famille est que les jeunes rattachés à votre foyer fiscal soient : {}. Vous paierez alors {}€ d'impôts. (Seuls les jeunes éligibles au rattachement sont indiqués (18 <= age < 21 si pas étudiant / 25 sinon. Le calculateur a émis l'hypothèse qu'il n'y avait qu'un seul foyer fiscal au départ, auquel tous les jeunes éligibles étaient rattachés.)".format(foyers_possibles[min_[0]],min_[1])
-    return impots
-
-
-def partiesDe(tab): # Calcule l'ensemble des parties des éléments d'un array, sous forme d'un array d'arrays
-    n = len(tab)
-    if n == 0:
-        return [[]]
-    else:
-        a = tab.pop()
-        tab2 = partiesDe(tab)
-        return add(a, tab2)
-
-
-def add(a, tab): # Concatène un array d'arrays (tab) avec le même array où un élément (a) aura été rajouté à chaque sous-array
-    n = len(tab)
-    for i in range (0, n):
-        b = list(tab[i])
-        tab.append(b)
-        tab[i].append(a)
-    return tab
+    # Toutes les combinaisons de rattachement sont calculées dans une même simulation.
+    configuration, irpp = rattachement.optimize(scenario)
+    jeunes_rattaches = [
+        individu_id
+        for individu_id, attached in sorted(configuration.iteritems())
+        if attached
+        ]
+    print "Le plus avantageux pour votre famille est que les jeunes rattachés à votre foyer fiscal soient : {}. Vous paierez alors {}€ d'impôts. (Seuls les jeunes éligibles au rattachement sont indiqués (18 <= age < 21 si pas étudiant / 25 sinon.)".format(jeunes_rattaches, -round(irpp))
+    return configuration, irpp
 
 
 def define_scenario(year):
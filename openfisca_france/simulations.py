@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Copy-on-write forks of simulations, to recompute a few variables after changing some inputs.
+
+Also computes a reform next to its reference, sharing the arrays of the variables the reform doesn't change.
+"""
+
+
+import ast
+import collections
+import inspect
+import textwrap
+import types
+
+from openfisca_core import formulas
+
+
+# Caches stored by formulas in simulation.__dict__, that a fork must not share with its parent.
+simulation_cache_names = (
+    'distribution_by_key',
+    'fused_cotisations_by_key',
+    'type_sal_partition_by_period',
+    )
+# Methods of simulations whose first argument is the name of a variable.
+simulation_accessors_name = set([
+    'calculate',
+    'calculate_add',
+    'calculate_add_divide',
+    'calculate_divide',
+    'compute',
+    'compute_add',
+    'compute_add_divide',
+    'compute_divide',
+    'get_array',
+    'get_holder',
+    'get_or_new_holder',
+    ])
+
+
+def calculate_with_reference(scenario, variables_name, period = None):
+    """Calculate variables with the reform of scenario and with its reference.
+
+    The reference is calculated first. The reform simulation then starts with the reference arrays of every variable
+    that the reform doesn't change, so that only the changed variables are computed twice.
+
+    Return 3 dicts of arrays by variable name: reference values, reform values and their differences.
+    """
+    reference_simulation = scenario.new_simulation(reference = True)
+    reference_array_by_name = dict(
+        (variable_name, reference_simulation.calculate(variable_name, period))
+        for variable_name in variables_name
+        )
+
+    reform_simulation = scenario.new_simulation()
+    reform = reform_simulation.tax_benefit_system
+    reform_dependents = get_reform_dependents(reform)
+    for reference_entity in reference_simulation.entity_by_key_plural.itervalues():
+        for variable_name, reference_holder in reference_entity.holder_by_name.iteritems():
+            if variable_name in reform_dependents or variable_name not in reform.column_by_name:
+                continue
+            holder = reform_simulation.get_or_new_holder(variable_name)
+            # Arrays are shared, because formulas don't modify them.
+            if reference_holder._array is not None:
+                holder._array = reference_holder._array
+            if reference_holder._array_by_period is not None:
+                holder._array_by_period = reference_holder._array_by_period.copy()
+    reform_array_by_name = dict(
+        (variable_name, reform_simulation.calculate(variable_name, period))
+        for variable_name in variables_name
+        )
+
+    delta_by_name = dict(
+        (variable_name, reform_array_by_name[variable_name] - reference_array)
+        for variable_name, reference_array in reference_array_by_name.iteritems()
+        )
+    return reference_array_by_name, reform_array_by_name, delta_by_name
+
+
+def fork(simulation, period = None, **input_array_by_name):
+    """Return a fork of simulation, where the arrays of the given variables are replaced.
+
+    The fork shares every unchanged array with simulation. Only the arrays computed from the replaced variables
+    (directly or not) are dropped, to be recomputed on demand, so dropping the fork frees only what it computed.
+    """
+    if period is None:
+        period = simulation.period
+    new = fork_without(simulation, get_dependents(simulation.tax_benefit_system, input_array_by_name.iterkeys()))
+    for variable_name, array in input_array_by_name.iteritems():
+        holder = new.get_or_new_holder(variable_name)
+        holder.delete_arrays()
+        holder.set_array(period, array)
+        mark_input(new, variable_name)
+    return new
+
+
+def fork_without(simulation, variables_name):
+    """Return a fork of simulation, sharing every array except the computed arrays of the given variables.
+
+    The arrays given as inputs (recorded by mark_inputs) are kept, even for variables having a formula. When the
+    inputs of simulation were not recorded, only the variables without formula are kept.
+    """
+    new = simulation.clone(debug = simulation.debug, debug_all = simulation.debug_all, trace = simulation.trace)
+    new_dict = new.__dict__
+    for cache_name in simulation_cache_names:
+        cache = new_dict.get(cache_name)
+        if cache is not None:
+            new_dict[cache_name] = cache.copy()
+
+    column_by_name = simulation.tax_benefit_system.column_by_name
+    inputs_infos = new_dict.get('inputs_infos')
+    for variable_name in variables_name:
+        # Input variables have no formula to recompute them.
+        if column_by_name[variable_name].is_input_variable():
+            continue
+        holder = new.get_holder(variable_name, None)
+        if holder is None:
+            continue
+        if inputs_infos is None:
+            holder.delete_arrays()
+            continue
+        if holder._array is not None and (variable_name, None) not in inputs_infos:
+            del holder._array
+        if holder._array_by_period is not None:
+            input_array_by_period = dict(
+                (period, array)
+                for period, array in holder._array_by_period.iteritems()
+                if (variable_name, period) in inputs_infos
+                )
+            if input_array_by_period:
+                holder._array_by_period = input_array_by_period
+            else:
+                del holder._array_by_period
+    return new
+
+
+def get_dependents(tax_benefit_system, variables_name):
+    """Return the names of the variables computed (directly or not) from the given variables.
+
+    The variables whose formulas use variable names that can't be found statically are always included, with their
+    own dependents, so that they are fully recomputed.
+    """
+    dependents_by_name = get_dependents_by_name(tax_benefit_system)
+    dependents = set()
+    remaining = list(variables_name)
+    if remaining:
+        unresolved_variables_name = tax_benefit_system.unresolved_variables_name
+        dependents.update(unresolved_variables_name)
+        remaining.extend(unresolved_variables_name)
+    while remaining:
+        for dependent in dependents_by_name.get(remaining.pop(), ()):
+            if dependent not in dependents:
+                dependents.add(dependent)
+                remaining.append(dependent)
+    return dependents
+
+
+def get_dependents_by_name(tax_benefit_system):
+    """Return the names of the variables using directly each variable, computed once per tax-benefit system.
+
+    Also set the names of the variables whose formulas may use unresolved variable names, in
+    tax_benefit_system.unresolved_variables_name.
+    """
+    dependents_by_name = tax_benefit_system.__dict__.get('dependents_by_name')
+    if dependents_by_name is None:
+        column_by_name = tax_benefit_system.column_by_name
+        dependents_by_name = collections.defaultdict(set)
+        unresolved_variables_name = set()
+        for variable_name, column in column_by_name.iteritems():
+            for input_variable_name in iter_input_variables_name(column, column_by_name):
+                dependents_by_name[input_variable_name].add(variable_name)
+            if uses_unresolved_variables(column):
+                unresolved_variables_name.add(variable_name)
+        tax_benefit_system.unresolved_variables_name = frozenset(unresolved_variables_name)
+        tax_benefit_system.dependents_by_name = dependents_by_name = dict(dependents_by_name)
+    return dependents_by_name
+
+
+def get_legislation_readers(tax_benefit_system, legislation_names):
+    """Return the names of the variables whose formulas may use one of the given legislation nodes.
+
+    Each legislation node is given as a tuple of names in the compact legislation. A formula may use it when it uses all
+    these names, in its functions or in the helpers they call.
+    """
+    readers = set()
+    if not legislation_names:
+        return readers
+    for variable_name, column in tax_benefit_system.column_by_name.iteritems():
+        formula_class = column.formula_class
+        if formula_class is None or issubclass(formula_class, formulas.AbstractEntityToEntity):
+            continue
+        visited = set()
+        used_names = set(
+            string
+            for function in iter_formula_functions(formula_class)
+            for string in iter_functions_strings(function, visited, names = True)
+            )
+        if any(
+                all(name in used_names for name in names)
+                for names in legislation_names
+                ):
+            readers.add(variable_name)
+    return readers
+
+
+def get_reform_dependents(reform):
+    """Return the names of the variables whose values may differ between reform and its base tax-benefit system.
+
+    They are the variables whose formulas are changed by the reform, the variables whose formulas use a node of the
+    legislation changed by the reform, the variables whose formulas use unresolved variable names, and the variables
+    computed (directly or not) from them. Legislation nodes are matched conservatively, by the name of their top-level
+    node (like "ir" or "cotsoc"), used by the formulas or by the helpers they call.
+    """
+    reform_dependents = reform.__dict__.get('reform_dependents')
+    if reform_dependents is None:
+        base_tax_benefit_system = reform.base_tax_benefit_system
+        base_column_by_name = base_tax_benefit_system.column_by_name
+        changed_variables_name = set(
+            variable_name
+            for variable_name, column in reform.column_by_name.iteritems()
+            if base_column_by_name.get(variable_name) is not column
+            )
+        changed_legislation_names = set(
+            names[:1]
+            for names in iter_changed_legislation_names(base_tax_benefit_system.legislation_json,
+                reform.legislation_json)
+            )
+        changed_variables_name.update(get_legislation_readers(reform, changed_legislation_names))
+        reform_dependents = changed_variables_name | get_dependents(reform, changed_variables_name)
+        reform.reform_dependents = reform_dependents
+    return reform_dependents
+
+
+def iter_changed_legislation_names(reference_node_json, node_json, names = ()):
+    """Iterate on the paths (as tuples of names in compact legislation) of the legislation nodes that differ.
+
+    Unchanged nodes are usually shared by a reform legislation and its reference, so they are skipped by identity.
+    """
+    if node_json is reference_node_json:
+        return
+    reference_children_json = (reference_node_json or {}).get('children')
+    children_json = (node_json or {}).get('children')
+    if reference_children_json is None or children_json is None:
+        if node_json != reference_node_json:
+            yield names
+        return
+    if any(
+            value != reference_node_json.get(key)
+            for key, value in node_json.iteritems()
+            if key != 'children'
+            ):
+        yield names
+        return
+    for key in set(children_json).union(reference_children_json):
+        for changed_names in iter_changed_legislation_names(reference_children_json.get(key), children_json.get(key),
+                names + (key,)):
+            yield changed_names
+
+
+def iter_formula_functions(formula_class):
+    if issubclass(formula_class, formulas.DatedFormula):
+        for dated_formula_class in formula_class.dated_formulas_class:
+            yield dated_formula_class['formula_class'].function
+    else:
+        yield formula_class.function
+
+
+def iter_functions_codes(function, visited):
+    """Iterate on the codes (with their globals) of a function and of the global functions it calls, recursively.
+
+    Only the functions of openfisca_france are followed.
+    """
+    function = getattr(function, '__func__', function)
+    if not isinstance(function, types.FunctionType) or function in visited \
+            or not function.func_globals.get('__name__', '').startswith('openfisca_france'):
+        return
+    visited.add(function)
+    function_globals = function.func_globals
+    codes = [function.func_code]
+    while codes:
+        code = codes.pop()
+        yield code, function_globals
+        codes.extend(
+            constant
+            for constant in code.co_consts
+            if isinstance(constant, types.CodeType)
+            )
+        for value in iter_globals_values(function_globals, code.co_names):
+            for called_code, called_function_globals in iter_functions_codes(value, visited):
+                yield called_code, called_function_globals
+
+
+def iter_functions_strings(function, visited, names = False):
+    """Iterate on the string constants of a function and of the global functions it calls, recursively.
+
+    The strings of the module-level containers (lists, tuples, dicts, etc) that they use are included.
+
+    When names is True, also iterate on the names used by the functions, including attributes names.
+    """
+    for code, function_globals in iter_functions_codes(function, visited):
+        for constant in code.co_consts:
+            for string in iter_strings(constant):
+                yield string
+        if names:
+            for name in code.co_names:
+                yield name
+        for value in iter_globals_values(function_globals, code.co_names):
+            if isinstance(value, (dict, frozenset, list, set, tuple)):
+                for string in iter_strings(value):
+                    yield string
+
+
+def iter_globals_values(function_globals, names):
+    """Iterate on the global values used by names, including the attributes of the modules they use.
+
+    Handles calls like module.function(...) or package.module.function(...).
+    """
+    for name in names:
+        value = function_globals.get(name)
+        if isinstance(value, types.ModuleType):
+            modules = [value]
+            visited_modules = set(modules)
+            while modules:
+                module = modules.pop()
+                for attribute_name in names:
+                    attribute = getattr(module, attribute_name, None)
+                    if isinstance(attribute, types.ModuleType):
+                        if attribute not in visited_modules:
+                            visited_modules.add(attribute)
+                            modules.append(attribute)
+                    elif attribute is not None:
+                        yield attribute
+        elif value is not None:
+            yield value
+
+
+def iter_holder_periods(holder):
+    """Iterate on the periods of the arrays of a holder, None being the period of a permanent array."""
+    if holder._array is not None:
+        yield None
+    if holder._array_by_period is not None:
+        for period in holder._array_by_period.iterkeys():
+            yield period
+
+
+def iter_input_variables_name(column, column_by_name):
+    """Iterate on the names of the variables that the formula of a column may use.
+
+    The names are found statically, as the string constants of the formula functions (and of the helpers they call)
+    which are names of variables. Names built at run time are not found.
+    """
+    formula_class = column.formula_class
+    if formula_class is None:
+        return
+    if issubclass(formula_class, formulas.AbstractEntityToEntity):
+        yield formula_class.variable_name
+        return
+    visited = set()
+    for function in iter_formula_functions(formula_class):
+        for string in iter_functions_strings(function, visited):
+            if string in column_by_name and string != column.name:
+                yield string
+
+
+def iter_strings(value):
+    if isinstance(value, basestring):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.iteritems():
+            for string in iter_strings(item):
+                yield string
+    elif isinstance(value, (frozenset, list, set, tuple)):
+        for item in value:
+            for string in iter_strings(item):
+                yield string
+
+
+def mark_input(simulation, variable_name):
+    """Record the arrays of a variable, just set by the caller, as inputs of simulation."""
+    inputs_infos = simulation.__dict__.get('inputs_infos')
+    if inputs_infos is None:
+        return
+    holder = simulation.get_holder(variable_name)
+    simulation.inputs_infos = inputs_infos.union(
+        (variable_name, period)
+        for period in iter_holder_periods(holder)
+        )
+
+
+def mark_inputs(simulation):
+    """Record every array of simulation as an input, that forks keep instead of recomputing it.
+
+    Called once the inputs of a new simulation are set, before any computation.
+    """
+    simulation.inputs_infos = frozenset(
+        (variable_name, period)
+        for entity in simulation.entity_by_key_plural.itervalues()
+        for variable_name, holder in entity.holder_by_name.iteritems()
+        for period in iter_holder_periods(holder)
+        )
+
+
+def uses_unresolved_variables(column):
+    """Return whether the formula of a column may call the simulation with a variable name not found statically."""
+    formula_class = column.formula_class
+    if formula_class is None or issubclass(formula_class, formulas.AbstractEntityToEntity):
+        return False
+    nested_codes = set()
+    visited = set()
+    for function in iter_formula_functions(formula_class):
+        for code, function_globals in iter_functions_codes(function, visited):
+            # Nested functions are parsed with the function containing them.
+            is_nested = code in nested_codes
+            nested_codes.update(
+                constant
+                for constant in code.co_consts
+                if isinstance(constant, types.CodeType)
+                )
+            if not is_nested and uses_unresolved_variables_in_code(code):
+                return True
+    return False
+
+
+def uses_unresolved_variables_in_code(code):
+    """Return whether the function of a code calls the simulation with a variable name that is not found statically.
+
+    A variable name is resolved when it is a string constant or a parameter of the innermost function (whose callers
+    give it as a string constant). Any other argument (like a name built at run time) is unresolved. Functions without
+    source are unresolved.
+    """
+    try:
+        source = textwrap.dedent(inspect.getsource(code))
+        function_node = ast.parse(source).body[0]
+    except (IOError, IndexError, SyntaxError, TypeError):
+        return True
+    if not isinstance(function_node, ast.FunctionDef):
+        return True
+    nodes_and_parameters_name = [(function_node, frozenset())]
+    while nodes_and_parameters_name:
+        node, parameters_name = nodes_and_parameters_name.pop()
+        if isinstance(node, (ast.FunctionDef, ast.Lambda)):
+            parameters_name = frozenset(
+                [
+                    argument.id
+                    for argument in node.args.args
+                    if isinstance(argument, ast.Name)
+                    ] + [
+                    name
+                    for name in (node.args.vararg, node.args.kwarg)
+                    if name is not None
+                    ]
+                )
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+                and node.func.attr in simulation_accessors_name:
+            name_node = node.args[0] if node.args else None
+            if not isinstance(name_node, ast.Str) \
+                    and not (isinstance(name_node, ast.Name) and name_node.id in parameters_name):
+                return True
+        nodes_and_parameters_name.extend(
+            (child_node, parameters_name)
+            for child_node in ast.iter_child_nodes(node)
+            )
+    return False
@@ -25,27 +25,39 @@
 
 # import copy
 import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
 
 import numpy as np
 from openfisca_core import periods, simulations
 
+from .simulations import mark_inputs
+
 
 log = logging.getLogger(__name__)
+worker_survey_scenario = None  # Survey scenario of the processes of the pool of SurveyScenario.compute_by_chunk
 
 
 class SurveyScenario(object):
+    head_mask_by_symbol = None
+    head_position_by_symbol = None
     inflators = None
+    input_array_by_name = None
     input_data_frame = None
     legislation_json = None
+    output_array_by_name = None
     simulation = None
     tax_benefit_system = None
     tax_benefit_system_class = None
     year = None
     weight_column_name_by_entity_symbol = dict()
 
-    def init_from_data_frame(self, input_data_frame = None, tax_benefit_system = None, year = None):
-        assert input_data_frame is not None
-        self.input_data_frame = input_data_frame
+    def init_from_arrays(self, input_array_by_name = None, tax_benefit_system = None, year = None):
+        """Initialize the scenario from a dict of persons arrays (entity variables being given to their heads)."""
+        assert input_array_by_name is not None
+        self.input_array_by_name = input_array_by_name
         assert tax_benefit_system is not None
         self.tax_benefit_system = tax_benefit_system
         survey_tax_benefit_system = adapt_to_survey(tax_benefit_system)
@@ -58,8 +70,194 @@ class SurveyScenario(object):
         self.weight_column_name_by_entity_symbol['ind'] = 'weight_ind'
         return self
 
-    def new_simulation(self, debug = False, debug_all = False, trace = False):
-        input_data_frame = self.input_data_frame
+    def init_from_data_frame(self, input_data_frame = None, tax_benefit_system = None, year = None):
+        assert input_data_frame is not None
+        self.input_data_frame = input_data_frame
+        # Note: The values of the columns of a data frame are views, not copies.
+        return self.init_from_arrays(
+            input_array_by_name = dict(
+                (column_name, column_series.values)
+                for column_name, column_series in input_data_frame.iteritems()
+                ),
+            tax_benefit_system = tax_benefit_system,
+            year = year,
+            )
+
+    def init_from_npy_dir(self, npy_dir_path = None, tax_benefit_system = None, year = None):
+        """Initialize the scenario from a directory containing a .npy file by column, which are memory-mapped."""
+        assert npy_dir_path is not None
+        return self.init_from_arrays(
+            input_array_by_name = dict(
+                (os.path.splitext(file_name)[0], np.load(os.path.join(npy_dir_path, file_name), mmap_mode = 'r'))
+                for file_name in os.listdir(npy_dir_path)
+                if file_name.endswith('.npy')
+                ),
+            tax_benefit_system = tax_benefit_system,
+            year = year,
+            )
+
+    def init_from_parquet(self, parquet_file_path = None, tax_benefit_system = None, year = None):
+        """Initialize the scenario from a Parquet file. Requires pyarrow."""
+        assert parquet_file_path is not None
+        import pyarrow.parquet
+
+        table = pyarrow.parquet.read_table(parquet_file_path)
+        return self.init_from_arrays(
+            input_array_by_name = dict(
+                (column_name, table.column(column_name).to_numpy())
+                for column_name in table.column_names
+                ),
+            tax_benefit_system = tax_benefit_system,
+            year = year,
+            )
+
+    def compute_by_chunk(self, variables_name, households_count = 10000, npy_dir_path = None, period = None,
+            processes = None):
+        """Compute variables chunk by chunk of households, so that memory doesn't grow with the size of the survey.
+
+        Each variable is written in a .npy file of npy_dir_path (or of a temporary directory, removed once its files
+        are mapped), in the order of the input rows (of persons or of entity heads). The memory-mapped output arrays
+        are stored in output_array_by_name. Return the weighted sum of each variable.
+
+        With processes > 1, chunks are dispatched to a pool of processes, writing their rows directly in the
+        (memory-mapped) .npy files. Weighted sums are added chunk by chunk in the same order, whatever the number of
+        processes, so they don't depend on it.
+        """
+        head_mask_by_symbol = self.get_head_mask_by_symbol()
+        self.get_head_position_by_symbol()
+        temporary_dir_path = None
+        if npy_dir_path is None:
+            npy_dir_path = temporary_dir_path = tempfile.mkdtemp(prefix = 'openfisca-survey-')
+        try:
+            column_by_name = self.tax_benefit_system.column_by_name
+            output_file_path_by_name = {}
+            for variable_name in variables_name:
+                column = column_by_name[variable_name]
+                output_file_path_by_name[variable_name] = output_file_path = os.path.join(npy_dir_path,
+                    '{}.npy'.format(variable_name))
+                np.lib.format.open_memmap(output_file_path, dtype = column.dtype, mode = 'w+',
+                    shape = (len(head_mask_by_symbol['men']) if column.entity == 'ind'
+                        else head_mask_by_symbol[column.entity].sum(),)).flush()
+
+            chunks_arguments = [
+                (persons_index, variables_name, output_file_path_by_name, period)
+                for persons_index in self.iter_chunks_persons_index(households_count)
+                ]
+            if processes is not None and processes > 1:
+                global worker_survey_scenario
+                # Fill the caches before forking, so that the processes of the pool share their pages.
+                self.tax_benefit_system.base_tax_benefit_system.prefill_cache()
+                # The scenario (and its tax-benefit system) is inherited by the forked processes of the pool.
+                worker_survey_scenario = self
+                pool = multiprocessing.Pool(processes)
+                try:
+                    weighted_sum_by_name_by_chunk = pool.map(compute_chunk_in_worker, chunks_arguments, chunksize = 1)
+                finally:
+                    pool.terminate()
+                    worker_survey_scenario = None
+            else:
+                weighted_sum_by_name_by_chunk = [
+                    self.compute_chunk(*chunk_arguments)
+                    for chunk_arguments in chunks_arguments
+                    ]
+            # Note: Mapped files stay readable once their temporary directory is removed.
+            self.output_array_by_name = dict(
+                (variable_name, np.load(output_file_path, mmap_mode = 'r'))
+                for variable_name, output_file_path in output_file_path_by_name.iteritems()
+                )
+        finally:
+            if temporary_dir_path is not None:
+                shutil.rmtree(temporary_dir_path, ignore_errors = True)
+        return dict(
+            (
+                variable_name,
+                sum(
+                    weighted_sum_by_name[variable_name]
+                    for weighted_sum_by_name in weighted_sum_by_name_by_chunk
+                    ),
+                )
+            for variable_name in variables_name
+            )
+
+    def compute_chunk(self, persons_index, variables_name, output_file_path_by_name = None, period = None):
+        """Compute variables for the persons of a chunk, writing them in output files, and return their weighted
+        sums."""
+        input_array_by_name = self.get_chunk_input_arrays(persons_index)
+        simulation = self.new_simulation(input_array_by_name = input_array_by_name)
+        weighted_sum_by_name = {}
+        weight_by_symbol = {}
+        for variable_name in variables_name:
+            holder = simulation.get_or_new_holder(variable_name)
+            symbol = holder.entity.symbol
+            array = simulation.calculate(variable_name, period)
+            if symbol not in weight_by_symbol:
+                weight_column_name = self.weight_column_name_by_entity_symbol.get(symbol)
+                weight_by_symbol[symbol] = simulation.calculate(weight_column_name, period) \
+                    if weight_column_name in simulation.tax_benefit_system.column_by_name else 1
+            weighted_sum_by_name[variable_name] = (array * weight_by_symbol[symbol]).sum()
+            if output_file_path_by_name is None:
+                continue
+            if holder.entity.is_persons_entity:
+                output_index = persons_index
+            else:
+                output_index = self.get_head_position_by_symbol()[symbol][persons_index][
+                    input_array_by_name['qui' + symbol] == 0]
+            output_array = np.load(output_file_path_by_name[variable_name], mmap_mode = 'r+')
+            output_array[output_index] = array
+            output_array.flush()
+        return weighted_sum_by_name
+
+    def get_chunk_input_arrays(self, persons_index):
+        """Return the input arrays of the given persons, with entities IDs renumbered."""
+        column_by_name = self.tax_benefit_system.column_by_name
+        input_array_by_name = dict(
+            (column_name, np.asarray(array)[persons_index])
+            for column_name, array in self.input_array_by_name.iteritems()
+            if column_name in column_by_name
+            )
+        for symbol in ('fam', 'foy', 'men'):
+            entities_id, input_array_by_name['id' + symbol] = np.unique(input_array_by_name['id' + symbol],
+                return_inverse = True)
+            assert (input_array_by_name['qui' + symbol] == 0).sum() == len(entities_id), \
+                'Some entities "{}" straddle several households'.format(symbol)
+        return input_array_by_name
+
+    def get_head_mask_by_symbol(self):
+        head_mask_by_symbol = self.head_mask_by_symbol
+        if head_mask_by_symbol is None:
+            self.head_mask_by_symbol = head_mask_by_symbol = dict(
+                (symbol, np.asarray(self.input_array_by_name['qui' + symbol]) == 0)
+                for symbol in ('fam', 'foy', 'men')
+                )
+        return head_mask_by_symbol
+
+    def get_head_position_by_symbol(self):
+        """Return the position of each person in the arrays of her entities, when she is their head."""
+        head_position_by_symbol = self.head_position_by_symbol
+        if head_position_by_symbol is None:
+            self.head_position_by_symbol = head_position_by_symbol = dict(
+                (symbol, np.cumsum(head_mask) - 1)
+                for symbol, head_mask in self.get_head_mask_by_symbol().iteritems()
+                )
+        return head_position_by_symbol
+
+    def iter_chunks_persons_index(self, households_count):
+        """Iterate on the positions in the input of the persons of chunks of at most households_count households.
+
+        Households never straddle chunks.
+        """
+        idmen = np.asarray(self.input_array_by_name['idmen'])
+        # Persons sorted by household, keeping their order inside each household.
+        persons_order = np.argsort(idmen, kind = 'mergesort')
+        chunks_start = np.searchsorted(idmen[persons_order], np.arange(0, idmen.max() + 1, households_count))
+        for start, stop in zip(chunks_start, list(chunks_start[1:]) + [len(idmen)]):
+            yield np.sort(persons_order[start:stop])
+
+    def new_simulation(self, debug = False, debug_all = False, input_array_by_name = None, trace = False):
+        """Return a new simulation of the input arrays of the scenario (or of the given ones, for a chunk)."""
+        is_chunk = input_array_by_name is not None
+        if not is_chunk:
+            input_array_by_name = self.input_array_by_name
         # TODO: Pass year to this method, not init_from_data_frame
         simulation = simulations.Simulation(
             debug = debug,
@@ -74,44 +272,36 @@ class SurveyScenario(object):
         id_variables = ["id{}".format(symbol) for symbol in symbols_other_than_ind]
         role_variables = ["qui{}".format(symbol) for symbol in symbols_other_than_ind]
         for id_variable in id_variables + role_variables:
-            assert id_variable in self.input_data_frame.columns
+            assert id_variable in input_array_by_name
 
+        # Select the input columns at once, without copying any array.
         column_by_name = self.tax_benefit_system.column_by_name
-        for column_name in input_data_frame:
+        retained_columns_name = []
+        for column_name in sorted(input_array_by_name):
             if column_name not in column_by_name:
                 log.info('Unknown column "{}" in survey, dropped from input table'.format(column_name))
-                # waiting for the new pandas version to hit Travis repo
-                input_data_frame = input_data_frame.drop(column_name, axis = 1)
-                # , inplace = True)  # TODO: effet de bords ?
-        for column_name in input_data_frame:
-            if column_by_name[column_name].formula_class is not None:
+            elif column_by_name[column_name].formula_class is not None:
                 log.info('Column "{}" in survey set to be calculated, dropped from input table'.format(column_name))
-                input_data_frame = input_data_frame.drop(column_name, axis = 1)
-                # , inplace = True)  # TODO: effet de bords ?
+            else:
+                retained_columns_name.append(column_name)
 
+        head_mask_by_symbol = {}
         for entity in simulation.entity_by_key_singular.values():
             if entity.is_persons_entity:
-                entity.count = entity.step_size = len(input_data_frame)
+                entity.count = entity.step_size = len(input_array_by_name[id_variables[0]])
             else:
-                entity.count = entity.step_size = (input_data_frame["qui{}".format(entity.symbol)] == 0).sum()
-                entity.roles_count = input_data_frame["qui{}".format(entity.symbol)].max() + 1
+                role_array = input_array_by_name["qui{}".format(entity.symbol)]
+                head_mask_by_symbol[entity.symbol] = head_mask = role_array == 0
+                entity.count = entity.step_size = head_mask.sum()
+                entity.roles_count = role_array.max() + 1
 #       TODO: Create a validation/conversion step
-#       TODO: introduce an assert when loading in place of astype
-        for column_name, column_series in input_data_frame.iteritems():
+        for column_name in retained_columns_name:
             holder = simulation.get_or_new_holder(column_name)
-            entity = holder.entity
-            if entity.is_persons_entity:
-                array = column_series.values.astype(holder.column.dtype)
-            else:
-                array = column_series.values[input_data_frame['qui' + entity.symbol].values == 0].astype(
-                    holder.column.dtype)
-            assert array.size == entity.count, 'Bad size for {}: {} instead of {}'.format(
-                column_name,
-                array.size,
-                entity.count)
-            holder.array = np.array(array, dtype = holder.column.dtype)
-
-        self.simulation = simulation
+            holder.array = get_entity_array(holder, input_array_by_name[column_name], head_mask_by_symbol)
+        mark_inputs(simulation)
+
+        if not is_chunk:
+            self.simulation = simulation
         return simulation
 
     def inflate(self, inflators = None):
@@ -230,18 +420,35 @@ def new_simulation_from_array_dict(array_dict = None, debug = False, debug_all =
     menages.roles_count = array_dict['quimen'].max() + 1
     foyers_fiscaux.roles_count = array_dict['quifoy'].max() + 1
 
+    head_mask_by_symbol = dict(
+        (entity.symbol, array_dict['qui' + entity.symbol] == 0)
+        for entity in (familles, foyers_fiscaux, menages)
+        )
     for column_name, column_array in array_dict.iteritems():
         holder = simulation.get_or_new_holder(column_name)
-        entity = holder.entity
-        if entity.is_persons_entity:
-            array = column_array
-        else:
-            array = column_array[array_dict['qui' + entity.symbol].values == 0]
-        assert array.size == entity.count, 'Bad size for {}: {} instead of {}'.format(
-            column_name,
-            array.size,
-            entity.count
-            )
-        holder.array = np.array(array, dtype = holder.column.dtype)
+        holder.array = get_entity_array(holder, column_array, head_mask_by_symbol)
+    mark_inputs(simulation)
 
     return simulation
+
+
+def compute_chunk_in_worker(chunk_arguments):
+    return worker_survey_scenario.compute_chunk(*chunk_arguments)
+
+
+def get_entity_array(holder, persons_array, head_mask_by_symbol):
+    """Return the array of the entity of holder, from an array of persons where only the heads of entities matter.
+
+    Arrays of persons already having the dtype of the column are used without copy.
+    """
+    entity = holder.entity
+    if entity.is_persons_entity:
+        array = persons_array
+    else:
+        array = persons_array[head_mask_by_symbol[entity.symbol]]
+    assert array.size == entity.count, 'Bad size for {}: {} instead of {}'.format(
+        holder.column.name,
+        array.size,
+        entity.count
+        )
+    return np.asarray(array, dtype = holder.column.dtype)
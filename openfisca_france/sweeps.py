@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Sweeps of a legislation parameter: a few variables are computed for each value of a vector of values."""
+
+
+import collections
+import copy
+import multiprocessing
+
+import numpy as np
+from openfisca_core import reforms
+
+from . import legislation_overlays, simulations
+
+
+worker_sweep = None  # Sweep of the processes of the pool of sweep
+
+
+class Sweep(object):
+    """Computations of variables for several values of the legislation parameter at path.
+
+    Every variable that doesn't depend on the parameter is computed once, in the base simulation. Each value is then
+    computed in a fork of this simulation, where only the arrays of the variables depending on the parameter are
+    dropped.
+
+    The reform class (with its entities and columns) is built once: each value only gets a copy of the reform with its
+    own legislation.
+    """
+    base_simulation = None
+    dependents = None  # Names of the variables that may depend on the parameter
+    legislation_period = None
+    path = None
+    period = None
+    reform = None
+    variables_name = None
+    weight_variable_name = None
+
+    def __init__(self, simulation, path, variables_name, legislation_period = None, period = None,
+            weight_variable_name = None):
+        if period is None:
+            period = simulation.period
+        self.base_simulation = simulation
+        self.legislation_period = legislation_period if legislation_period is not None else period
+        self.path = path
+        self.period = period
+        self.variables_name = variables_name
+        self.weight_variable_name = weight_variable_name
+
+        tax_benefit_system = simulation.tax_benefit_system
+        readers = simulations.get_legislation_readers(tax_benefit_system, [get_legislation_names(path)[:1]])
+        self.dependents = readers | simulations.get_dependents(tax_benefit_system, readers)
+        Reform = reforms.make_reform(
+            legislation_json = tax_benefit_system.legislation_json,
+            name = u'Sweep of {}'.format(u'.'.join(unicode(key) for key in path)),
+            reference = tax_benefit_system,
+            )
+        self.reform = Reform()
+        # Compute once the variables that don't depend on the parameter.
+        for variable_name in variables_name:
+            simulation.calculate(variable_name, period)
+        if weight_variable_name is not None:
+            simulation.calculate(weight_variable_name, period)
+
+    def compute(self, value):
+        """Return the (weighted) sum of each variable, when the parameter is set to value."""
+        simulation = self.new_simulation(value)
+        weights = (
+            simulation.calculate(self.weight_variable_name, self.period)
+            if self.weight_variable_name is not None
+            else None
+            )
+        return dict(
+            (variable_name, float(np.sum(
+                simulation.calculate(variable_name, self.period) * (weights if weights is not None else 1)
+                )))
+            for variable_name in self.variables_name
+            )
+
+    def new_simulation(self, value):
+        """Return a fork of the base simulation, where the parameter is set to value."""
+        simulation = simulations.fork_without(self.base_simulation, self.dependents)
+        simulation.compact_legislation_by_instant_cache = {}
+        simulation.tax_benefit_system = self.new_tax_benefit_system(value)
+        return simulation
+
+    def new_tax_benefit_system(self, value):
+        """Return a copy of the reform of the sweep, whose legislation has the parameter set to value."""
+        reform = copy.copy(self.reform)
+        # Drop the caches that depend on the legislation.
+        reform.__dict__.pop('reform_dependents', None)
+        reform.compact_legislation_by_instant_cache = {}
+        reform.legislation_json = legislation_overlays.update_legislation(
+            legislation_json = self.base_simulation.tax_benefit_system.legislation_json,
+            path = self.path,
+            period = self.legislation_period,
+            value = value,
+            )
+        return reform
+
+
+def compute_in_worker(value):
+    return worker_sweep.compute(value)
+
+
+def get_legislation_names(path):
+    """Return the names, in compact legislation, of the node at path in legislation JSON."""
+    return tuple(
+        path[index + 1]
+        for index, key in enumerate(path[:-1])
+        if key == 'children'
+        )
+
+
+def sweep(simulation, path, values, variables_name, legislation_period = None, period = None, processes = None,
+        weight_variable_name = None):
+    """Return the (weighted) sums of the variables (by variable name), by value of the parameter at path.
+
+    path is a path in legislation JSON, like the paths given to legislation_overlays.update_legislation. When
+    processes is not 1, values are computed in a pool of processes, which inherit the base simulation.
+    """
+    global worker_sweep
+    values = list(values)
+    parameter_sweep = Sweep(simulation, path, variables_name, legislation_period = legislation_period, period = period,
+        weight_variable_name = weight_variable_name)
+    if processes != 1 and len(values) > 1:
+        # Fill the caches before forking, so that the processes of the pool share their pages.
+        simulation.tax_benefit_system.base_tax_benefit_system.prefill_cache()
+        # The sweep (and its base simulation) is inherited by the forked processes of the pool.
+        worker_sweep = parameter_sweep
+        pool = multiprocessing.Pool(processes)
+        try:
+            sums_by_name = pool.map(compute_in_worker, values, chunksize = 1)
+        finally:
+            pool.terminate()
+            worker_sweep = None
+    else:
+        sums_by_name = [
+            parameter_sweep.compute(value)
+            for value in values
+            ]
+    return collections.OrderedDict(zip(values, sums_by_name))
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Columnar corpus of the tests/json cases, built once from the JSON files and loaded memory-mapped.
+
+For each year, the corpus contains a structured array per entity (its input variables and, for persons, their
+entities and roles) and a structured array of the official results, with a row per foyer fiscal.
+"""
+
+
+import collections
+import datetime
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+from biryani.baseconv import check
+import numpy as np
+
+from openfisca_france.legislation_cache import default_cache_dir
+
+
+json_dir_path = os.path.join(os.path.dirname(__file__), 'json')
+log = logging.getLogger(__name__)
+openfisca_name_by_code = {
+    'IAVIM': 'iai',
+    'IDEC': 'decote',
+    'IDRS2': 'ir_plaf_qf',
+    'IINETIR': 'irpp',
+    'IRESTIR': 'irpp',
+    'ITRED': 'reductions',
+    'NBP': 'nbptr',
+    'NBPT': 'nbptr',
+    'PPETOT': 'ppe',
+    'REVKIRE': 'rfr',
+    'RNICOL': 'rni',
+    'RRBG': 'rbg',
+    'TOTPAC': None,  # Compared with the number of "personnes à charge"
+    }
+# TODO: Checker si le montant net CSG/CRDS correspond à NAPCS, NAPRDS, checker IINET
+ignored_codes = set([
+    'AVFISCOPTER', 'BCSG', 'BPRS', 'BRDS', 'CIADCRE', 'CICA', 'CICORSE', 'CIDEPENV', 'CIDEVDUR',
+    'CIGARD', 'CIGE', 'CIHABPRIN', 'CIMOBIL', 'CIPERT', 'CIPRETUD', 'RILMIA', 'IINET',
+    'CIRCM', 'CIRELANCE', 'CITEC', 'IAVF2', 'I2DH', 'IREST', 'RILMIH',
+    'IRETS', 'NAPCR', 'NAPCRP', 'NAPCS', 'RRIRENOV', 'RCELHL', 'RLOCIDEFG',
+    'NAPPS', 'NAPRD', 'PERPPLAFTC', 'PERPPLAFTV', 'RAH', 'RCEL', 'RCELREPGX', 'RCELREPGW', 'RDONS',
+    'RCELHJK', 'RCELREPHR', 'RCELRREDLA', 'RRESIVIEU', 'RMEUBLE', 'RREDMEUB', 'RSOCREPR', 'RRPRESCOMP',
+    'RCONS', 'RPECHE', 'RCELREPGS', 'RCELREPGU', 'RCELREPGT', 'RPATNAT', 'RPATNATOT', 'RPRESCOMPREP',
+    'RDIFAGRI', 'REI', 'RFOR', 'RTELEIR', 'RTOURREP', 'RTOUREPA', 'RTOUHOTR', 'RRESINEUV',
+    'RFORET', 'RHEBE', 'RILMIC', 'RILMIB', 'RRESIMEUB', 'RREPMEU', 'RREPNPRO', 'TEFF',
+    'RPROREP', 'RINVRED', 'RREDREP', 'RILMIX', 'PERPPLAFTP',
+    'RILMIZ', 'RILMJI', 'RILMJS', 'RCODJT', 'RCODJU', 'RCODJV', 'RCODJW', 'RCODJX',
+    'RIDOMENT', 'RIDOMPROE1', 'RIDOMPROE2', 'RLOGDOM', 'RREPA', 'RDUFLOGIH', 'IPROP',
+    'RIDOMPROE3', 'RIDOMPROE4', 'RIDOMPROE5', 'RTITPRISE', 'RRDOM', 'RINVDOMTOMLG', 'RCOTFOR',
+    'RNI', 'RNOUV', 'RRESTIMO', 'RTOUR', 'RCELRREDLC', 'RCELRREDLB', 'RCELNBGL', 'RCELFD',
+    'RCELLIER', 'RCELHNO', 'RCELHM', 'RCELHR', 'RCELRREDLS', 'RCELRREDLZ', 'RCELFABC',
+    'RCELREPHS', 'RCELCOM', 'RCELNQ', 'RCELRREDLD', 'RCELRREDLE', 'RCELRREDLF',
+    'RTOURHOT', 'RTOURES', 'RTOURNEUF', 'RCINE', 'RFCPI', 'RINNO', 'RAA',
+    'RCELREPGJ', 'RCELREPGK', 'RCELREPGL', 'RCELREPGP', 'RSOUFIP', 'RCODELOP',
+    'RTOURTRA', 'TXMARJ', 'RSURV', 'RAIDE', 'RCELREPHA', 'RCELREPHB', 'RCELJP', 'RCELJOQR',
+    'RCELREPHD', 'RCELREPHE', 'RCELREPHF', 'RCELREPHH', 'RCEL2012', 'RCELJBGL', 'RCOLENT',
+    'RCELREPHT', 'RCELREPHU', 'RCELREPHV', 'RCELREPHW', 'RCELREPHX', 'RCELREPHZ', 'RCELRRED09', 'TXMOYIMP',
+    'RFIPC', 'RILMJX', 'RILMJV', 'RCELREPGV', 'RCELRREDLM', 'RCELRREDMG', 'RILMJW', 'RCELREPHG',
+    ])
+
+
+def build_corpus(tax_benefit_system, corpus_dir_path, json_dir_path = json_dir_path):
+    """Convert the JSON files of json_dir_path into a columnar corpus, written in corpus_dir_path."""
+    test_cases_by_year = collections.defaultdict(list)
+    for json_file_name in sorted(os.listdir(json_dir_path)):
+        with open(os.path.join(json_dir_path, json_file_name)) as json_file:
+            content = json.load(json_file)
+        scenario_json = content['scenario']
+        scenario = check(tax_benefit_system.Scenario.make_json_to_instance(tax_benefit_system = tax_benefit_system))(
+            scenario_json)
+        if 'year' in scenario_json:
+            year = scenario_json['year']
+        else:
+            year = datetime.datetime.strptime(scenario_json['date'], "%Y-%m-%d").year
+        for code in content['resultat_officiel']:
+            if code not in openfisca_name_by_code and code not in ignored_codes:
+                raise ValueError(u'"code" inconnu: {} in {}'.format(code, json_file_name))
+        test_cases_by_year[year].append((json_file_name, scenario.test_case, content['resultat_officiel']))
+
+    temporary_dir_path = tempfile.mkdtemp(dir = os.path.dirname(corpus_dir_path))
+    try:
+        for year, test_cases in test_cases_by_year.iteritems():
+            year_dir_path = os.path.join(temporary_dir_path, str(year))
+            os.mkdir(year_dir_path)
+            for file_name, table in iter_year_tables(tax_benefit_system, test_cases):
+                np.save(os.path.join(year_dir_path, file_name), table)
+        os.rename(temporary_dir_path, corpus_dir_path)
+    except Exception:
+        shutil.rmtree(temporary_dir_path, ignore_errors = True)
+        raise
+
+
+def get_corpus_dir_path(tax_benefit_system, json_dir_path = json_dir_path):
+    """Return the path of the corpus built from the current JSON files, in the cache directory.
+
+    The path is named after a hash of the content of the JSON files, of the source of the modules converting them
+    (this module and the ones of the scenario class) and of the columns of the tax-benefit system.
+    """
+    corpus_hash = hashlib.sha1()
+    for json_file_name in sorted(os.listdir(json_dir_path)):
+        corpus_hash.update(json_file_name)
+        with open(os.path.join(json_dir_path, json_file_name), 'rb') as json_file:
+            corpus_hash.update(json_file.read())
+    converters_modules = [sys.modules[__name__]]
+    for scenario_class in inspect.getmro(tax_benefit_system.Scenario):
+        module = inspect.getmodule(scenario_class)
+        if module not in converters_modules and module.__name__ != '__builtin__':
+            converters_modules.append(module)
+    for module in converters_modules:
+        corpus_hash.update(inspect.getsource(module))
+    for key_plural, entity_class in sorted(tax_benefit_system.entity_class_by_key_plural.iteritems()):
+        for variable_name, column in sorted(entity_class.column_by_name.iteritems()):
+            corpus_hash.update(repr((key_plural, variable_name, column.__class__.__name__, str(column.dtype),
+                column.default)))
+    cache_dir = default_cache_dir() or tempfile.gettempdir()
+    return os.path.join(cache_dir, 'json-corpus-{}'.format(corpus_hash.hexdigest()))
+
+
+def iter_year_tables(tax_benefit_system, test_cases):
+    """Iterate on the file names and structured arrays of the corpus of a year."""
+    column_by_name = tax_benefit_system.column_by_name
+    entity_class_by_key_plural = tax_benefit_system.entity_class_by_key_plural
+    members_by_key_plural = collections.defaultdict(list)
+    person_index_by_id = {}
+    persons_key_plural = tax_benefit_system.person_key_plural
+    for case_index, (json_file_name, test_case, resultat_officiel) in enumerate(test_cases):
+        assert len(test_case['foyers_fiscaux']) == 1, json_file_name
+        for key_plural, members in test_case.iteritems():
+            if key_plural == persons_key_plural:
+                for member in members:
+                    person_index_by_id[(case_index, member['id'])] = len(members_by_key_plural[key_plural])
+                    members_by_key_plural[key_plural].append(member)
+            else:
+                members_by_key_plural[key_plural].extend((case_index, member) for member in members)
+
+    persons = members_by_key_plural[persons_key_plural]
+    layout_array_by_name = {}
+    for key_plural, entity_class in entity_class_by_key_plural.iteritems():
+        if key_plural == persons_key_plural:
+            continue
+        entity = entity_class()
+        index_array = layout_array_by_name[entity.index_for_person_variable_name] = np.empty(len(persons),
+            dtype = column_by_name[entity.index_for_person_variable_name].dtype)
+        role_array = layout_array_by_name[entity.role_for_person_variable_name] = np.empty(len(persons),
+            dtype = column_by_name[entity.role_for_person_variable_name].dtype)
+        for member_index, (case_index, member) in enumerate(members_by_key_plural[key_plural]):
+            for role, person_id in entity.iter_member_persons_role_and_id(member):
+                person_index = person_index_by_id[(case_index, person_id)]
+                index_array[person_index] = member_index
+                role_array[person_index] = role
+        members_by_key_plural[key_plural] = [member for case_index, member in members_by_key_plural[key_plural]]
+
+    for key_plural, entity_class in entity_class_by_key_plural.iteritems():
+        members = members_by_key_plural[key_plural]
+        array_by_name = layout_array_by_name.copy() if key_plural == persons_key_plural else {}
+        for variable_name, column in entity_class.column_by_name.iteritems():
+            if variable_name in array_by_name or all(member.get(variable_name) is None for member in members):
+                continue
+            array_by_name[variable_name] = np.array(
+                [
+                    column.default if member.get(variable_name) is None else member[variable_name]
+                    for member in members
+                    ],
+                dtype = column.dtype,
+                )
+        if array_by_name:
+            # Note: The count of an entity without input variables is deduced from the indexes of persons.
+            yield key_plural + '.npy', to_structured_array(array_by_name, len(members))
+
+    codes = sorted(set(
+        code
+        for json_file_name, test_case, resultat_officiel in test_cases
+        for code in resultat_officiel
+        if code in openfisca_name_by_code
+        ))
+    results_array_by_name = dict(
+        (
+            str(code),
+            np.array(
+                [
+                    resultat_officiel[code]['value'] if code in resultat_officiel else np.nan
+                    for json_file_name, test_case, resultat_officiel in test_cases
+                    ],
+                dtype = float,
+                ),
+            )
+        for code in codes
+        )
+    results_array_by_name['json_file_name'] = np.array([
+        json_file_name.encode('utf-8')
+        for json_file_name, test_case, resultat_officiel in test_cases
+        ])
+    yield 'resultats.npy', to_structured_array(results_array_by_name, len(test_cases))
+
+
+def load_corpus(tax_benefit_system, json_dir_path = json_dir_path):
+    """Return the tables of the corpus, by file name and by year, building the corpus when needed.
+
+    The tables are memory-mapped.
+    """
+    corpus_dir_path = get_corpus_dir_path(tax_benefit_system, json_dir_path = json_dir_path)
+    if not os.path.isdir(corpus_dir_path):
+        log.info(u'Building corpus of JSON tests in {}'.format(corpus_dir_path))
+        if not os.path.isdir(os.path.dirname(corpus_dir_path)):
+            os.makedirs(os.path.dirname(corpus_dir_path))
+        build_corpus(tax_benefit_system, corpus_dir_path, json_dir_path = json_dir_path)
+    return dict(
+        (
+            int(year_str),
+            dict(
+                (os.path.splitext(file_name)[0], np.load(os.path.join(corpus_dir_path, year_str, file_name),
+                    mmap_mode = 'r'))
+                for file_name in os.listdir(os.path.join(corpus_dir_path, year_str))
+                ),
+            )
+        for year_str in os.listdir(corpus_dir_path)
+        )
+
+
+def to_structured_array(array_by_name, count):
+    table = np.empty(count, dtype = [
+        (str(name), array.dtype)
+        for name, array in sorted(array_by_name.iteritems())
+        ])
+    for name, array in array_by_name.iteritems():
+        table[str(name)] = array
+    return table
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from openfisca_france.tests.base import tax_benefit_system
+
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-v', '--verbose', action = 'store_true', default = False, help = "increase output verbosity")
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.DEBUG if args.verbose else logging.WARNING, stream = sys.stdout)
+
+    load_corpus(tax_benefit_system)
+    print(get_corpus_dir_path(tax_benefit_system))
+    sys.exit(0)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from __future__ import division
+
+import numpy as np
+
+from openfisca_core.tools import assert_near
+
+from openfisca_france.reforms import inversion_revenus
+
+
+def brut_to_net(brut):
+    plafond_securite_sociale = 3129
+    return brut - (
+        np.round(.22 * np.minimum(brut, plafond_securite_sociale), 2) +
+        np.round(.08 * np.maximum(brut - plafond_securite_sociale, 0), 2)
+        )
+
+
+def test_invert():
+    brut = np.linspace(0, 30000, 10001)
+    inverted_brut, report = inversion_revenus.invert(brut_to_net, brut_to_net(brut))
+    assert report.converged_count == report.count == len(brut), report
+    assert_near(inverted_brut, brut, absolute_error_margin = 0.1)
+
+
+def test_invert_flat_segment():
+    # Only the part of salaries above a threshold is taxed: the function is flat below it.
+    def brut_to_taxed(brut):
+        return .8 * np.maximum(brut - 500, 0)
+
+    taxed = np.linspace(0.01, 3000, 1001)
+    inverted_brut, report = inversion_revenus.invert(brut_to_taxed, taxed)
+    assert report.converged_count == report.count == len(taxed), report
+    assert_near(brut_to_taxed(inverted_brut), taxed, absolute_error_margin = 0.001)
+    inverted_brut, report = inversion_revenus.invert(lambda brut: np.maximum(brut - 500, 0), [10])
+    assert report.converged_count == 1, report
+    assert_near(inverted_brut, [510], absolute_error_margin = 0.001)
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_invert()
+    test_invert_flat_segment()
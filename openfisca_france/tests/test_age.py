@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+
+from openfisca_core import periods
+
+from . import base
+
+
+def new_simulation(**parent1):
+    return base.tax_benefit_system.new_scenario().init_single_entity(
+        period = 2014,
+        parent1 = parent1,
+        ).new_simulation(debug = True)
+
+
+def test_age_from_birth():
+    simulation = new_simulation(birth = datetime.date(1970, 1, 1))
+    assert simulation.calculate('age', periods.period('year', 2016)) == 46
+
+
+def test_age_given_wins_over_birth():
+    # When both are given, the age shifts from the given age, not from the birth date.
+    simulation = new_simulation(age = 40, birth = datetime.date(1970, 1, 1))
+    assert simulation.calculate('age', periods.period('year', 2016)) == 42
+
+
+def test_agem_given_wins_over_birth():
+    # When both are given, the age in months shifts from the given one, not from the birth date.
+    simulation = new_simulation(agem = 100, birth = datetime.date(1970, 1, 1))
+    assert simulation.calculate('agem', periods.period('month', '2014-06')) == 105
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_age_from_birth()
+    test_age_given_wins_over_birth()
+    test_agem_given_wins_over_birth()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from ..benchmarks.run import compare_with_baseline
+
+
+def new_results(peak_rss_kb, irpp_cold_duration, households_count = 1000):
+    return dict(
+        benchmarks = [
+            dict(
+                durations = dict(irpp = dict(cold = irpp_cold_duration, warm = 1.0)),
+                households_count = households_count,
+                peak_rss_kb = peak_rss_kb,
+                ),
+            ],
+        year = 2014,
+        )
+
+
+def test_failed_benchmark():
+    results = dict(benchmarks = [dict(error = 'process exited with code -9', households_count = 1000)], year = 2014)
+    regressions = compare_with_baseline(results, new_results(1000, 2.0))
+    assert len(regressions) == 1 and 'failed' in regressions[0], regressions
+
+
+def test_regression_above_tolerance():
+    regressions = compare_with_baseline(new_results(1000, 2.5), new_results(1000, 2.0), tolerance = 0.2)
+    assert len(regressions) == 1 and 'irpp (cold)' in regressions[0], regressions
+    regressions = compare_with_baseline(new_results(1300, 2.0), new_results(1000, 2.0), tolerance = 0.2)
+    assert len(regressions) == 1 and 'peak_rss_kb' in regressions[0], regressions
+
+
+def test_regression_within_tolerance():
+    assert compare_with_baseline(new_results(1100, 2.3), new_results(1000, 2.0), tolerance = 0.2) == []
+    # Improvements are never reported.
+    assert compare_with_baseline(new_results(500, 1.0), new_results(1000, 2.0), tolerance = 0.2) == []
+
+
+def test_size_missing_in_baseline():
+    assert compare_with_baseline(new_results(5000, 10.0, households_count = 10), new_results(1000, 2.0)) == []
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_failed_benchmark()
+    test_regression_above_tolerance()
+    test_regression_within_tolerance()
+    test_size_missing_in_baseline()
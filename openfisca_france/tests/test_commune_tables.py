@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+from ..model.commune_tables import load_taux_versement_transport_table, load_zone_apl_table
+
+
+def test_taux_versement_transport_table():
+    table = load_taux_versement_transport_table()
+    taux_aot, taux_smt = table.get(np.array(['34108', '75101', '99999', '']), ['taux', 'taux additionnel'])
+    assert taux_aot.tolist() == [.8, 2.7, 0, 0], taux_aot
+    assert taux_smt.tolist() == [.4, 0, 0, 0], taux_smt
+
+
+def test_zone_apl_table():
+    table = load_zone_apl_table()
+    zone_apl, = table.get(
+        np.array(['75114', '69381', '87191', '2A004', '99999', '']),
+        ['Zonage'],
+        default_by_column_name = dict(Zonage = 2),
+        )
+    assert zone_apl.tolist() == [1, 2, 3, 2, 2, 2], zone_apl
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_taux_versement_transport_table()
+    test_zone_apl_table()
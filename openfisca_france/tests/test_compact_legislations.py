@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import bisect
+
+from openfisca_core import legislations, periods
+
+from ..compact_legislations import CompactLegislationStore
+from . import base
+
+
+def check_same_dated_legislation(first_instant, instant):
+    first_dated_legislation_json = legislations.generate_dated_legislation_json(
+        base.tax_benefit_system.legislation_json, first_instant)
+    dated_legislation_json = legislations.generate_dated_legislation_json(
+        base.tax_benefit_system.legislation_json, instant)
+    del first_dated_legislation_json['instant']
+    del dated_legislation_json['instant']
+    assert first_dated_legislation_json == dated_legislation_json, \
+        "Legislation differs between {} and {}".format(first_instant, instant)
+
+
+def test_legislation_state():
+    store = CompactLegislationStore(base.tax_benefit_system.legislation_json)
+    store.get(periods.instant(2002))
+    first_instant_by_state = {}
+    for month in range(12 * 14):
+        instant = periods.instant(2002).offset(month, 'month')
+        state = bisect.bisect_right(store.change_instants_str, str(instant))
+        first_instant = first_instant_by_state.setdefault(state, instant)
+        if first_instant != instant:
+            yield check_same_dated_legislation, first_instant, instant
+
+
+def test_store_size():
+    store = CompactLegislationStore(base.tax_benefit_system.legislation_json, max_size = 2)
+    compact_legislation = store.get(periods.instant(2014))
+    assert store.get(periods.instant('2014-01-02')) is compact_legislation
+    store.get(periods.instant(2010))
+    store.get(periods.instant(2006))
+    assert len(store.compact_legislation_by_state) == 2
+    assert store.get(periods.instant(2014)) is not compact_legislation
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    for function_and_arguments in test_legislation_state():
+        function_and_arguments[0](*function_and_arguments[1:])
+    test_store_size()
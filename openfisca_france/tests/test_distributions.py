@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+
+from openfisca_france.model.distributions import WeightedDistribution
+
+
+def test_quantiles():
+    # Equal weights: the sorted values are at positions 1/8, 3/8, 5/8 & 7/8.
+    distribution = WeightedDistribution(np.array([4., 2., 1., 3.]))
+    assert np.allclose(distribution.quantiles([0, .125, .25, .5, .875, 1]), [1, 1, 1.5, 2.5, 4, 4])
+    # Weights 1, 1 & 2 for the sorted values: they are at positions 1/8, 3/8 & 3/4.
+    distribution = WeightedDistribution(np.array([3., 1., 2.]), np.array([2., 1., 1.]))
+    assert np.allclose(distribution.quantiles([0, .1, .25, .5, .9, 1]), [1, 1, 1.5, 2 + 1 / 3., 3, 3])
+
+
+def test_quantile_labels():
+    # With 10 equal weights, the sorted values are at positions 0.05, 0.15, ... and the deciles fall between them.
+    assert WeightedDistribution(np.arange(1, 11.)).quantile_labels(10).tolist() == range(1, 11)
+    random_state = np.random.RandomState(2)
+    values = np.round(random_state.lognormal(10, 1, 1000))
+    distribution = WeightedDistribution(values, random_state.rand(1000))
+    labels = distribution.quantile_labels(10)
+    assert labels.min() == 1
+    assert labels.max() == 10
+    assert labels[values.argmax()] == 10
+    assert (np.diff(labels[np.argsort(values)]) >= 0).all()
+    # Equal values always get the same label.
+    values[:300] = 0
+    labels = WeightedDistribution(values).quantile_labels(10)
+    assert len(set(labels[values == 0])) == 1
+
+
+def test_gini_and_poverty_rate():
+    assert abs(WeightedDistribution(np.ones(10) * 3).gini()) < 1e-12
+    values = np.arange(1, 101.)
+    gini = np.abs(values[:, None] - values[None, :]).sum() / (2 * len(values) ** 2 * values.mean())
+    assert abs(WeightedDistribution(values).gini() - gini) < 1e-12
+    distribution = WeightedDistribution(np.array([1., 2., 3., 4.]), np.array([1., 1., 1., 5.]))
+    assert distribution.poverty_rate(1) == 0
+    assert distribution.poverty_rate(3.5) == 3 / 8.
+    assert distribution.poverty_rate(10) == 1
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_quantiles()
+    test_quantile_labels()
+    test_gini_and_poverty_rate()
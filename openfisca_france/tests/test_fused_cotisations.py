@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from ..model.base import CAT
+from . import base
+
+
+class FusedTaxBenefitSystem(base.TaxBenefitSystem):
+    fused_cotisations = True
+
+
+fused_tax_benefit_system = None
+
+
+def check_fused_cotisations(year, type_sal):
+    global fused_tax_benefit_system
+    if fused_tax_benefit_system is None:
+        fused_tax_benefit_system = FusedTaxBenefitSystem()
+    scenario_arguments = dict(
+        axes = [
+            dict(
+                count = 100,
+                max = 20000,
+                min = 0,
+                name = 'salaire_de_base',
+                ),
+            ],
+        period = year,
+        parent1 = dict(
+            effectif_entreprise = 25,
+            type_sal = type_sal,
+            ),
+        )
+    simulation = base.tax_benefit_system.new_scenario().init_single_entity(**scenario_arguments).new_simulation()
+    fused_simulation = fused_tax_benefit_system.new_scenario().init_single_entity(
+        **scenario_arguments).new_simulation()
+    for variable_name in ('cotisations_employeur', 'cotisations_salariales'):
+        assert (simulation.calculate(variable_name) == fused_simulation.calculate(variable_name)).all(), \
+            "Fused {} differs for {} in {}".format(variable_name, type_sal, year)
+
+
+def test_fused_cotisations():
+    for year in (2012, 2014):
+        for type_sal_name, type_sal in CAT:
+            yield check_fused_cotisations, year, type_sal
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    for function_and_arguments in test_fused_cotisations():
+        function_and_arguments[0](*function_and_arguments[1:])
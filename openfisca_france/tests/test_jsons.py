@@ -27,109 +27,75 @@
 """Teste tous les fichiers .json créés par un script"""
 
 
-import datetime
-import json
 import logging
-import os
 import sys
 
-from biryani.baseconv import check
-from nose.tools import assert_equal
+import numpy as np
+from openfisca_core import periods
 
 from .base import assert_near, tax_benefit_system
+from .json_corpus import load_corpus, openfisca_name_by_code
 
 
-json_dir_path = os.path.join(os.path.dirname(__file__), 'json')
 log = logging.getLogger(__name__)
-
-
-def check_variable(args):
-    scenario = args['scenario']
-    simulation = scenario.new_simulation(debug = True)
-    code = args['code']
-    openfisca_value = None
-    if code == 'IAVIM':
-        openfisca_name = 'iai'
-    elif code == 'IDEC':
-        openfisca_name = 'decote'
-    elif code == 'IDRS2':
-        openfisca_name = 'ir_plaf_qf'
-    elif code == 'IINETIR' or code == 'IRESTIR':
-        openfisca_name = 'irpp'
-    elif code == 'ITRED':
-        openfisca_name = 'reductions'
-    elif code == 'NBPT' or code == 'NBP':
-        openfisca_name = 'nbptr'
-    elif code == 'PPETOT':
-        openfisca_name = 'ppe'
-    elif code == 'REVKIRE':
-        openfisca_name = 'rfr'
-    elif code == 'RNICOL':
-        openfisca_name = 'rni'
-    elif code == 'RRBG':
-        openfisca_name = 'rbg'
-    # TODO: Checker si le montant net CSG/CRDS correspond à NAPCS, NAPRDS, checker IINET
-    elif code == 'TOTPAC':
-        openfisca_name = "len(args['totpac'] or [])"
-        openfisca_value = len(args['totpac'] or [])  # Codes ignorés pour la comparaison
-    elif code in ('AVFISCOPTER', 'BCSG', 'BPRS', 'BRDS', 'CIADCRE', 'CICA', 'CICORSE', 'CIDEPENV', 'CIDEVDUR',
-            'CIGARD', 'CIGE', 'CIHABPRIN', 'CIMOBIL', 'CIPERT', 'CIPRETUD', 'RILMIA', 'IINET',
-            'CIRCM', 'CIRELANCE', 'CITEC', 'IAVF2', 'I2DH', 'IREST', 'IRESTIR', 'RILMIH',
-            'IRETS', 'ITRED', 'NAPCR', 'NAPCRP', 'NAPCS', 'RRIRENOV', 'RCELHL', 'RLOCIDEFG',
-            'NAPPS', 'NAPRD', 'PERPPLAFTC', 'PERPPLAFTV', 'RAH', 'RCEL', 'RCELREPGX', 'RCELREPGW', 'RDONS',
-            'RCELHJK', 'RCELREPHR', 'RCELRREDLA', 'RRESIVIEU', 'RMEUBLE', 'RREDMEUB', 'RSOCREPR', 'RRPRESCOMP',
-            'RCONS', 'RPECHE', 'RCELREPGS', 'RCELREPGU', 'RCELREPGT', 'RPATNAT', 'RPATNATOT', 'RPRESCOMPREP',
-            'RDIFAGRI', 'REI', 'RFOR', 'RTELEIR', 'RTOURREP', 'RTOUREPA', 'RTOUHOTR', 'RRESINEUV',
-            'RFORET', 'RHEBE', 'RILMIC', 'RILMIB', 'RRESIMEUB', 'RREPMEU', 'RREPNPRO', 'TEFF',
-            'RPROREP', 'RINVRED', 'RREDREP', 'RILMIX', 'PERPPLAFTP',
-            'RILMIZ', 'RILMJI', 'RILMJS', 'RCODJT', 'RCODJU', 'RCODJV', 'RCODJW', 'RCODJX',
-            'RIDOMENT', 'RIDOMPROE1', 'RIDOMPROE2', 'RLOGDOM', 'RREPA', 'RDUFLOGIH', 'IPROP',
-            'RIDOMPROE3', 'RIDOMPROE4', 'RIDOMPROE5', 'RTITPRISE', 'RRDOM', 'RINVDOMTOMLG', 'RCOTFOR',
-            'RNI', 'RNOUV', 'RRESTIMO', 'RTOUR', 'RCELRREDLC', 'RCELRREDLB', 'RCELNBGL', 'RCELFD',
-            'RCELLIER', 'RCELHNO', 'RCELHM', 'RCELHR', 'RCELRREDLS', 'RCELRREDLZ', 'RCELFABC',
-            'RCELREPHS', 'RCELNBGL', 'RCELCOM', 'RCELNQ', 'RCELRREDLD', 'RCELRREDLE', 'RCELRREDLF',
-            'RTOURHOT', 'RTOURES', 'RTOURNEUF', 'RCELREPHR', 'RCINE', 'RFCPI', 'RINNO', 'RAA',
-            'RCELREPGJ', 'RCELREPGK', 'RCELREPGL', 'RCELREPGP', 'RSOUFIP', 'RCODELOP',
-            'RTOURTRA', 'TXMARJ', 'RSURV', 'RAIDE', 'RCELREPHA', 'RCELREPHB', 'RCELJP', 'RCELJOQR',
-            'RCELREPHD', 'RCELREPHE', 'RCELREPHF', 'RCELREPHH', 'RCEL2012', 'RCELJBGL', 'RCOLENT',
-            'RCELREPHT', 'RCELREPHU', 'RCELREPHV', 'RCELREPHW', 'RCELREPHX', 'RCELREPHZ', 'RCELRRED09', 'TXMOYIMP',
-            'RFIPC', 'RILMJX', 'RILMJV', 'RCELREPGV', 'RCELRREDLM', 'RCELRREDMG', 'RILMJW', 'RCELREPHG'):
-        return
+simulation_by_year = {}
+
+
+def check_code(year, tables, code):
+    """Compare in bulk the official values of a code with the ones computed by OpenFisca for all the cases of a year."""
+    resultats = tables['resultats']
+    expected = np.array(resultats[code])
+    has_value = ~np.isnan(expected)
+    simulation = get_simulation(year, tables)
+    openfisca_name = openfisca_name_by_code[code]
+    if openfisca_name is None:
+        # TOTPAC: Number of "personnes à charge" of each foyer fiscal
+        quifoy = simulation.calculate('quifoy')
+        openfisca_array = np.bincount(simulation.calculate('idfoy')[quifoy >= 2],
+            minlength = len(expected)).astype(float)
     else:
-        raise ValueError(u'"code" inconnu')
-    log.info(u'Comparing impôts.gouv.fr variable {} with OpenFisca variable {}'.format(code, openfisca_name))
-    log.info(u'Scenario:\n{}'.format(json.dumps(scenario.to_json(), encoding = 'utf_8', ensure_ascii = False,
-        indent = 2)))
-    if openfisca_value is None:
         openfisca_array = simulation.calculate(openfisca_name)
-        assert_equal(openfisca_array.shape, (1,))
-        openfisca_value = openfisca_array[0]
-    assert_near(abs(openfisca_value), args['field']['value'], absolute_error_margin = 2)
+    log.info(u'Comparing impôts.gouv.fr variable {} with OpenFisca variable {} for {} cases of {}'.format(code,
+        openfisca_name, has_value.sum(), year))
+    failed = has_value & (np.abs(np.abs(openfisca_array) - np.where(has_value, expected, 0)) > 2)
+    failed_json_files_name = [
+        json_file_name.decode('utf-8')
+        for json_file_name in resultats['json_file_name'][failed]
+        ]
+    assert_near(np.abs(openfisca_array[has_value]), expected[has_value], absolute_error_margin = 2,
+        message = u'{} ({}) differs for {}: '.format(code, openfisca_name, u', '.join(failed_json_files_name)))
+
+
+def get_simulation(year, tables):
+    """Return the simulation of all the cases of a year, built from the tables of the corpus."""
+    simulation = simulation_by_year.get(year)
+    if simulation is None:
+        period = periods.period('year', year)
+        scenario = tax_benefit_system.Scenario()
+        scenario.period = period
+        scenario.tax_benefit_system = tax_benefit_system
+        scenario.input_variables = dict(
+            (variable_name, {period: np.array(table[variable_name])})
+            for key_plural, table in tables.iteritems()
+            if key_plural in tax_benefit_system.entity_class_by_key_plural
+            for variable_name in table.dtype.names
+            )
+        simulation = simulation_by_year[year] = scenario.new_simulation()
+        for entity in simulation.entity_by_key_plural.itervalues():
+            if not entity.is_persons_entity:
+                entity.roles_count = int(simulation.calculate(entity.role_for_person_variable_name).max()) + 1
+    return simulation
 
 
 def test_jsons():
-    for json_file_name in os.listdir(json_dir_path):
-        with open(os.path.join(json_dir_path, json_file_name)) as json_file:
-            content = json.load(json_file)
-        scenario_json = content['scenario']
-        scenario = check(tax_benefit_system.Scenario.make_json_to_instance(tax_benefit_system = tax_benefit_system))(
-            scenario_json)
-        if 'year' in scenario_json:
-            year = scenario_json['year']
-        else:
-            date = datetime.datetime.strptime(scenario_json['date'], "%Y-%m-%d")
-            year = date.year
-        totpac = scenario.test_case['foyers_fiscaux'].values()[0].get('personnes_a_charge')
-        for code, field in content['resultat_officiel'].iteritems():
-            yield check_variable, {
-                'code': code,
-                'field': field,
-                'json_file_name': json_file_name,
-                'scenario': scenario,
-                'totpac': totpac,
-                'year': year,
-                }
+    for year, tables in sorted(load_corpus(tax_benefit_system).iteritems()):
+        for code in tables['resultats'].dtype.names:
+            if code != 'json_file_name':
+                yield check_code, year, tables, code
 
 
 if __name__ == "__main__":
-    sys.exit(test_jsons())
+    logging.basicConfig(level = logging.INFO, stream = sys.stdout)
+    for function_and_arguments in test_jsons():
+        function_and_arguments[0](*function_and_arguments[1:])
+    sys.exit(0)
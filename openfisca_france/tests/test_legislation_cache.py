@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import shutil
+import tempfile
+
+from . import base
+
+
+def test_legislation_cache():
+    cache_dir = tempfile.mkdtemp()
+    preprocessings = []
+
+    def preprocess_legislation(legislation_json):
+        preprocessings.append(legislation_json)
+        base.TaxBenefitSystem.preprocess_legislation(legislation_json)
+
+    def preprocess_legislation_with_description(legislation_json):
+        base.TaxBenefitSystem.preprocess_legislation(legislation_json)
+        legislation_json['description'] = u'Preprocessed differently'
+
+    try:
+        class CachedTaxBenefitSystem(base.TaxBenefitSystem):
+            legislation_cache_dir = cache_dir
+            preprocess_legislation = staticmethod(preprocess_legislation)
+
+        cold_tax_benefit_system = CachedTaxBenefitSystem()
+        assert len(os.listdir(cache_dir)) == 1
+        assert len(preprocessings) == 1
+
+        # Legislation is not preprocessed again when it is read from cache.
+        warm_tax_benefit_system = CachedTaxBenefitSystem()
+        assert len(preprocessings) == 1
+        assert warm_tax_benefit_system.legislation_json == cold_tax_benefit_system.legislation_json
+
+        # A different preprocessing never reuses the cached legislation.
+        class OtherTaxBenefitSystem(CachedTaxBenefitSystem):
+            preprocess_legislation = staticmethod(preprocess_legislation_with_description)
+
+        other_tax_benefit_system = OtherTaxBenefitSystem()
+        assert len(os.listdir(cache_dir)) == 2
+        assert other_tax_benefit_system.legislation_json['description'] == u'Preprocessed differently'
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_legislation_cache()
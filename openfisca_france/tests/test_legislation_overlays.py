@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from openfisca_core import periods
+from openfisca_france import legislation_overlays
+from openfisca_france.reforms import plf2015
+
+from . import base
+
+
+def test_update_legislation():
+    legislation_json = base.tax_benefit_system.legislation_json
+    brackets = legislation_json['children']['ir']['children']['bareme']['brackets']
+    rate = brackets[1]['rate']
+    new_legislation_json = legislation_overlays.update_legislation(
+        legislation_json = legislation_json,
+        path = ('children', 'ir', 'children', 'bareme', 'brackets', 1, 'rate'),
+        period = periods.period('year', 2014),
+        value = 0,
+        )
+    # The reference legislation is left unchanged, and the variant shares every node out of the updated path.
+    assert legislation_json['children']['ir']['children']['bareme']['brackets'][1]['rate'] is rate
+    new_brackets = new_legislation_json['children']['ir']['children']['bareme']['brackets']
+    assert new_brackets[1]['rate'] is not rate
+    assert new_brackets[0] is brackets[0]
+    assert new_legislation_json['children']['cotsoc'] is legislation_json['children']['cotsoc']
+
+
+def test_plf2015():
+    legislation_json = base.tax_benefit_system.legislation_json
+    reform = plf2015.build_reform(base.tax_benefit_system)
+    assert 'plf2015' not in legislation_json['children']
+    assert 'plf2015' in reform.legislation_json['children']
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_update_legislation()
+    test_plf2015()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import shutil
+import tempfile
+
+from openfisca_france import profiling
+
+from . import base
+
+
+def test_profile():
+    simulation = base.tax_benefit_system.new_scenario().init_single_entity(
+        period = 2014,
+        parent1 = dict(
+            birth = 1970,
+            salaire_de_base = 30000,
+            ),
+        ).new_simulation()
+    profiler = profiling.profile(simulation)
+    revdisp = simulation.calculate('revdisp')
+    assert (simulation.calculate('revdisp') == revdisp).all()
+
+    statistics_by_name = dict(
+        (statistics.variable_name, statistics)
+        for statistics in profiler.iter_statistics()
+        )
+    revdisp_statistics = statistics_by_name['revdisp']
+    assert revdisp_statistics.calls_count == 2
+    assert revdisp_statistics.computations_count == 1
+    assert revdisp_statistics.array_size == 1
+    assert 'irpp' in statistics_by_name
+    total_self_time = sum(statistics.self_time for statistics in statistics_by_name.itervalues())
+    assert total_self_time <= revdisp_statistics.total_time * 1.001
+
+    temporary_dir = tempfile.mkdtemp()
+    try:
+        collapsed_stacks_file_path = os.path.join(temporary_dir, 'revdisp.txt')
+        profiler.write_collapsed_stacks(collapsed_stacks_file_path)
+        with open(collapsed_stacks_file_path) as collapsed_stacks_file:
+            stacks = [line.rsplit(' ', 1)[0] for line in collapsed_stacks_file]
+        assert 'revdisp' in stacks
+        assert any(stack.startswith('revdisp;') and stack.endswith(';irpp') for stack in stacks)
+    finally:
+        shutil.rmtree(temporary_dir)
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_profile()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import itertools
+
+from openfisca_france import rattachement
+
+from . import base
+
+
+def define_scenario(children_count):
+    scenario = base.tax_benefit_system.new_scenario().init_single_entity(
+        parent1 = dict(
+            activite = u'Actif occupé',
+            birth = 1973,
+            sali = 90000,
+            statmarit = u'Célibataire',
+            ),
+        enfants = [
+            dict(
+                activite = u'Étudiant, élève',
+                birth = '{}-02-01'.format(1990 + index),
+                sali = 5000 * index,
+                )
+            for index in range(children_count)
+            ],
+        period = 2014,
+        )
+    scenario.suggest()
+    return scenario
+
+
+def test_optimize():
+    scenario = define_scenario(3)
+    rattachements_possibles = rattachement.get_rattachements_possibles(scenario)
+    assert len(rattachements_possibles) == 3, rattachements_possibles
+    configuration, irpp = rattachement.optimize(scenario)
+    # Compare with one simulation per configuration.
+    for attachments in itertools.product((True, False), repeat = len(rattachements_possibles)):
+        configuration_scenario = rattachement.new_configurations_scenario(scenario, rattachements_possibles,
+            [attachments])
+        assert configuration_scenario.new_simulation().calculate('irpp').sum() <= irpp + 0.01
+    # Local search can't do worse than the initial configuration.
+    local_configuration, local_irpp = rattachement.optimize(scenario, max_exhaustive_count = 0)
+    assert local_irpp <= irpp + 0.01
+    assert local_irpp >= rattachement.evaluate_configurations(scenario, rattachements_possibles,
+        [[True] * len(rattachements_possibles)])[0] - 0.01
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_optimize()
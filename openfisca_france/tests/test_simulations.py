@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import copy
+import importlib
+import os
+
+from openfisca_france import simulations
+from openfisca_france.reforms import plf2015
+
+from . import base, test_yaml
+
+
+# Reforms of openfisca_france.reforms (ir_2007 is left out, because its module doesn't compile).
+reforms_name = [
+    'allocations_familiales_imposables',
+    'cesthra_invalidee',
+    'inversion_revenus',
+    'ir_reduc',
+    'plf2015',
+    'plfr2014',
+    'reform_cd',
+    'trannoy_wasmer',
+    ]
+reform_by_name = {}
+tests_dir_path = os.path.dirname(os.path.abspath(__file__))
+# Fixed sample of YAML tests used by the default run: the first tests of a few representative files. The whole YAML
+# suite is used when this module is run as a script.
+yaml_sample_files_path = [
+    os.path.join('fiches_de_paie', 'salarie_ipp_2014-11.yaml'),
+    os.path.join('formulas', 'af.yaml'),
+    os.path.join('formulas', 'irpp.yaml'),
+    os.path.join('formulas', 'rsa_couple.yaml'),
+    os.path.join('mes-aides.gouv.fr', 'test_mes_aides_53d21ee5159e330200810b87.yaml'),
+    ]
+yaml_sample_tests_count_by_file = 5
+
+
+def check_calculate_with_reference(reform_name, name, period_str, test):
+    reform = reform_by_name.get(reform_name)
+    if reform is None:
+        reform_module = importlib.import_module('openfisca_france.reforms.{}'.format(reform_name))
+        reform = reform_by_name[reform_name] = reform_module.build_reform(base.tax_benefit_system)
+    scenario = copy.copy(test['scenario'])
+    scenario.tax_benefit_system = reform
+    scenario.suggest()
+    variables_name = [
+        variable_name
+        for variable_name, expected_value in test['output_variables'].iteritems()
+        if not isinstance(expected_value, dict)
+        ]
+    reference_array_by_name, reform_array_by_name, delta_by_name = simulations.calculate_with_reference(scenario,
+        variables_name)
+    # Compare with 2 independent simulations.
+    reference_simulation = scenario.new_simulation(reference = True)
+    reform_simulation = scenario.new_simulation()
+    for variable_name in variables_name:
+        base.assert_near(reference_array_by_name[variable_name], reference_simulation.calculate(variable_name),
+            absolute_error_margin = 0.01, message = u'{} (reference): '.format(variable_name))
+        base.assert_near(reform_array_by_name[variable_name], reform_simulation.calculate(variable_name),
+            absolute_error_margin = 0.01, message = u'{} ({}): '.format(variable_name, reform_name))
+
+
+def iter_yaml_sample_tests(exhaustive = False):
+    """Iterate on the options, name, period and content of the YAML tests of the sample (or of every YAML test)."""
+    for file_path, options in test_yaml.iter_yaml_files():
+        if not exhaustive and os.path.relpath(file_path, tests_dir_path) not in yaml_sample_files_path:
+            continue
+        for index, (checker, name, period_str, test, force) in enumerate(test_yaml.iter_yaml_file_tests(file_path,
+                options)):
+            if not exhaustive and index >= yaml_sample_tests_count_by_file:
+                break
+            yield options, name, period_str, test
+
+
+def new_simulation(salaire_de_base):
+    return base.tax_benefit_system.new_scenario().init_single_entity(
+        period = 2014,
+        parent1 = dict(
+            birth = 1970,
+            salaire_de_base = salaire_de_base,
+            ),
+        ).new_simulation()
+
+
+def check_traced_dependencies(name, period_str, test):
+    scenario = test['scenario']
+    scenario.suggest()
+    simulation = scenario.new_simulation(trace = True)
+    for variable_name, expected_value in (test.get(u'output_variables') or {}).iteritems():
+        for requested_period in (expected_value.iterkeys() if isinstance(expected_value, dict) else [None]):
+            simulation.calculate(variable_name, requested_period, accept_other_period = True)
+    tax_benefit_system = simulation.tax_benefit_system
+    dependents_by_name = simulations.get_dependents_by_name(tax_benefit_system)
+    for (variable_name, period), step in simulation.traceback.iteritems():
+        if variable_name in tax_benefit_system.unresolved_variables_name:
+            continue
+        for input_variable_name, input_period in step.get('input_variables_infos', []):
+            assert input_variable_name == variable_name \
+                or variable_name in dependents_by_name.get(input_variable_name, ()), \
+                u'Dependency of {} on {} is missing from the static graph'.format(variable_name,
+                    input_variable_name).encode('utf-8')
+
+
+def test_calculate_with_reference():
+    reform = plf2015.build_reform(base.tax_benefit_system)
+    reform_dependents = simulations.get_reform_dependents(reform)
+    for variable_name in ('decote', 'irpp'):
+        assert variable_name in reform_dependents, variable_name
+    assert 'salaire_net' not in reform_dependents
+    scenario = reform.new_scenario().init_single_entity(
+        period = 2014,
+        parent1 = dict(
+            birth = 1970,
+            salaire_de_base = 20000,
+            ),
+        )
+    reference_array_by_name, reform_array_by_name, delta_by_name = simulations.calculate_with_reference(scenario,
+        ['irpp', 'revdisp'])
+    for variable_name in ('irpp', 'revdisp'):
+        base.assert_near(reference_array_by_name[variable_name],
+            scenario.new_simulation(reference = True).calculate(variable_name), absolute_error_margin = 0.01)
+        base.assert_near(reform_array_by_name[variable_name], scenario.new_simulation().calculate(variable_name),
+            absolute_error_margin = 0.01)
+        base.assert_near(delta_by_name[variable_name],
+            reform_array_by_name[variable_name] - reference_array_by_name[variable_name], absolute_error_margin = 0.01)
+
+
+def test_calculate_with_reference_on_yaml_tests(exhaustive = False):
+    """Check the reform and reference values of reforms against 2 independent simulations, on YAML tests.
+
+    By default, each test of the sample is checked with a single reform, in turn. When exhaustive, every YAML test is
+    checked with every reform.
+    """
+    tests = [
+        (name, period_str, test)
+        for options, name, period_str, test in iter_yaml_sample_tests(exhaustive = exhaustive)
+        if not options['accept_other_period'] and test.get('output_variables') and
+        test['scenario'].tax_benefit_system is base.tax_benefit_system
+        ]
+    for index, (name, period_str, test) in enumerate(tests):
+        for reform_name in (reforms_name if exhaustive else [reforms_name[index % len(reforms_name)]]):
+            yield check_calculate_with_reference, reform_name, name, period_str, test
+
+
+def test_dependents():
+    dependents = simulations.get_dependents(base.tax_benefit_system, ['salaire_de_base'])
+    for variable_name in ('cotisations_salariales', 'sal', 'salaire_net'):
+        assert variable_name in dependents, variable_name
+    assert 'age' not in dependents
+
+
+def test_fork():
+    simulation = new_simulation(20000)
+    salaire_net = simulation.calculate('salaire_net')
+    age = simulation.calculate('age')
+    forked_simulation = simulations.fork(simulation, salaire_de_base = salaire_net * 0 + 30000)
+    base.assert_near(forked_simulation.calculate('salaire_net'), new_simulation(30000).calculate('salaire_net'),
+        absolute_error_margin = 0.01)
+    # Arrays independent from the changed inputs are shared, and the original simulation is left unchanged.
+    assert forked_simulation.calculate('age') is age
+    assert simulation.calculate('salaire_net') is salaire_net
+
+
+def test_fork_keeps_inputs():
+    simulation = base.tax_benefit_system.new_scenario().init_single_entity(
+        period = 2014,
+        parent1 = dict(
+            birth = 1970,
+            sal = 15000,
+            salaire_de_base = 20000,
+            ),
+        ).new_simulation()
+    salaire_net = simulation.calculate('salaire_net')
+    forked_simulation = simulations.fork(simulation, salaire_de_base = salaire_net * 0 + 30000)
+    # sal has a formula using salaire_de_base, but it was given as input.
+    base.assert_near(forked_simulation.calculate('sal'), 15000, absolute_error_margin = 0.01)
+
+
+def test_traced_dependencies(exhaustive = False):
+    """Check the static graph of dependencies against the dependencies traced while running the YAML tests.
+
+    By default, only the sample of YAML tests is traced.
+    """
+    for options, name, period_str, test in iter_yaml_sample_tests(exhaustive = exhaustive):
+        yield check_traced_dependencies, name, period_str, test
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_calculate_with_reference()
+    for function, reform_name, name, period_str, test in test_calculate_with_reference_on_yaml_tests(
+            exhaustive = True):
+        function(reform_name, name, period_str, test)
+    test_dependents()
+    test_fork()
+    test_fork_keeps_inputs()
+    for function, name, period_str, test in test_traced_dependencies(exhaustive = True):
+        function(name, period_str, test)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+from openfisca_core import reforms
+
+from ..model.prelevements_obligatoires.prelevements_sociaux import taxes_salaires_main_oeuvre
+from ..model.prestations import aides_logement
+from ..surveys import SurveyScenario
+from . import base
+
+
+def test_compute_by_chunk_prefills_commune_tables():
+    # The scenario runs on a reform, like the ones of adapt_to_survey.
+    Reform = reforms.make_reform(
+        name = u'Survey test',
+        reference = base.tax_benefit_system,
+        )
+    survey_scenario = SurveyScenario()
+    survey_scenario.input_array_by_name = dict(
+        idfam = np.array([0, 1, 1]),
+        idfoy = np.array([0, 1, 1]),
+        idmen = np.array([0, 1, 1]),
+        quifam = np.array([0, 0, 1]),
+        quifoy = np.array([0, 0, 1]),
+        quimen = np.array([0, 0, 1]),
+        salaire_de_base = np.array([20000., 30000., 0.]),
+        )
+    survey_scenario.tax_benefit_system = Reform()
+    survey_scenario.year = 2014
+    aides_logement.zone_apl_table = None
+    taxes_salaires_main_oeuvre.taux_versement_transport_table = None
+    survey_scenario.compute_by_chunk(['salaire_net'], households_count = 1, processes = 2)
+    # Chunks are computed in the processes of the pool, so the tables can only have been loaded by the parent, before
+    # forking them.
+    assert aides_logement.zone_apl_table is not None
+    assert taxes_salaires_main_oeuvre.taux_versement_transport_table is not None
+    assert survey_scenario.output_array_by_name['salaire_net'].shape == (3,)
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_compute_by_chunk_prefills_commune_tables()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+
+# OpenFisca -- A versatile microsimulation software
+# By: OpenFisca Team <contact@openfisca.fr>
+#
+# Copyright (C) 2011, 2012, 2013, 2014, 2015 OpenFisca Team
+# https://github.com/openfisca
+#
+# This file is part of OpenFisca.
+#
+# OpenFisca is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# OpenFisca is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from openfisca_core import periods, reforms
+from openfisca_france import legislation_overlays, sweeps
+
+from . import base
+
+
+def new_simulation(tax_benefit_system, period):
+    return tax_benefit_system.new_scenario().init_single_entity(
+        axes = [
+            dict(
+                count = 3,
+                max = 100000,
+                min = 0,
+                name = 'sal',
+                ),
+            ],
+        period = period,
+        parent1 = dict(birth = 1970),
+        ).new_simulation()
+
+
+def test_sweep():
+    path = ('children', 'ir', 'children', 'bareme', 'brackets', 1, 'rate')
+    period = periods.period('year', 2014)
+    values = [0.055, 0.14]
+    sums = sweeps.sweep(new_simulation(base.tax_benefit_system, period), path, values, ['irpp', 'salaire_net'],
+        processes = 1)
+    for value in values:
+        Reform = reforms.make_reform(
+            legislation_json = legislation_overlays.update_legislation(
+                legislation_json = base.tax_benefit_system.legislation_json,
+                path = path,
+                period = period,
+                value = value,
+                ),
+            name = u'Sweep test',
+            reference = base.tax_benefit_system,
+            )
+        reform_simulation = new_simulation(Reform(), period)
+        for variable_name in ('irpp', 'salaire_net'):
+            base.assert_near(sums[value][variable_name], reform_simulation.calculate(variable_name).sum(),
+                absolute_error_margin = 0.01)
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_sweep()
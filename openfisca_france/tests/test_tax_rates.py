@@ -24,6 +24,7 @@
 
 
 from openfisca_core.rates import average_rate, marginal_rate
+from openfisca_france import rates
 from openfisca_france.tests import base
 
 
@@ -67,9 +68,50 @@ def test_marginal_tax_rate():
         ) == 0).all()
 
 
+def test_marginal_rates():
+    year = 2013
+
+    def new_simulation(sal):
+        return base.tax_benefit_system.new_scenario().init_single_entity(
+            axes = [
+                dict(
+                    count = 5,
+                    name = 'sal',
+                    max = 100000 + sal,
+                    min = sal,
+                    ),
+                ],
+            period = year,
+            parent1 = dict(agem = 40 * 12 + 6),
+            ).new_simulation()
+
+    simulation = new_simulation(0)
+    marginal_rates = rates.marginal_rates(simulation, 'revdisp', 'sal', delta = 100)
+    # Compare with a second simulation where the salary is increased.
+    revdisp = simulation.calculate('revdisp')
+    increased_revdisp = new_simulation(100).calculate('revdisp')
+    base.assert_near(marginal_rates, 1 - (increased_revdisp - revdisp) / 100, absolute_error_margin = 0.001)
+
+
+def test_marginal_rates_keeps_other_periods():
+    simulation = base.tax_benefit_system.new_scenario().init_single_entity(
+        period = 2014,
+        parent1 = dict(
+            agem = 40 * 12 + 6,
+            sal = {'2012': 20000, '2014': 30000},
+            ),
+        ).new_simulation()
+    # The base ressource of prestations familiales reads the salary of 2012, which must not change when the salary of
+    # 2014 is increased.
+    marginal_rates = rates.marginal_rates(simulation, 'br_pf_i', 'sal', delta = 100)
+    base.assert_near(marginal_rates, 1, absolute_error_margin = 0.001)
+
+
 if __name__ == '__main__':
     import logging
     import sys
     logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
     test_marginal_tax_rate()
+    test_marginal_rates()
+    test_marginal_rates_keeps_other_periods()
     test_average_tax_rate()
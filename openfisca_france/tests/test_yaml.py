@@ -30,17 +30,23 @@
 from __future__ import division
 
 import collections
+import json
 import logging
+import multiprocessing
 import os
+import time
+import traceback
 
 import numpy as np
 from openfisca_core import conv, scenarios
 from openfisca_core.tools import assert_near
+from openfisca_france import simulations
 from openfisca_france.tests.base import tax_benefit_system
 import yaml
 
 
 log = logging.getLogger(__name__)
+population_dependents_by_tax_benefit_system = {}
 options_by_dir = {
     os.path.abspath(os.path.join(os.path.dirname(__file__), 'calculateur_impots')): dict(
         accept_other_period = False,
@@ -66,11 +72,164 @@ options_by_dir = {
         ),
     }
 
+# Variables computed over the whole population of a simulation (like quantiles), whose values depend on the other tests
+# of a batch. The tests using them (directly or not) are never batched.
+population_variables_name = set([
+    'decile_rfr',
+    ])
 tax_benefit_system_by_reform_name = {
     None: tax_benefit_system,
     }
 
 
+# Batches of tests
+
+
+class BatchedSimulation(object):
+    """Simulation of a test, whose results are sliced from the simulation of its batch.
+
+    When the simulation of the batch fails, the test falls back to its own simulation.
+    """
+    batch = None
+    simulation = None
+    test = None
+
+    def __init__(self, batch, test):
+        self.batch = batch
+        self.test = test
+
+    def calculate(self, variable_name, period = None, accept_other_period = False):
+        if not self.batch.failed:
+            try:
+                return self.batch.calculate(self.test, variable_name, period = period,
+                    accept_other_period = accept_other_period)
+            except Exception:
+                log.info(u'Batch of {} tests failed. Falling back to one simulation per test'.format(
+                    len(self.batch.tests)))
+                self.batch.failed = True
+        if self.simulation is None:
+            self.simulation = self.test['scenario'].new_simulation(debug = self.batch.debug)
+        return self.simulation.calculate(variable_name, period, accept_other_period = accept_other_period)
+
+
+class TestsBatch(object):
+    """Compatible tests computed together, in a single simulation where their entities are stacked."""
+    debug = False
+    failed = False
+    simulation = None
+    slice_by_key_plural_by_test_id = None
+    tests = None
+
+    def __init__(self, tests, debug = False):
+        self.debug = debug
+        self.tests = tests
+
+    def calculate(self, test, variable_name, period = None, accept_other_period = False):
+        simulation = self.simulation
+        if simulation is None:
+            simulation = self.new_simulation()
+        array = simulation.calculate(variable_name, period, accept_other_period = accept_other_period)
+        key_plural = simulation.entity_by_column_name[variable_name].key_plural
+        return array[self.slice_by_key_plural_by_test_id[id(test)][key_plural]]
+
+    def new_simulation(self):
+        first_scenario = self.tests[0]['scenario']
+        tax_benefit_system = first_scenario.tax_benefit_system
+        test_case = dict(
+            (key_plural, [])
+            for key_plural in tax_benefit_system.entity_class_by_key_plural
+            )
+        self.slice_by_key_plural_by_test_id = slice_by_key_plural_by_test_id = {}
+        for test_index, test in enumerate(self.tests):
+            slice_by_key_plural = slice_by_key_plural_by_test_id[id(test)] = {}
+            for key_plural, entity_class in tax_benefit_system.entity_class_by_key_plural.iteritems():
+                members = test_case[key_plural]
+                test_members = test['scenario'].test_case[key_plural]
+                slice_by_key_plural[key_plural] = slice(len(members), len(members) + len(test_members))
+                # Prefix the IDs of members (and persons) with the index of the test, to keep them unique.
+                for member in test_members:
+                    member = member.copy()
+                    member['id'] = u'{}/{}'.format(test_index, member['id'])
+                    for role_key in (entity_class.roles_key or []):
+                        role_value = member.get(role_key)
+                        if isinstance(role_value, list):
+                            member[role_key] = [
+                                u'{}/{}'.format(test_index, person_id)
+                                for person_id in role_value
+                                ]
+                        elif role_value is not None:
+                            member[role_key] = u'{}/{}'.format(test_index, role_value)
+                    members.append(member)
+
+        scenario = first_scenario.__class__()
+        scenario.period = first_scenario.period
+        scenario.tax_benefit_system = tax_benefit_system
+        scenario.test_case = test_case
+        self.simulation = simulation = scenario.new_simulation(debug = self.debug)
+        return simulation
+
+
+def get_batch_key(checker, test, debug = False):
+    """Return the key shared by the tests that can be computed in the same simulation, or None.
+
+    The options of the directory of the test are given by its checker (accept_other_period) and by its tax-benefit
+    system (reform).
+    """
+    scenario = test['scenario']
+    if scenario.axes is not None or scenario.input_variables is not None or scenario.test_case is None:
+        return None
+    output_variables = test.get(u'output_variables') or {}
+    if any(
+            variable_name in get_population_dependents(scenario.tax_benefit_system)
+            for variable_name in output_variables
+            ):
+        return None
+    scenario.suggest()
+    period = scenario.period
+    # Tests must have the same input variables with the same periods, because formulas may check whether an input
+    # variable is given.
+    entity_class_by_key_plural = scenario.tax_benefit_system.entity_class_by_key_plural
+    input_variables_key = frozenset(
+        (key_plural, key, tuple(sorted(
+            cell_period
+            for cell_period, cell_value in value.iteritems()
+            if cell_value is not None
+            )) if isinstance(value, dict) else period)
+        for key_plural, members in scenario.test_case.iteritems()
+        for member in members
+        for key, value in member.iteritems()
+        if value is not None and key != 'id' and key not in (entity_class_by_key_plural[key_plural].roles_key or [])
+        )
+    return checker, debug, scenario.tax_benefit_system, period, input_variables_key
+
+
+def get_population_dependents(tax_benefit_system):
+    """Return the names of the population variables and of the variables computed (directly or not) from them."""
+    population_dependents = population_dependents_by_tax_benefit_system.get(tax_benefit_system)
+    if population_dependents is None:
+        population_dependents = population_dependents_by_tax_benefit_system[tax_benefit_system] = \
+            population_variables_name | simulations.get_dependents(tax_benefit_system, population_variables_name)
+    return population_dependents
+
+
+def iter_batched_tests(tests_arguments, debug = True):
+    """Add to the arguments of each test the batch of compatible tests it belongs to (or None)."""
+    tests_by_batch_key = collections.defaultdict(list)
+    batch_keys = []
+    for checker, name, period_str, test, force in tests_arguments:
+        batch_key = get_batch_key(checker, test, debug = debug)
+        batch_keys.append(batch_key)
+        if batch_key is not None:
+            tests_by_batch_key[batch_key].append(test)
+    batch_by_key = dict(
+        (batch_key, TestsBatch(tests, debug = debug))
+        for batch_key, tests in tests_by_batch_key.iteritems()
+        if len(tests) > 1
+        )
+    for (checker, name, period_str, test, force), batch_key in zip(tests_arguments, batch_keys):
+        yield checker, name, period_str, test, force, batch_by_key.get(batch_key)
+
+
 # YAML configuration
 
 
@@ -78,7 +237,10 @@ def dict_constructor(loader, node):
     return collections.OrderedDict(loader.construct_pairs(node))
 
 
+# Use the LibYAML based loader when available, because it is much faster.
+Loader = getattr(yaml, 'CLoader', yaml.Loader)
 yaml.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, dict_constructor)
+yaml.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, dict_constructor, Loader = Loader)
 
 
 # Functions
@@ -121,10 +283,13 @@ def assert_near_any_period(value, target_value, absolute_error_margin = 0, messa
                     abs(target_value - value), abs(relative_error_margin * target_value))
 
 
-def check(name, period_str, test, force):
-    scenario = test['scenario']
-    scenario.suggest()
-    simulation = scenario.new_simulation(debug = True)
+def check(name, period_str, test, force, batch = None):
+    if batch is None:
+        scenario = test['scenario']
+        scenario.suggest()
+        simulation = scenario.new_simulation(debug = True)
+    else:
+        simulation = BatchedSimulation(batch, test)
     output_variables = test.get(u'output_variables')
     if output_variables is not None:
         output_variables_name_to_ignore = test.get(u'output_variables_name_to_ignore') or set()
@@ -150,10 +315,13 @@ def check(name, period_str, test, force):
                     )
 
 
-def check_any_period(name, period_str, test, force):
-    scenario = test['scenario']
-    scenario.suggest()
-    simulation = scenario.new_simulation(debug = True)
+def check_any_period(name, period_str, test, force, batch = None):
+    if batch is None:
+        scenario = test['scenario']
+        scenario.suggest()
+        simulation = scenario.new_simulation(debug = True)
+    else:
+        simulation = BatchedSimulation(batch, test)
     output_variables = test.get(u'output_variables')
     if output_variables is not None:
         output_variables_name_to_ignore = test.get(u'output_variables_name_to_ignore') or set()
@@ -190,7 +358,12 @@ def get_tax_benefit_system(reform_name):
     return reform
 
 
-def test(current_options_by_dir = None, force = False, name_filter = None):
+def check_result(name, period_str, result):
+    """Report the result of a test run by a worker process."""
+    assert result['status'] == 'passed', result['message'].encode('utf-8')
+
+
+def iter_yaml_files(current_options_by_dir = None, force = False):
     if current_options_by_dir is None:
         current_options_by_dir = options_by_dir
     for dir, options in sorted(current_options_by_dir.iteritems()):
@@ -200,42 +373,128 @@ def test(current_options_by_dir = None, force = False, name_filter = None):
         if not os.path.isdir(dir):
             log.warning(u'Skipping missing directory: {}'.format(dir))
             continue
-        if isinstance(name_filter, str):
-            name_filter = name_filter.decode('utf-8')
         for filename in sorted(os.listdir(dir)):
-            if not filename.endswith('.yaml'):
-                continue
-            filename_core = os.path.splitext(filename)[0]
-            with open(os.path.join(dir, filename)) as yaml_file:
-                tests = yaml.load(yaml_file)
-            tests, error = conv.pipe(
-                conv.make_item_to_singleton(),
-                conv.uniform_sequence(
-                    conv.noop,
-                    drop_none_items = True,
-                    ),
-                )(tests)
-            if error is not None:
-                embedding_error = conv.embed_error(tests, u'errors', error)
-                assert embedding_error is None, embedding_error
-                conv.check((tests, error))  # Generate an error.
-
-            for test in tests:
-                test, error = scenarios.make_json_or_python_to_test(get_tax_benefit_system(options.get('reform')),
-                    default_absolute_error_margin = options['default_absolute_error_margin'])(test)
-                if error is not None:
-                    embedding_error = conv.embed_error(test, u'errors', error)
-                    assert embedding_error is None, embedding_error
-                    conv.check((test, error))  # Generate an error.
-
-                if not force and test.get(u'ignore', False):
-                    continue
-                if name_filter is not None and name_filter not in filename_core \
-                        and name_filter not in (test.get('name', u'')) \
-                        and name_filter not in (test.get('keywords', [])):
-                    continue
-                checker = check_any_period if options['accept_other_period'] else check
-                yield checker, test.get('name') or filename_core, unicode(test['scenario'].period), test, force
+            if filename.endswith('.yaml'):
+                yield os.path.join(dir, filename), options
+
+
+def iter_yaml_file_tests(file_path, options, force = False, name_filter = None):
+    filename_core = os.path.splitext(os.path.basename(file_path))[0]
+    with open(file_path) as yaml_file:
+        tests = yaml.load(yaml_file, Loader = Loader)
+    tests, error = conv.pipe(
+        conv.make_item_to_singleton(),
+        conv.uniform_sequence(
+            conv.noop,
+            drop_none_items = True,
+            ),
+        )(tests)
+    if error is not None:
+        embedding_error = conv.embed_error(tests, u'errors', error)
+        assert embedding_error is None, embedding_error
+        conv.check((tests, error))  # Generate an error.
+
+    for test in tests:
+        test, error = scenarios.make_json_or_python_to_test(get_tax_benefit_system(options.get('reform')),
+            default_absolute_error_margin = options['default_absolute_error_margin'])(test)
+        if error is not None:
+            embedding_error = conv.embed_error(test, u'errors', error)
+            assert embedding_error is None, embedding_error
+            conv.check((test, error))  # Generate an error.
+
+        if not force and test.get(u'ignore', False):
+            continue
+        if name_filter is not None and name_filter not in filename_core \
+                and name_filter not in (test.get('name', u'')) \
+                and name_filter not in (test.get('keywords', [])):
+            continue
+        checker = check_any_period if options['accept_other_period'] else check
+        yield checker, test.get('name') or filename_core, unicode(test['scenario'].period), test, force
+
+
+def iter_results(current_options_by_dir = None, force = False, jobs = 2, name_filter = None):
+    """Run the tests of YAML files in a pool of processes and iterate on their results, in completion order.
+
+    The most expensive files (the biggest ones) are dispatched first, so that the workers end at about the same time.
+    """
+    if isinstance(name_filter, str):
+        name_filter = name_filter.decode('utf-8')
+    files_arguments = sorted(
+        (
+            (file_path, options, force, name_filter)
+            for file_path, options in iter_yaml_files(current_options_by_dir = current_options_by_dir, force = force)
+            ),
+        key = lambda file_arguments: os.path.getsize(file_arguments[0]),
+        reverse = True,
+        )
+    pool = multiprocessing.Pool(jobs)
+    try:
+        for results in pool.imap_unordered(run_yaml_file, files_arguments):
+            for result in results:
+                yield result
+    finally:
+        pool.terminate()
+
+
+def run_yaml_file(file_arguments):
+    """Run the tests of a YAML file and return their results. Called in worker processes.
+
+    Each worker uses the tax-benefit systems of its module, which are built only once (lazily for reforms).
+    """
+    file_path, options, force, name_filter = file_arguments
+    results = []
+    try:
+        for checker, name, period_str, test, force, batch in iter_batched_tests(list(iter_yaml_file_tests(
+                file_path, options, force = force, name_filter = name_filter))):
+            start_time = time.time()
+            try:
+                checker(name, period_str, test, force, batch)
+            except Exception:
+                message = traceback.format_exc().decode('utf-8')
+                status = 'failed'
+            else:
+                message = None
+                status = 'passed'
+            results.append(dict(
+                duration = time.time() - start_time,
+                file_path = file_path,
+                keywords = test.get('keywords', []),
+                message = message,
+                name = name,
+                period = period_str,
+                status = status,
+                ))
+    except Exception:
+        results.append(dict(
+            duration = 0,
+            file_path = file_path,
+            keywords = [],
+            message = traceback.format_exc().decode('utf-8'),
+            name = os.path.splitext(os.path.basename(file_path))[0],
+            period = None,
+            status = 'error',
+            ))
+    return results
+
+
+def test(current_options_by_dir = None, force = False, jobs = None, name_filter = None):
+    if jobs is None:
+        jobs = int(os.environ.get('OPENFISCA_FRANCE_TEST_JOBS') or 1)
+    if jobs > 1:
+        for result in iter_results(current_options_by_dir = current_options_by_dir, force = force, jobs = jobs,
+                name_filter = name_filter):
+            yield check_result, result['name'], result['period'], result
+        return
+
+    if isinstance(name_filter, str):
+        name_filter = name_filter.decode('utf-8')
+    tests_arguments = [
+        test_arguments
+        for file_path, options in iter_yaml_files(current_options_by_dir = current_options_by_dir, force = force)
+        for test_arguments in iter_yaml_file_tests(file_path, options, force = force, name_filter = name_filter)
+        ]
+    for test_arguments in iter_batched_tests(tests_arguments):
+        yield test_arguments
 
 
 if __name__ == "__main__":
@@ -247,7 +506,10 @@ if __name__ == "__main__":
     parser.add_argument('-d', '--dir', default = None, help = "directory of tests to execute")
     parser.add_argument('-f', '--force', action = 'store_true', default = False,
         help = 'force testing of tests with "ignore" flag and formulas belonging to "ignore_output_variables" list')
+    parser.add_argument('-j', '--jobs', default = 1, type = int, help = "number of processes running the tests")
     parser.add_argument('-n', '--name', default = None, help = "partial name of tests to execute")
+    parser.add_argument('-s', '--summary', default = None,
+        help = "path of a JSON file where to write the results and timings of tests (with --jobs only)")
     parser.add_argument('-v', '--verbose', action = 'store_true', default = False, help = "increase output verbosity")
     args = parser.parse_args()
     logging.basicConfig(level = logging.DEBUG if args.verbose else logging.WARNING, stream = sys.stdout)
@@ -264,10 +526,37 @@ if __name__ == "__main__":
                 )
         current_options_by_dir = {dir: options}
 
-    for test_index, (function, name, period_str, test, force) in enumerate(
+    if args.jobs > 1:
+        results = []
+        for result in iter_results(current_options_by_dir = current_options_by_dir, force = args.force,
+                jobs = args.jobs, name_filter = args.name):
+            results.append(result)
+            print(u'{} {} - {} ({:.2f}s)'.format(result['status'].upper(), result['name'], result['period'],
+                result['duration']).encode('utf-8'))
+            if result['status'] != 'passed':
+                print(result['message'].encode('utf-8'))
+        failures_count = sum(result['status'] != 'passed' for result in results)
+        print("{} tests, {} failures".format(len(results), failures_count))
+        if args.summary is not None:
+            with open(args.summary, 'w') as summary_file:
+                json.dump(
+                    collections.OrderedDict((
+                        ('count', len(results)),
+                        ('duration', sum(result['duration'] for result in results)),
+                        ('failures_count', failures_count),
+                        ('jobs', args.jobs),
+                        ('results', sorted(results, key = lambda result: result['duration'], reverse = True)),
+                        )),
+                    summary_file,
+                    indent = 2,
+                    )
+        sys.exit(1 if failures_count else 0)
+
+    for test_index, (function, name, period_str, test, force, batch) in enumerate(
             test(
                 current_options_by_dir = current_options_by_dir,
                 force = args.force,
+                jobs = 1,
                 name_filter = args.name,
                 ),
             1):
@@ -281,6 +570,6 @@ if __name__ == "__main__":
         print("=" * len(title))
         print(title)
         print("=" * len(title))
-        function(name, period_str, test, force)
+        function(name, period_str, test, force, batch)
 
     sys.exit(0)
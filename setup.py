@@ -63,7 +63,6 @@ setup(
         'numpy',
         'OpenFisca-Core >= 0.5dev',
         'PyYAML',
-        'scipy >= 0.12',
         # 'pandas >= 0.13',  # Only for taxipp_utils.py which is ignored in Makefile
         ],
     message_extractors = {'openfisca_france': [